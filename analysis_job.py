@@ -0,0 +1,107 @@
+# analysis_job.py – The app's analysis pipeline as a background job (see jobs.py)
+#
+# Runs everything the Streamlit "Analyze" button used to run inline: extraction, local pre-screen,
+# the split GPT analysis (sections are published as they arrive), the cover letter, the optimized
+# resume and the cover-letter DOCX. The result holds plain data and DOCX bytes only, so the script
+# thread can copy it into session state on whichever rerun sees the job finished.
+# The analysis is incremental: re-running an edited resume against the same JD only re-sends the
+# sections that changed (see gpt_helper_work_version.py).
+# The tracker is not touched here: it belongs to the user's session and is appended on pick-up.
+
+from datetime import datetime
+from io import BytesIO
+
+import pytz
+
+from gpt_helper_work_version import DEFAULT_PROFILE, split_resume_analysis, submit_cover_letter, parse_analysis_json
+from gpt_scheduler import GPTRequestError
+from resume_core import (
+    extract_text, apply_replacements_to_docx, save_template_cover_letter, recruiter_name_from_result
+)
+from prescreen import prescreen_score
+
+ANALYSIS_STAGES = ("extract", "prescreen", "analysis", "cover_letter", "resume_docx", "cover_letter_docx")
+
+
+def run_analysis_job(job, resume_bytes, jd_bytes, api_key, company_name=None, timezone="America/Chicago",
+                     use_cache=True, profile=DEFAULT_PROFILE, prescreen_threshold=0):
+    local_tz = pytz.timezone(timezone)
+
+    with job.stage("extract"):
+        resume_text = extract_text(resume_bytes)
+        jd_text = extract_text(jd_bytes)
+
+    # === Local pre-screen before spending GPT tokens ===
+    with job.stage("prescreen"):
+        local_result = prescreen_score(resume_text, jd_text)
+    local_score = local_result["scoring"]["atsCompatibilityScore"]
+    job.note("local_score", local_score)
+    if local_score < prescreen_threshold:
+        missing = local_result["Output"]["SummaryOfMatchedAndMissingSkills"]["Missing"]
+        return {"skipped": True, "local_score": local_score, "threshold": prescreen_threshold, "missing": missing[:15]}
+
+    # === Cover letter requested in the background while the analysis runs ===
+    cover_letter_future = submit_cover_letter(resume_text, jd_text, api_key, use_cache=use_cache)
+
+    warnings = []
+    with job.stage("analysis"):
+        # GPTRequestError / GPTRateLimitError fail the job; the UI reports them by type
+        analysis = split_resume_analysis(resume_text, jd_text, api_key, use_cache=use_cache, profile=profile, incremental=True)
+        job.note("incremental", analysis.incremental_summary)
+        for section_key, section_value in analysis:
+            job.publish(section_key, section_value)
+        raw_output = analysis.raw_output
+        try:
+            gpt_result = parse_analysis_json(raw_output)
+        except ValueError:
+            job.note("raw_output", raw_output)
+            raise ValueError("GPT output was not valid JSON. Please try again.")
+    if analysis.errors and analysis.result:
+        warnings.append(f"⚠️ Some analysis parts failed and will be retried on the next run: {', '.join(analysis.errors)}")
+
+    # === Cover letter failures do not discard the analysis ===
+    with job.stage("cover_letter"):
+        try:
+            cover_letter_text = cover_letter_future.result()
+        except GPTRequestError as e:
+            cover_letter_text = None
+            warnings.append(f"⚠️ The cover letter could not be generated: {e}")
+
+    replacements = [(change.get("Was", ""), change.get("New", "")) for change in gpt_result.get("ResumeImprovementSuggestions", [])]
+
+    # === Company Name Detection (user > GPT > fallback) ===
+    company_name = (company_name or "").strip() or gpt_result.get("JobDescription", {}).get("CompanyName", "UnknownCompany")
+    candidate_name = resume_text.splitlines()[0].strip() if resume_text.strip() else "Candidate"
+    candidate_short = ''.join([word[0] for word in candidate_name.split() if word])
+    company_short = '_'.join(company_name.split()[:2]) or "Unknown"
+    now = datetime.now(local_tz)
+    timestamp = now.strftime("%y%m%d-%H%M")
+
+    with job.stage("resume_docx"):
+        resume_filename = f"Resume_{candidate_short}_{company_short}_{timestamp}.docx"
+        resume_buffer = BytesIO()
+        _doc, _target, replacement_hits = apply_replacements_to_docx(resume_bytes, replacements, resume_buffer)
+
+    optimized_cover_letter = None
+    with job.stage("cover_letter_docx"):
+        if cover_letter_text is not None:
+            cover_letter_filename = f"Cover_Letter_{candidate_short}_{company_short}_{timestamp}.docx"
+            cover_letter_buffer = BytesIO()
+            save_template_cover_letter(cover_letter_text, resume_text, cover_letter_buffer, recruiter_name_from_result(gpt_result))
+            optimized_cover_letter = (cover_letter_filename, cover_letter_buffer.getvalue())
+
+    return {
+        "skipped": False,
+        "local_score": local_score,
+        "gpt_result": gpt_result,
+        "replacements": replacements,
+        "company_name": company_name,
+        "candidate_name": candidate_name,
+        "analysis_date": now.date(),
+        "optimized_resume": (resume_filename, resume_buffer.getvalue()),
+        "optimized_cover_letter": optimized_cover_letter,
+        "unapplied": [hit for hit in replacement_hits if hit["Hits"] == 0],
+        "replacement_count": len(replacement_hits),
+        "warnings": warnings,
+        "incremental": analysis.incremental_summary,
+    }
@@ -1,26 +1,28 @@
 # === ATS Resume Optimizer v1.4.6 – GPT Enhanced + Tracker ===
 
 import streamlit as st
-import os
-import re
-import fitz  # PyMuPDF
-import tempfile
-import docx
-from docx.shared import Pt
-from datetime import datetime
+import hashlib
 import pytz
-import pandas as pd
-from openpyxl import Workbook
 from io import BytesIO
-from gpt_helper_work_version import get_resume_analysis, generate_cover_letter
-from main_work_version_1_01_updated import extract_text, apply_replacements_to_docx
+# Document, tracker and GPT modules import PyMuPDF, pandas and openpyxl only when a code path needs them (v1.6)
+from resume_core import load_env
+load_env()  # before the modules below read their ATS_* settings
+import perf
+from gpt_helper_work_version import DEFAULT_PROFILE, response_cache
+from analysis_job import ANALYSIS_STAGES, run_analysis_job
+from jobs import FINISHED_STATES, job_queue
+from tracker import load_tracker
+from tracker_store import TrackerStore, tracker_db_path
+from tracker_analytics import PERIODS, TrackerAnalytics
 
 # === App Title and Layout ===
 st.set_page_config(page_title="ATS Resume Optimizer", layout="wide")
 st.title("📄 ATS Resume Optimizer v1.4.6 – GPT Enhanced + Tracker")
 
 # === Initialize session state variables ===
-for key in ["gpt_result", "optimized_resume_path", "optimized_cover_letter_path", "company_name", "candidate_name", "replacements"]:
+# optimized_resume / optimized_cover_letter hold (file_name, docx_bytes) – kept in memory, no temp files (v1.5)
+for key in ["gpt_result", "optimized_resume", "optimized_cover_letter", "company_name", "candidate_name", "replacements", "perf_summary",
+            "job_id", "job_picked_up", "job_resume_name", "job_tracker_key"]:
     if key not in st.session_state:
         st.session_state[key] = None
 
@@ -47,27 +49,48 @@ uploaded_tracker = st.sidebar.file_uploader(
     help="Upload your tracker file (.xlsx) to continue where you left off."
 )
 tracker_user_id = None
-jd_tracker = None
-resume_tracker = None
-change_log_tracker = None
+tracker_store = None
+
+# === Tracker store cached in session state, keyed by the upload's content hash (v1.5) ===
+# Streamlit reruns this script on every widget change; the workbook is parsed at most once per upload
+# and imported into an append-only SQLite store (tracker_store.py). Analyses are appended to the store
+# and the workbook is only rebuilt when the user clicks Download. Each tracker has its own database file
+# (tracker_db_path), so its rows survive a restart: an upload is only imported into a new, empty store.
+# The store a session switches away from is closed, so a session holds one tracker at a time.
+def set_tracker_store(store, tracker_key):
+    previous = st.session_state.get("tracker_store")
+    if previous is not None and previous is not store:
+        previous.close()
+    st.session_state["tracker_store"] = store
+    st.session_state["tracker_key"] = tracker_key
 
 if uploaded_tracker:
-    try:
-        xls = pd.ExcelFile(uploaded_tracker)
-        jd_tracker = pd.read_excel(xls, sheet_name="JD_Analysis")
-        resume_tracker = pd.read_excel(xls, sheet_name="Resume_Tracker")
-        change_log_tracker = pd.read_excel(xls, sheet_name="Resume_Change_Log")
-        tracker_filename = uploaded_tracker.name
+    tracker_bytes = uploaded_tracker.getvalue()
+    tracker_key = "upload:" + hashlib.sha256(tracker_bytes).hexdigest()
+    tracker_filename = uploaded_tracker.name
+    if st.session_state.get("tracker_key") != tracker_key:
+        store = None
+        try:
+            store = TrackerStore(tracker_db_path(tracker_key))
+            if store.is_empty():
+                store.import_frames(load_tracker(BytesIO(tracker_bytes)))
+            set_tracker_store(store, tracker_key)
+        except Exception as e:
+            if store is not None:
+                store.close()
+            set_tracker_store(None, None)
+            st.sidebar.error(f"❌ Error loading Tracker file: {e}")
+    tracker_store = st.session_state.get("tracker_store")
+    if tracker_store is not None:
         st.sidebar.success(f"✅ Loaded existing Tracker: {tracker_filename}")
-    except Exception as e:
-        st.sidebar.error(f"❌ Error loading Tracker file: {e}")
 else:
     tracker_user_id = st.sidebar.text_input("🆕 New User? Enter a Tracker ID", help="Enter your initials or name to personalize your new tracker file.")
     if tracker_user_id:
         tracker_filename = f"Resume_Job_Tracker_{tracker_user_id}.xlsx"
-        jd_tracker = pd.DataFrame(columns=["ID#", "JD Title", "Company", "Analysis Date"])
-        resume_tracker = pd.DataFrame(columns=["ID#", "Resume File Name", "JD Title", "Match in %", "Summary of Changes", "Created Date"])
-        change_log_tracker = pd.DataFrame(columns=["ID#", "Original Resume File Name", "Resume File Name", "Was", "New", "Section", "JD Title"])
+        tracker_key = "new:" + tracker_user_id
+        if st.session_state.get("tracker_key") != tracker_key:
+            set_tracker_store(TrackerStore(tracker_db_path(tracker_key)), tracker_key)
+        tracker_store = st.session_state["tracker_store"]
     else:
         tracker_filename = None
 
@@ -94,160 +117,162 @@ timezone_options = {
 selected_timezone = st.sidebar.selectbox("🌍 Select Your Time Zone", options=list(timezone_options.keys()), index=0)
 local_tz = pytz.timezone(timezone_options[selected_timezone])
 
+# === GPT Response Cache (v1.5) ===
+bypass_cache = st.sidebar.checkbox("♻️ Bypass GPT cache", value=False, help="Force fresh GPT calls even if this exact resume/JD pair was analyzed before.")
+cache_stats = response_cache.stats()
+st.sidebar.caption(f"Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses · {cache_stats['entries']} entries")
+
+# === Local Pre-Screen Threshold (v1.5) ===
+prescreen_threshold = st.sidebar.number_input(
+    "🎯 Skip GPT below local match score", min_value=0, max_value=100, value=0, step=5,
+    help="A fast local keyword score is computed first. Pairs scoring below this value are not sent to GPT (0 = always analyze)."
+)
+
+# === Analysis Profile: only the requested parts of the response are generated (v1.5) ===
+profile_labels = {
+    "score": "Score only",
+    "suggestions": "Score + suggestions (tailored resume)",
+    "full": "Full analysis + rewritten resume",
+}
+analysis_profile = st.sidebar.selectbox(
+    "🧩 Analysis depth", options=list(profile_labels), index=list(profile_labels).index(DEFAULT_PROFILE),
+    format_func=profile_labels.get,
+    help="Smaller profiles generate fewer tokens and finish sooner. The tailored resume needs the suggestions."
+)
+
+# === Performance Panel: per-stage timing, tokens and cost of the last analysis (v1.5) ===
+show_perf_panel = st.sidebar.checkbox("⏱️ Show performance panel", value=False, help="Time spent per stage and tokens/cost per GPT call for the last analysis.")
+
+# === Tracker Analytics: score trends, common rewrites and missing keywords (v1.6) ===
+show_tracker_analytics = st.sidebar.checkbox("📊 Show tracker analytics", value=False, help="Scores over time, the most common rewrites per section and the keywords most JDs found missing.")
+
 # === Action Button (Trigger in Sidebar) ===
 analyze_btn = st.sidebar.button("▶️ Analyze Resume")
 
-# === Analysis Flow ===
+# === Analysis Flow: submitted as a background job, polled across reruns (v1.5) ===
+# The script thread never waits on GPT: the job keeps running when a widget triggers a rerun, and the
+# results are copied into session state on the first rerun that sees it finished (see jobs.py).
 if analyze_btn and uploaded_resume and uploaded_jd and api_key:
     ext_resume = uploaded_resume.name.lower()
     ext_jd = uploaded_jd.name.lower()
     if not ext_resume.endswith(".docx") or not ext_jd.endswith(".docx"):
         st.error("❌ Resume and Job Description must both be DOCX files. Please upload .docx files.")
     else:
-        with st.spinner("🧠 Extracting and analyzing your documents..."):
-
-            # Save uploaded files to temp
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp_resume:
-                tmp_resume.write(uploaded_resume.getbuffer())
-                resume_path = tmp_resume.name
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp_jd:
-                tmp_jd.write(uploaded_jd.getbuffer())
-                jd_path = tmp_jd.name
-
-            resume_text = extract_text(resume_path)
-            jd_text = extract_text(jd_path)
-
-            # === GPT Analysis ===
-            import json
-
-            # === GPT JSON Response (v1.4) ===
-            raw_output = get_resume_analysis(resume_text, jd_text, api_key, include_replacements=True)
-
-            try:
-                cleaned_output = re.search(r"\{.*\}", raw_output, re.DOTALL).group()
-                gpt_result = json.loads(cleaned_output)
-            except Exception as e:
-                st.error("❌ GPT output was not valid JSON. Please try again.")
-                st.text_area("Raw GPT Output (for debugging)", raw_output, height=300)
-                st.stop()
-            st.session_state["gpt_result"] = gpt_result
-            
-            # structured JSON parsing (v1.4.3)===
-            replacements = [(change.get("Was", ""), change.get("New", "")) for change in gpt_result.get("ResumeImprovementSuggestions", [])] #JSON key path updated updated (v1.4.6) ===
-
-            st.session_state["replacements"] = replacements
-
-            # === Company Name Detection (user > GPT > fallback) (v1.4.2)===
-            if company_name_input.strip():
-                company_name = company_name_input.strip()
-            else:
-                company_name = gpt_result.get("JobDescription", {}).get("CompanyName", "UnknownCompany") #Company's name key path updated (v1.4.6)
-
-            st.session_state["company_name"] = company_name
-
-            candidate_name = resume_text.splitlines()[0].strip()
-            st.session_state["candidate_name"] = candidate_name
-
-            candidate_short = ''.join([word[0] for word in candidate_name.split() if word])
-            company_short = '_'.join(company_name.split()[:2]) or "Unknown"
-            timestamp = datetime.now(local_tz).strftime("%y%m%d-%H%M")
-
-            resume_filename = f"Resume_{candidate_short}_{company_short}_{timestamp}.docx"
-            improved_resume_path = os.path.join(tempfile.gettempdir(), resume_filename)
-            updated_doc, resume_saved = apply_replacements_to_docx(resume_path, replacements, improved_resume_path)
-            st.session_state["optimized_resume_path"] = resume_saved
-
-
-            cover_letter_text = generate_cover_letter(resume_text, jd_text, api_key)
-            cover_letter_filename = f"Cover_Letter_{candidate_short}_{company_short}_{timestamp}.docx"
-            cover_letter_path = os.path.join(tempfile.gettempdir(), cover_letter_filename)
-
-            cover_doc = docx.Document()
-            cover_doc.add_paragraph(cover_letter_text)
-            style = cover_doc.styles['Normal']
-            font = style.font
-            font.name = 'Arial'
-            font.size = Pt(11)
-            cover_doc.save(cover_letter_path)
-            st.session_state["optimized_cover_letter_path"] = cover_letter_path
-
-    # === Tracker Update Block (v1.3.1) ===
-    if tracker_filename:
-        # Function to generate 3-digit ID (001, 002, ...)
-        def generate_new_id(df):
-            return f"{(len(df) + 1):03d}"
-
-        # Function to generate downloadable Excel report
-        def generate_excel_download(jd_df, resume_df, change_log_df):
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                jd_df.to_excel(writer, sheet_name="JD_Analysis", index=False)
-                resume_df.to_excel(writer, sheet_name="Resume_Tracker", index=False)
-                change_log_df.to_excel(writer, sheet_name="Resume_Change_Log", index=False)
-            return output.getvalue()
-
-        # Generate new ID for JD Tracker
-        jd_id = generate_new_id(jd_tracker)
-
-        # Extract Job Title from GPT result (v1.4.2)
-        job_title = gpt_result.get("JobDescription", {}).get("JobTitle", "UnknownTitle")[:40] #JSON key path updated updated (v1.4.6) ===
-
-        # Format JD Title (max 50 chars): First 2 words of Company + Job Title
-        jd_title = f"{'_'.join(company_name.split()[:2])}_{job_title}"[:50]
-
-        # Store analysis date as real date value
-        analysis_date = datetime.now(local_tz).date()
-
-        # Append to JD Tracker
-        jd_tracker.loc[len(jd_tracker)] = [jd_id, jd_title, company_name, analysis_date]
-
-        resume_id = generate_new_id(resume_tracker)
-
-        # Fix Compatibility Score Extraction (v1.4.2)
-        match_percent = gpt_result.get("scoring", {}).get("atsCompatibilityScore", "N/A") #JSON key path updated updated (v1.4.6) ===
-
-
-        num_changes = len(replacements) if replacements else 0
-        created_date = datetime.now(local_tz).date()
-        resume_tracker.loc[len(resume_tracker)] = [
-            resume_id,
-            os.path.basename(improved_resume_path),
-            jd_title,
-            match_percent,
-            num_changes,
-            created_date
-        ]
-
-        change_id = generate_new_id(change_log_tracker)
-        
-        # Replacements/Change_Log loop (v1.4.5)===
-        for change in gpt_result.get("ResumeImprovementSuggestions", []): #JSON key path updated updated (v1.4.6) ===
-
-            was = change.get("Was", "")
-            new = change.get("New", "")
-            section = change.get("Section", "Others")
-
-            change_log_tracker.loc[len(change_log_tracker)] = [
-                change_id,
-                uploaded_resume.name,
-                os.path.basename(improved_resume_path),
-                was,
-                new,
-                section,
-                jd_title
-            ]
-            change_id = f"{int(change_id)+1:03d}"
-
-        # === Download updated Tracker file (v1.4.4)===
-        st.subheader("📥 Download Your Tracker File")
-        st.caption("💡 Tip: Save this file to keep a record of your job application analyses.")
-        st.download_button(
-            label="📥 Download Tracker (.xlsx)",
-            data=generate_excel_download(jd_tracker, resume_tracker, change_log_tracker),
-            file_name=tracker_filename,
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        # Work on the uploaded bytes directly – nothing is written to disk (v1.5)
+        st.session_state["job_id"] = job_queue.submit(
+            run_analysis_job,
+            uploaded_resume.getvalue(),
+            uploaded_jd.getvalue(),
+            api_key,
+            company_name=company_name_input.strip(),
+            timezone=timezone_options[selected_timezone],
+            use_cache=not bypass_cache,
+            profile=analysis_profile,
+            prescreen_threshold=prescreen_threshold,
+            stages=ANALYSIS_STAGES,
+            name="analysis"
         )
+        st.session_state["job_resume_name"] = uploaded_resume.name
+        st.session_state["job_tracker_key"] = st.session_state.get("tracker_key")
+
+def show_live_sections(sections):
+    job_description = sections.get("JobDescription")
+    if isinstance(job_description, dict):
+        st.markdown(f"#### 🏢 {job_description.get('CompanyName', 'Unknown Company')} — {job_description.get('JobTitle', 'Unknown Title')}")
+    scoring = sections.get("scoring")
+    if isinstance(scoring, dict) and "atsCompatibilityScore" in scoring:
+        st.markdown(f"### ✅ Compatibility Score: **{scoring['atsCompatibilityScore']}%**")
+    for section_key, section_value in sections.items():
+        with st.expander(f"📄 {section_key}", expanded=False):
+            st.json(section_value)
+
+STAGE_ICONS = {"queued": "⏳", "running": "🔄", "done": "✅", "failed": "❌", "skipped": "⏭️", "cancelled": "⛔"}
+
+# === Job progress, refreshed every second without rerunning the whole page (v1.5) ===
+@st.fragment(run_every=1.0)
+def show_job_progress():
+    job_id = st.session_state.get("job_id")
+    snapshot = job_queue.snapshot(job_id) if job_id else None
+    if snapshot is None or snapshot["status"] in FINISHED_STATES:
+        if snapshot is not None and st.session_state.get("job_picked_up") != job_id:
+            st.rerun()  # full rerun: the results are picked up below
+        return
+    label = "Waiting for a free worker..." if snapshot["status"] == "queued" else f"🧠 Analyzing your documents... ({snapshot['elapsed_seconds']:.0f}s)"
+    st.progress(snapshot["progress"], text=label)
+    st.caption("  ·  ".join(f"{STAGE_ICONS.get(stage['status'], '')} {name}" for name, stage in snapshot["stages"].items()))
+    if "local_score" in snapshot["notes"]:
+        st.markdown(f"### 🔎 Local Keyword Match: **{snapshot['notes']['local_score']}%**")
+    show_live_sections(snapshot["sections"])
+    if st.button("⛔ Cancel analysis"):
+        job_queue.cancel(job_id)
+
+# === Finished job: pick the results up once, report its outcome on every rerun (v1.5) ===
+job_id = st.session_state.get("job_id")
+job_snapshot = job_queue.snapshot(job_id) if job_id else None
+if job_snapshot is not None and job_snapshot["status"] in FINISHED_STATES:
+    job_result = job_snapshot["result"] or {}
+    if job_snapshot["status"] == "failed":
+        if job_snapshot["error_type"] == "GPTRateLimitError":
+            st.error(f"⏳ OpenAI is still rate limiting. Please wait a minute and try again. ({job_snapshot['error']})")
+        elif "raw_output" in job_snapshot["notes"]:
+            st.error(f"❌ {job_snapshot['error']}")
+            st.text_area("Raw GPT Output (for debugging)", job_snapshot["notes"]["raw_output"], height=300)
+        elif job_snapshot["error_type"] in ("GPTRequestError", "GPTTransientError"):
+            st.error(f"❌ Error contacting OpenAI: {job_snapshot['error']}")
+        else:
+            st.error(f"❌ The analysis failed: {job_snapshot['error']}")
+    elif job_snapshot["status"] == "cancelled":
+        st.info("⛔ The analysis was cancelled.")
+    elif job_result.get("skipped"):
+        st.markdown(f"### 🔎 Local Keyword Match: **{job_result['local_score']}%**")
+        st.warning(f"⏭️ Local score is below {job_result['threshold']}%, so GPT analysis was skipped. Top missing keywords: {', '.join(job_result['missing'])}")
+    else:
+        if st.session_state.get("job_picked_up") != job_id:
+            for key in ("gpt_result", "replacements", "company_name", "candidate_name", "optimized_resume", "optimized_cover_letter", "perf_summary"):
+                st.session_state[key] = job_result.get(key)
+
+            # === Tracker Update Block (v1.3.1) – shared with the batch runner via tracker.py (v1.5) ===
+            # Only into the tracker that was active when the job was submitted
+            if tracker_filename and tracker_store is not None and st.session_state.get("job_tracker_key") == st.session_state.get("tracker_key"):
+                tracker_store.append_analysis(
+                    job_result["gpt_result"],
+                    job_result["company_name"],
+                    resume_file_name=job_result["optimized_resume"][0],
+                    original_resume_name=st.session_state.get("job_resume_name"),
+                    analysis_date=job_result["analysis_date"]
+                )
+        st.markdown(f"### 🔎 Local Keyword Match: **{job_result['local_score']}%**")
+        # === Edit-and-rerun: what the incremental analysis re-sent (v1.6) ===
+        incremental = job_result.get("incremental") or {}
+        if incremental.get("mode") == "reused":
+            st.caption("♻️ The resume is unchanged since the last analysis against this JD; its results were reused.")
+        elif incremental.get("mode") == "delta":
+            st.caption(f"♻️ Only the edited sections were re-analyzed: {', '.join(incremental['changed'] + incremental['removed'])}.")
+        for warning in job_result["warnings"]:
+            st.warning(warning)
+
+        # === Suggestions whose "Was" text was not found in the resume (v1.5) ===
+        unapplied = job_result["unapplied"]
+        if unapplied:
+            with st.expander(f"⚠️ {len(unapplied)} of {job_result['replacement_count']} suggestions could not be applied automatically"):
+                for hit in unapplied:
+                    overlap_note = "  \n  _Overlaps another suggestion that was applied_" if hit.get("Overlapped") else ""
+                    st.markdown(f"- **Was:** {hit['Was']}  \n  **New:** {hit['New']}{overlap_note}")
+    st.session_state["job_picked_up"] = job_id
+
+# Runs after the pick-up above, so a full rerun never loops back into st.rerun()
+show_job_progress()
+
+# === Download updated Tracker file (v1.4.4) ===
+if tracker_filename and tracker_store is not None and st.session_state["gpt_result"]:
+    st.subheader("📥 Download Your Tracker File")
+    st.caption("💡 Tip: Save this file to keep a record of your job application analyses.")
+    st.download_button(
+        label="📥 Download Tracker (.xlsx)",
+        data=lambda: perf.timed("tracker.export", tracker_store.export_xlsx),  # built only when clicked (v1.5)
+        file_name=tracker_filename,
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
 
 # === Output Display ===
 if st.session_state["gpt_result"]:
@@ -255,6 +280,7 @@ if st.session_state["gpt_result"]:
     st.json(st.session_state["gpt_result"]) #Output Display – st.text_area() Breaks JSON View (v1.4.4)===
 
     # ===UI Enhancement (Optional) (1.4.5) ===
+    gpt_result = st.session_state["gpt_result"]
     score = gpt_result.get("scoring", {}).get("atsCompatibilityScore", "N/A") #JSON key path updated updated (v1.4.6) ===
     if score != "N/A":
         st.markdown(f"### ✅ Compatibility Score: **{score}%**")
@@ -263,17 +289,80 @@ if st.session_state["gpt_result"]:
     if num_changes > 0:
         st.markdown(f"### ✏️ Number of Suggested Improvements: **{num_changes}**")
 
-if st.session_state["optimized_resume_path"]:
+# === Downloads served from the bytes held in session state (v1.5) ===
+if st.session_state["optimized_resume"]:
     st.subheader("📎 Documents")
+    resume_file_name, resume_data = st.session_state["optimized_resume"]
     st.download_button(
         "📄 Download Optimized Resume",
-        open(st.session_state["optimized_resume_path"], "rb"),
-        file_name=os.path.basename(st.session_state["optimized_resume_path"])
+        resume_data,
+        file_name=resume_file_name
     )
 
-if st.session_state["optimized_cover_letter_path"]:
+if st.session_state["optimized_cover_letter"]:
+    cover_file_name, cover_data = st.session_state["optimized_cover_letter"]
     st.download_button(
         "✉️ Download Cover Letter",
-        open(st.session_state["optimized_cover_letter_path"], "rb"),
-        file_name=os.path.basename(st.session_state["optimized_cover_letter_path"])
+        cover_data,
+        file_name=cover_file_name
     )
+
+# === Performance Panel (v1.5) ===
+if show_perf_panel and st.session_state["perf_summary"]:
+    perf_summary = st.session_state["perf_summary"]
+    totals = perf_summary["totals"]
+    st.subheader("⏱️ Performance")
+    st.caption(
+        f"Wall time {perf_summary['wall_seconds']}s · {totals['calls']} GPT calls ({totals['cached_calls']} cached) · "
+        f"{totals['prompt_tokens']} prompt + {totals['completion_tokens']} completion tokens · ~${totals['cost_usd']:.4f}"
+    )
+    import pandas as pd
+    st.dataframe(pd.DataFrame.from_dict(perf_summary["stages"], orient="index").rename_axis("stage"))
+    if perf_summary["gpt_calls"]:
+        st.dataframe(pd.DataFrame.from_dict(perf_summary["gpt_calls"], orient="index").rename_axis("span"))
+
+# === Tracker Analytics (v1.6) ===
+# The summaries live in session state next to the tracker store and only fold in the rows appended
+# since the previous rerun (tracker_analytics.py), so the view stays fast on large trackers.
+if show_tracker_analytics and tracker_store is not None:
+    analytics_state = st.session_state.get("tracker_analytics")
+    if not analytics_state or analytics_state[0] != st.session_state.get("tracker_key"):
+        analytics_state = (st.session_state.get("tracker_key"), TrackerAnalytics())
+        st.session_state["tracker_analytics"] = analytics_state
+    analytics = perf.timed("tracker.analytics", analytics_state[1].refresh, tracker_store)
+    summary = analytics.summary()
+
+    st.subheader("📊 Tracker Analytics")
+    if not summary["analyses"] and not summary["jds"]:
+        st.info("No analyses in this tracker yet.")
+    else:
+        average = f"{summary['average_score']}%" if summary["average_score"] is not None else "N/A"
+        st.caption(
+            f"{summary['analyses']} scored analyses (average {average}) · {summary['jds']} JDs · "
+            f"{summary['changes']} changes ({summary['distinct_rewrites']} distinct rewrites)"
+        )
+
+        st.markdown("#### Match score over time")
+        period = st.selectbox("Group by", options=list(PERIODS), index=list(PERIODS).index("M"), format_func=PERIODS.get, key="analytics_period")
+        distribution = analytics.score_distribution(period)
+        if distribution.empty:
+            st.caption("No dated scores yet.")
+        else:
+            st.line_chart(distribution["Average"])
+            st.bar_chart(distribution.drop(columns=["Analyses", "Average"]))
+            st.dataframe(distribution)
+
+        st.markdown("#### Most common rewrites")
+        rewrite_section = st.selectbox("Section", options=["All sections"] + analytics.sections(), key="analytics_section")
+        st.dataframe(
+            analytics.top_rewrites(None if rewrite_section == "All sections" else rewrite_section, n=25),
+            hide_index=True
+        )
+
+        st.markdown("#### Most requested missing keywords")
+        keywords = analytics.top_missing_keywords(n=25)
+        if keywords.empty:
+            st.caption("No missing keywords recorded yet (trackers from before v1.6 do not store them).")
+        else:
+            st.bar_chart(keywords.set_index("Keyword")["JDs"])
+            st.dataframe(keywords, hide_index=True)
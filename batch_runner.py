@@ -0,0 +1,399 @@
+# batch_runner.py – Headless batch mode: score resumes against many JDs with bounded concurrency
+#
+# Usage:
+#   python batch_runner.py --resumes resume.docx --jds "jds/*.docx" --out batch_out --concurrency 4 \
+#       --tracker Resume_Job_Tracker_LS.xlsx
+#
+# Each (resume, JD) pair gets its own folder under --out with the optimized resume, the cover letter
+# and result.json. result.json is written last, so a pair with result.json is complete and is skipped
+# when the same command is run again after an interruption. Tracker rows are appended once at the end:
+# the workbook is imported into a TrackerStore (which issues the row IDs), every new pair is appended
+# and the workbook is exported once.
+# --log-workbook also logs every finished pair to an ATS report workbook (the one log_gpt_results
+# writes) through the shared journaled writer (tracker_journal.py): rows are queued as pairs finish
+# and written in batches off the worker threads, with one final flush at the end of the run.
+# --jd-bundles takes PDF exports holding many postings: they are split into one JD per posting
+# (pdf_reader.py, pages extracted in a process pool) and each posting is paired like a JD file.
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import pytz
+
+import perf
+from gpt_helper_work_version import (
+    ANALYSIS_PROFILES, ANALYSIS_STRATEGIES, DEFAULT_PROFILE,
+    run_analysis_and_cover_letter, parse_analysis_json, response_cache, scheduler, set_gpt_workers
+)
+from pdf_reader import BundleSplitter, bundle_jd_path, split_bundle
+from resume_core import extract_text, load_env, apply_replacements_to_docx, save_template_cover_letter, recruiter_name_from_result
+from prescreen import triage
+from tracker import load_tracker
+from tracker_journal import journal_writer
+from tracker_store import TrackerStore
+
+SUPPORTED_EXTENSIONS = (".docx", ".pdf")
+RESULT_FILENAME = "result.json"
+TRACKED_MANIFEST = ".tracked_pairs"
+
+
+# === Input expansion: files, directories or glob patterns ===
+def expand_inputs(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            candidates = glob.glob(pattern) or [pattern]
+        for path in candidates:
+            if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS) and not os.path.basename(path).startswith("~$"):
+                paths.append(os.path.abspath(path))
+    return sorted(set(paths))
+
+def _slug(text, max_len=40):
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", text).strip("_")[:max_len] or "file"
+
+def pair_id(resume_path, jd_path):
+    digest = hashlib.sha1(f"{resume_path}\n{jd_path}".encode("utf-8")).hexdigest()[:8]
+    resume_stem = os.path.splitext(os.path.basename(resume_path))[0]
+    jd_stem = os.path.splitext(os.path.basename(jd_path))[0]
+    return f"{_slug(resume_stem)}__{_slug(jd_stem)}__{digest}"
+
+
+# === Text extraction, memoized so a resume shared by many pairs is parsed once ===
+class TextCache:
+    def __init__(self):
+        self._texts = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        with self._lock:
+            if path in self._texts:
+                return self._texts[path]
+        with perf.span("extract"):
+            text = extract_text(path)
+        with self._lock:
+            self._texts[path] = text
+        return text
+
+    def put(self, path, text):
+        # Texts that do not come from a file of their own, e.g. one posting of a JD bundle
+        with self._lock:
+            self._texts[path] = text
+
+
+def _write_json_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+# === Process one (resume, JD) pair ===
+def run_pair(resume_path, jd_path, out_dir, api_key, texts, local_tz, company_name=None, use_cache=True, strategy="split",
+             profile=DEFAULT_PROFILE):
+    pair_dir = os.path.join(out_dir, pair_id(resume_path, jd_path))
+    os.makedirs(pair_dir, exist_ok=True)
+
+    resume_text = texts.get(resume_path)
+    jd_text = texts.get(jd_path)
+
+    with perf.span("gpt.analysis_and_cover_letter", strategy=strategy, profile=profile):
+        raw_output, cover_letter_text = run_analysis_and_cover_letter(resume_text, jd_text, api_key, use_cache=use_cache, strategy=strategy, profile=profile)
+    try:
+        with perf.span("parse_json"):
+            gpt_result = parse_analysis_json(raw_output)
+    except ValueError:
+        with open(os.path.join(pair_dir, "raw_output.txt"), "w", encoding="utf-8") as f:
+            f.write(raw_output or "")
+        raise RuntimeError("GPT output was not valid JSON (raw output saved to raw_output.txt)")
+
+    # Company Name Detection (user > GPT > fallback), same as the Streamlit flow
+    company = (company_name or "").strip() or gpt_result.get("JobDescription", {}).get("CompanyName", "UnknownCompany")
+    candidate_name = resume_text.splitlines()[0].strip() if resume_text.strip() else "Candidate"
+    candidate_short = ''.join([word[0] for word in candidate_name.split() if word])
+    company_short = '_'.join(company.split()[:2]) or "Unknown"
+    timestamp = datetime.now(local_tz).strftime("%y%m%d-%H%M")
+
+    resume_filename = None
+    replacement_hits = []
+    if resume_path.lower().endswith(".docx"):
+        replacements = [(change.get("Was", ""), change.get("New", "")) for change in gpt_result.get("ResumeImprovementSuggestions", [])]
+        resume_filename = f"Resume_{candidate_short}_{company_short}_{timestamp}.docx"
+        with perf.span("docx.replace", replacements=len(replacements)):
+            _doc, _saved, replacement_hits = apply_replacements_to_docx(resume_path, replacements, os.path.join(pair_dir, resume_filename))
+
+    cover_letter_filename = f"Cover_Letter_{candidate_short}_{company_short}_{timestamp}.docx"
+    with perf.span("cover_letter.save"):
+        save_template_cover_letter(cover_letter_text, resume_text, os.path.join(pair_dir, cover_letter_filename), recruiter_name_from_result(gpt_result))
+
+    result = {
+        "resume": resume_path,
+        "jd": jd_path,
+        "company_name": company,
+        "resume_file": resume_filename,
+        "cover_letter_file": cover_letter_filename,
+        "analysis_date": datetime.now(local_tz).date().isoformat(),
+        "replacement_hits": replacement_hits,
+        "analysis": gpt_result,
+    }
+    _write_json_atomic(os.path.join(pair_dir, RESULT_FILENAME), result)
+    return result
+
+
+def load_completed_result(out_dir, resume_path, jd_path):
+    path = os.path.join(out_dir, pair_id(resume_path, jd_path), RESULT_FILENAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# === Tracker: append every completed pair not yet logged, in one write at the end ===
+# The tracker and the .tracked_pairs manifest cannot be replaced in one step, so the pairs being logged are
+# first recorded in .tracked_pairs.pending together with the SHA-256 of the workbook about to be written.
+# On the next run a pending record counts only if the tracker on disk is that workbook: a crash after the
+# tracker was replaced does not log the pairs twice, and a crash before it does not lose them.
+def _write_manifest(path, pids):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(pid + "\n" for pid in sorted(pids))
+    os.replace(tmp_path, path)
+
+def _file_sha256(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_tracked_pairs(out_dir, tracker_path):
+    manifest_path = os.path.join(out_dir, TRACKED_MANIFEST)
+    tracked = set()
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            tracked = {line.strip() for line in f if line.strip()}
+    pending_path = f"{manifest_path}.pending"
+    if os.path.exists(pending_path):
+        with open(pending_path, "r", encoding="utf-8") as f:
+            pending = json.load(f)
+        if pending.get("tracker_sha256") == _file_sha256(tracker_path):
+            tracked.update(pending.get("pairs", []))
+            _write_manifest(manifest_path, tracked)
+        os.remove(pending_path)
+    return tracked
+
+def append_results_to_tracker(tracker_path, out_dir, results):
+    manifest_path = os.path.join(out_dir, TRACKED_MANIFEST)
+    tracked = load_tracked_pairs(out_dir, tracker_path)
+    pending = [(pid, result) for pid, result in sorted(results.items()) if pid not in tracked]
+    if not pending:
+        return 0
+
+    # Scratch store: the workbook stays the batch's tracker, the store only issues IDs and builds it
+    store = TrackerStore(":memory:")
+    try:
+        if os.path.exists(tracker_path):
+            store.import_frames(load_tracker(tracker_path))
+        for _pid, result in pending:
+            store.append_analysis(
+                result["analysis"],
+                result["company_name"],
+                resume_file_name=result["resume_file"] or "",
+                original_resume_name=os.path.basename(result["resume"]),
+                analysis_date=datetime.fromisoformat(result["analysis_date"]).date()
+            )
+        workbook = store.export_xlsx()
+    finally:
+        store.close()
+
+    pending_pids = [pid for pid, _result in pending]
+    pending_path = f"{manifest_path}.pending"
+    _write_json_atomic(pending_path, {"tracker_sha256": hashlib.sha256(workbook).hexdigest(), "pairs": pending_pids})
+    tmp_path = f"{tracker_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(workbook)
+    os.replace(tmp_path, tracker_path)
+    _write_manifest(manifest_path, tracked.union(pending_pids))
+    os.remove(pending_path)
+    return len(pending)
+
+
+# === Local pre-screen: drop pairs below the threshold and run the most promising ones first ===
+def prescreen_pairs(todo, texts, threshold):
+    by_resume = {}
+    for resume_path, jd_path in todo:
+        by_resume.setdefault(resume_path, []).append(jd_path)
+
+    scored, rejected = [], {}
+    for resume_path, resume_jds in by_resume.items():
+        keep, dropped = triage(texts.get(resume_path), [texts.get(jd_path) for jd_path in resume_jds], threshold)
+        scored.extend((score, resume_path, resume_jds[i]) for i, score, _result in keep)
+        for i, score, _result in dropped:
+            rejected[pair_id(resume_path, resume_jds[i])] = score
+    scored.sort(key=lambda item: -item[0])
+    return [(resume_path, jd_path) for _score, resume_path, jd_path in scored], rejected
+
+
+def run_batch(resume_paths, jd_paths, out_dir, api_key, concurrency=4, tracker_path=None,
+              company_name=None, timezone="America/Chicago", use_cache=True, prescreen_threshold=None, strategy="split",
+              profile=DEFAULT_PROFILE, log=print, jd_bundles=(), bundle_splitter=None, log_workbook=None):
+    os.makedirs(out_dir, exist_ok=True)
+    local_tz = pytz.timezone(timezone)
+    texts = TextCache()
+    perf_run = perf.start_run("batch")
+
+    jd_paths = list(jd_paths)
+    for bundle_path in jd_bundles:
+        with perf.span("bundle.split"):
+            postings = 0
+            for jd in split_bundle(bundle_path, bundle_splitter):
+                path = bundle_jd_path(bundle_path, jd["index"])
+                texts.put(path, jd["text"])
+                jd_paths.append(path)
+                postings += 1
+        log(f"{os.path.basename(bundle_path)}: {postings} postings")
+
+    pairs = [(resume_path, jd_path) for resume_path in resume_paths for jd_path in jd_paths]
+    results = {}
+    todo = []
+    for resume_path, jd_path in pairs:
+        done = load_completed_result(out_dir, resume_path, jd_path)
+        if done is not None:
+            results[pair_id(resume_path, jd_path)] = done
+        else:
+            todo.append((resume_path, jd_path))
+
+    already_complete = len(results)
+    prescreened_out = {}
+    if prescreen_threshold is not None:
+        todo, prescreened_out = prescreen_pairs(todo, texts, prescreen_threshold)
+        log(f"Local pre-screen: {len(prescreened_out)} pairs below {prescreen_threshold} skipped")
+
+    log(f"{len(pairs)} pairs: {len(results)} already complete, {len(todo)} to run (concurrency={concurrency})")
+
+    set_gpt_workers(concurrency)
+    workbook_writer = journal_writer(log_workbook, on_warning=log) if log_workbook else None
+    failures = {}
+    start = time.perf_counter()
+    completed = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {
+            executor.submit(perf.bind(run_pair), resume_path, jd_path, out_dir, api_key, texts, local_tz, company_name, use_cache, strategy, profile): (resume_path, jd_path)
+            for resume_path, jd_path in todo
+        }
+        for future in as_completed(futures):
+            resume_path, jd_path = futures[future]
+            pid = pair_id(resume_path, jd_path)
+            completed += 1
+            elapsed_min = (time.perf_counter() - start) / 60
+            rate = completed / elapsed_min if elapsed_min > 0 else 0.0
+            try:
+                result = future.result()
+            except Exception as e:
+                failures[pid] = str(e)
+                log(f"[{completed}/{len(todo)}] ❌ {pid}: {e} ({rate:.1f} pairs/min)")
+                continue
+            results[pid] = result
+            score = result["analysis"].get("scoring", {}).get("atsCompatibilityScore", "N/A")
+            if workbook_writer is not None:
+                workbook_writer.log(
+                    os.path.basename(resume_path), os.path.basename(jd_path), score,
+                    [(change.get("Was", ""), change.get("New", ""), change.get("Section", "Others"))
+                     for change in result["analysis"].get("ResumeImprovementSuggestions", [])],
+                    result["resume_file"] or "", result["company_name"]
+                )
+            log(f"[{completed}/{len(todo)}] ✅ {pid}: score {score} ({rate:.1f} pairs/min)")
+
+    elapsed = time.perf_counter() - start
+    with perf.span("tracker.export"):
+        logged = append_results_to_tracker(tracker_path, out_dir, results) if tracker_path else 0
+    if workbook_writer is not None:
+        with perf.span("workbook.flush"):
+            workbook_writer.flush()
+
+    summary = {
+        "pairs": len(pairs),
+        "ran": len(todo),
+        "succeeded": len(todo) - len(failures),
+        "failed": len(failures),
+        "skipped": already_complete,
+        "prescreened_out": prescreened_out,
+        "elapsed_seconds": round(elapsed, 2),
+        "pairs_per_minute": round((len(todo) - len(failures)) / (elapsed / 60), 2) if elapsed > 0 else 0.0,
+        "tracker_rows_logged": logged,
+        "workbook_rows_queued": workbook_writer.pending if workbook_writer is not None else 0,
+        "cache": response_cache.stats(),
+        "scheduler": scheduler.stats(),
+        "perf": perf.finish_run(perf_run),
+        "failures": failures,
+    }
+    _write_json_atomic(os.path.join(out_dir, "batch_summary.json"), summary)
+    return summary
+
+
+def main(argv=None):
+    load_env()  # $OPENAI_API_KEY may come from a .env file
+    parser = argparse.ArgumentParser(description="Run ATS analysis for every resume × JD pair.")
+    parser.add_argument("--resumes", nargs="+", required=True, help="Resume files, directories or glob patterns")
+    parser.add_argument("--jds", nargs="+", default=[], help="Job description files, directories or glob patterns")
+    parser.add_argument("--jd-bundles", nargs="+", default=[], help="PDF exports with many postings, split into one JD per posting")
+    parser.add_argument("--bundle-pages-per-jd", type=int, help="Cut bundles every N pages instead of detecting postings")
+    parser.add_argument("--out", required=True, help="Output directory (re-run with the same value to resume)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of pairs analyzed at the same time")
+    parser.add_argument("--tracker", help="Tracker .xlsx to append results to (created if missing)")
+    parser.add_argument("--log-workbook", help="ATS report workbook (.xlsx with ATS_Report_Log, Change_Log, ...) to also log each pair to")
+    parser.add_argument("--company", help="Company name override for every JD")
+    parser.add_argument("--timezone", default="America/Chicago", help="Time zone used for dates and file names")
+    parser.add_argument("--api-key", default=os.getenv("OPENAI_API_KEY"), help="OpenAI API key (default: $OPENAI_API_KEY)")
+    parser.add_argument("--prescreen-threshold", type=float, help="Skip pairs whose local keyword score (0-100) is below this value")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the GPT response cache")
+    parser.add_argument("--tpm", type=int, help="OpenAI tokens-per-minute limit to schedule against (default: $ATS_OPENAI_TPM or 40000)")
+    parser.add_argument("--rpm", type=int, help="OpenAI requests-per-minute limit to schedule against (default: $ATS_OPENAI_RPM or 500)")
+    parser.add_argument("--strategy", choices=sorted(ANALYSIS_STRATEGIES), default="split",
+                        help="split: parallel cached sub-requests; parsed_jd: cached JD parse + one call; single: one prompt")
+    parser.add_argument("--profile", choices=sorted(ANALYSIS_PROFILES), default=DEFAULT_PROFILE,
+                        help="Response profile for --strategy split (score, suggestions or full)")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("An OpenAI API key is required (--api-key or OPENAI_API_KEY).")
+
+    scheduler.set_limits(tpm=args.tpm, rpm=args.rpm)
+    resume_paths = expand_inputs(args.resumes)
+    jd_paths = expand_inputs(args.jds)
+    jd_bundles = [path for path in expand_inputs(args.jd_bundles) if path.lower().endswith(".pdf")]
+    if not resume_paths or not (jd_paths or jd_bundles):
+        parser.error("No resumes or job descriptions matched the given paths.")
+
+    summary = run_batch(
+        resume_paths, jd_paths, args.out, args.api_key,
+        concurrency=args.concurrency,
+        tracker_path=args.tracker,
+        company_name=args.company,
+        timezone=args.timezone,
+        use_cache=not args.no_cache,
+        prescreen_threshold=args.prescreen_threshold,
+        strategy=args.strategy,
+        profile=args.profile,
+        jd_bundles=jd_bundles,
+        bundle_splitter=BundleSplitter(pages_per_jd=args.bundle_pages_per_jd),
+        log_workbook=args.log_workbook
+    )
+    print(json.dumps({k: v for k, v in summary.items() if k not in ("failures", "prescreened_out", "perf")}, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+# benchmarks – Offline performance benchmarks (no OpenAI key, no network)
+#
+#   fake_openai.py     local stand-in for the chat-completions endpoint
+#   corpus.py          generated resumes / JDs (DOCX and PDF) of several sizes
+#   run_benchmarks.py  runs every benchmark and writes a JSON report
+#
+# Run from the repository root:  python -m benchmarks.run_benchmarks --out bench.json
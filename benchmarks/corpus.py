@@ -0,0 +1,171 @@
+# corpus.py – Deterministic resume / JD fixtures for the benchmarks
+#
+# generate_corpus() writes one resume and one JD per size, each as DOCX and PDF, plus a copy of the
+# cover-letter template. The same seed always produces the same documents, so timings stay comparable
+# between versions. Every resume contains the "Was" text of REPLACEMENTS (the canned GPT suggestions
+# of fake_openai.py); from "medium" up one of them is split across runs, and "large" adds a table and
+# a header so the DOCX paths that walk tables and headers are exercised too. write_jd_bundle() builds a
+# multi-posting PDF export for the bundle reader (pdf_reader.py).
+
+import os
+import random
+import shutil
+
+import docx
+import fitz  # PyMuPDF
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(REPO_DIR, "Cover_Letter_Template.docx")
+
+# size -> approximate number of body paragraphs (~45 per page)
+SIZES = {"small": 45, "medium": 135, "large": 450}
+
+CANDIDATE_NAME = "Jordan Avery Smith"
+CONTACT_LINE = "jordan.smith@example.com | (312) 555-0199 | https://www.linkedin.com/in/jordan-smith | Chicago, IL"
+
+# (Was, New, Section) – the suggestions the fake server returns
+REPLACEMENTS = [
+    ("Managed a team of engineers", "Led a cross-functional team of 8 engineers", "Experience"),
+    ("Responsible for data pipelines", "Built and owned Python/SQL data pipelines processing 2M rows/day", "Experience"),
+    ("Worked on cloud migration", "Migrated 40 services to AWS, cutting hosting costs by 25%", "Experience"),
+    ("Good communication skills", "Presented quarterly results to executive stakeholders", "Summary"),
+    ("Familiar with machine learning", "Deployed scikit-learn and XGBoost models to production", "Skills"),
+    ("Helped improve processes", "Automated reporting workflows, saving 10 hours per week", "Experience"),
+]
+
+SKILLS = [
+    "Python", "SQL", "AWS", "Azure", "Docker", "Kubernetes", "Terraform", "Spark", "Airflow", "Tableau",
+    "Power BI", "Excel", "pandas", "NumPy", "scikit-learn", "XGBoost", "TensorFlow", "PyTorch", "Git", "CI/CD",
+    "REST APIs", "PostgreSQL", "MongoDB", "Kafka", "Snowflake", "dbt", "Linux", "Agile", "Scrum", "JIRA",
+    "stakeholder management", "data modeling", "ETL", "A/B testing", "forecasting", "statistics",
+]
+VERBS = ["Designed", "Implemented", "Delivered", "Optimized", "Automated", "Owned", "Analyzed", "Launched", "Scaled", "Reduced"]
+OBJECTS = [
+    "reporting dashboards", "batch ETL jobs", "customer churn models", "billing services", "data quality checks",
+    "inventory forecasts", "internal APIs", "deployment pipelines", "pricing experiments", "KPI definitions",
+]
+OUTCOMES = [
+    "improving accuracy by {n}%", "reducing runtime by {n}%", "saving ${n}K per year", "for {n} business units",
+    "serving {n}K daily users", "with {n}% fewer incidents",
+]
+
+
+def _bullet(rng):
+    skills = ", ".join(rng.sample(SKILLS, 2))
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 90))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skills}, {outcome}."
+
+
+def resume_paragraphs(size, seed=0):
+    rng = random.Random(f"resume-{size}-{seed}")
+    paragraphs = [CANDIDATE_NAME, CONTACT_LINE, "Summary",
+                  f"Data professional with {rng.randint(5, 15)} years of experience. {REPLACEMENTS[3][0]}.",
+                  "Skills", ", ".join(rng.sample(SKILLS, 14)) + f". {REPLACEMENTS[4][0]}.",
+                  "Experience"]
+    was_lines = [was for was, _new, section in REPLACEMENTS if section == "Experience"]
+    job = 0
+    while len(paragraphs) < SIZES[size] - 3:
+        if (len(paragraphs) - 7) % 9 == 0:
+            job += 1
+            paragraphs.append(f"Senior Analyst {job} – Company {job}, Chicago, IL ({2024 - 2 * job}–{2026 - 2 * job})")
+            continue
+        if job <= len(was_lines) and (len(paragraphs) - 7) % 9 == 1:
+            paragraphs.append(f"{was_lines[job - 1]} across {rng.randint(2, 9)} product lines.")
+            continue
+        paragraphs.append(_bullet(rng))
+    paragraphs += ["Education", "M.S. Data Science – University of Illinois", "B.S. Statistics – Northwestern University"]
+    return paragraphs
+
+
+def jd_paragraphs(size, seed=0):
+    rng = random.Random(f"jd-{size}-{seed}")
+    paragraphs = ["Senior Data Analyst – Acme Analytics Inc.", "Location: Chicago, IL (Hybrid)",
+                  "Recruiter: Taylor Brooks, taylor.brooks@acme.example, (312) 555-0123",
+                  "About the role"]
+    sections = ["Responsibilities", "Required Skills", "Preferred Qualifications", "Benefits"]
+    while len(paragraphs) < SIZES[size] // 2:
+        if len(paragraphs) % 8 == 4:
+            paragraphs.append(sections[(len(paragraphs) // 8) % len(sections)])
+            continue
+        paragraphs.append(
+            f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {', '.join(rng.sample(SKILLS, 3))}; "
+            f"{rng.randint(2, 8)}+ years of experience preferred."
+        )
+    paragraphs.append("Salary range: $110,000 – $140,000. Relocation support available.")
+    return paragraphs
+
+
+# === Writers ===
+def write_docx(paragraphs, path, split_runs=False, table=False, header=False):
+    document = docx.Document()
+    for text in paragraphs:
+        para = document.add_paragraph()
+        was = next((was for was, _new, _section in REPLACEMENTS if was in text), None)
+        if split_runs and was:
+            # Split the suggestion text over a bold and a plain run, like a hand-formatted resume
+            start = text.index(was)
+            middle = start + len(was) // 2
+            para.add_run(text[:start])
+            para.add_run(text[start:middle]).bold = True
+            para.add_run(text[middle:])
+        else:
+            para.add_run(text)
+    if table:
+        skills_table = document.add_table(rows=6, cols=3)
+        for i, cell in enumerate(skills_table._cells):
+            cell.text = SKILLS[i % len(SKILLS)]
+        skills_table.cell(5, 0).text = REPLACEMENTS[5][0]
+    if header:
+        document.sections[0].header.paragraphs[0].text = f"{CANDIDATE_NAME} – Resume"
+    document.save(path)
+    return path
+
+
+def write_pdf(paragraphs, path, lines_per_page=50):
+    document = fitz.open()
+    for start in range(0, len(paragraphs), lines_per_page):
+        page = document.new_page()
+        page.insert_text((50, 60), "\n".join(paragraphs[start:start + lines_per_page]), fontsize=8)
+    document.save(path)
+    document.close()
+    return path
+
+
+def write_jd_bundle(path, postings=60, pages_per_posting=3, seed=0, lines_per_page=50):
+    # A job-board style export: every posting starts on a new page with "Job Title:" / "Job ID:" lines
+    document = fitz.open()
+    for index in range(postings):
+        rng = random.Random(f"bundle-{seed}-{index}")
+        lines = [f"Job Title: {rng.choice(['Senior', 'Lead', 'Staff'])} Data Analyst {index + 1}",
+                 f"Job ID: REQ-{10000 + index}", f"Company: Employer {index + 1} Inc."]
+        lines += jd_paragraphs("small", f"{seed}-{index}")
+        while len(lines) < pages_per_posting * lines_per_page:
+            lines.append(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {', '.join(rng.sample(SKILLS, 3))}.")
+        for start in range(0, len(lines), lines_per_page):
+            page = document.new_page()
+            page.insert_text((50, 60), "\n".join(lines[start:start + lines_per_page]), fontsize=8)
+    document.save(path)
+    document.close()
+    return path
+
+
+# === Corpus ===
+def generate_corpus(out_dir, sizes=tuple(SIZES), seed=0):
+    # Returns {"resumes": {size: {"docx": path, "pdf": path}}, "jds": {...}, "template": path}
+    os.makedirs(out_dir, exist_ok=True)
+    corpus = {"resumes": {}, "jds": {}, "template": os.path.join(out_dir, "Cover_Letter_Template.docx")}
+    shutil.copyfile(TEMPLATE_PATH, corpus["template"])
+    for size in sizes:
+        resume = resume_paragraphs(size, seed)
+        jd = jd_paragraphs(size, seed)
+        richer = size != "small"
+        corpus["resumes"][size] = {
+            "docx": write_docx(resume, os.path.join(out_dir, f"resume_{size}.docx"),
+                               split_runs=richer, table=size == "large", header=size == "large"),
+            "pdf": write_pdf(resume, os.path.join(out_dir, f"resume_{size}.pdf")),
+        }
+        corpus["jds"][size] = {
+            "docx": write_docx(jd, os.path.join(out_dir, f"jd_{size}.docx")),
+            "pdf": write_pdf(jd, os.path.join(out_dir, f"jd_{size}.pdf")),
+        }
+    return corpus
@@ -0,0 +1,287 @@
+# fake_openai.py – Local stand-in for the OpenAI chat-completions endpoint
+#
+# Usage (standalone):
+#   python -m benchmarks.fake_openai --port 8765 --latency 0.5 --tokens-per-second 60
+#   OPENAI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run app.py
+#
+# Or in-process:
+#   with FakeOpenAIServer(latency=0.2) as server:
+#       os.environ["OPENAI_BASE_URL"] = server.base_url
+#
+# Answers are canned and match what the prompts ask for: the JD parse gets the parsed JD, a split
+# sub-request gets exactly the top-level keys listed under "Output keys:", the single prompt gets the
+# full get_resume_analysis schema and the cover-letter prompt gets plain text. The rewritten resume
+# echoes the resume from the prompt with the canned suggestions applied, so its size follows the input.
+#
+# Latency model: `latency` seconds before the first byte, then completion tokens at `tokens_per_second`
+# (0 = instantly). Streaming requests get SSE chunks spread over that time and a final usage chunk.
+# `error_rate` answers that share of requests with a 429 (Retry-After: 0) to exercise the retry path.
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.corpus import REPLACEMENTS
+
+CHARS_PER_TOKEN = 4
+
+CANNED_JOB_DESCRIPTION = {
+    "CompanyName": "Acme Analytics Inc.",
+    "JobTitle": "Senior Data Analyst",
+    "Recruiter": {"Name": "Taylor Brooks", "Phone": "(312) 555-0123", "Email": "taylor.brooks@acme.example"},
+    "JobLocation": "Chicago, IL (Hybrid)",
+    "RequiredSkillsAndKeywords": ["Python", "SQL", "AWS", "Airflow", "Tableau", "A/B testing", "stakeholder management"],
+    "Responsibilities": ["Build reporting dashboards", "Own batch ETL jobs", "Design pricing experiments"],
+    "PreferredQualificationsAndExperience": ["5+ years of analytics experience", "Experience with dbt and Snowflake"],
+    "SalaryRange": "$110,000 – $140,000",
+    "RelocationSupport": "Yes",
+    "USCitizenOrPermanentResidentRequired": "Not specified",
+    "PERequired": "No",
+}
+
+CANNED_COVER_LETTER = (
+    "I am excited to apply for the Senior Data Analyst position at Acme Analytics Inc. Over the past decade I have "
+    "built Python and SQL data pipelines, led cross-functional teams and turned analyses into decisions that "
+    "executives act on.\n\n"
+    "In my current role I migrated 40 services to AWS, automated reporting workflows that saved ten hours every week "
+    "and deployed forecasting models to production. I enjoy working closely with stakeholders to define the right "
+    "KPIs and to make data quality visible.\n\n"
+    "I would welcome the opportunity to bring this experience to your team. Thank you for your consideration."
+)
+
+
+def canned_analysis(resume_text=""):
+    optimized = resume_text
+    for was, new, _section in REPLACEMENTS:
+        optimized = optimized.replace(was, new)
+    return {
+        "ResumeContent": {
+            "Name": "Jordan Avery Smith", "Email": "jordan.smith@example.com", "Phone": "(312) 555-0199",
+            "Location": "Chicago, IL", "Skills": ["Python", "SQL", "AWS", "Tableau", "Airflow"],
+            "Experience": [{"Title": "Senior Analyst", "Company": "Company 1", "Years": "2022–2024"}],
+            "Education": ["M.S. Data Science", "B.S. Statistics"],
+        },
+        "JobDescription": CANNED_JOB_DESCRIPTION,
+        "ResumeEvaluation": {
+            "KeywordMatch": "Most required skills are present; A/B testing and dbt are missing.",
+            "ExperienceRelevance": "Strong analytics and pipeline experience.",
+            "Formatting": "ATS friendly, single column.",
+        },
+        "RedFlagDetection": ["No quantified results in the summary"],
+        "scoring": {
+            "atsCompatibilityScore": 72,
+            "breakdown": {"Keywords": 70, "Experience": 80, "Education": 90, "Formatting": 85, "Location": 100},
+        },
+        "ResumeImprovementSuggestions": [
+            {"Was": was, "New": new, "Section": section} for was, new, section in REPLACEMENTS
+        ],
+        "NewOptimizedResume": optimized,
+        "Output": {
+            "CompatibilityScoreOriginal": 72,
+            "CompatibilityScoreOptimized": 88,
+            "SummaryOfMatchedAndMissingSkills": {
+                "Matched": ["Python", "SQL", "AWS", "Airflow", "Tableau"],
+                "Missing": ["A/B testing", "dbt", "Snowflake"],
+            },
+            "ResumeImprovementRationale": "Quantified achievements and added the JD's missing keywords.",
+        },
+        "ImprovementsBreakdown": {
+            "MissingAndUnderusedKeywords": ["A/B testing", "dbt", "Snowflake", "stakeholder management"],
+            "FormattingAndStructuralATSIssues": "None found.",
+        },
+    }
+
+
+_OUTPUT_KEY_RE = re.compile(r"^- '([^'.]+)'", re.MULTILINE)
+
+
+def canned_response(messages):
+    # Picks the answer a real model would give to this prompt
+    system = next((m.get("content") or "" for m in messages if m.get("role") == "system"), "")
+    user = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+    if "cover letter" in system.lower():
+        return CANNED_COVER_LETTER
+    if user.startswith("Parse the job description"):
+        return json.dumps(CANNED_JOB_DESCRIPTION, ensure_ascii=False)
+    resume_text = user.rpartition("Resume:\n")[2]
+    analysis = canned_analysis(resume_text)
+    _head, marker, keys_part = user.partition("Output keys:\n")
+    if marker:
+        keys = _OUTPUT_KEY_RE.findall(keys_part)
+        analysis = {key: analysis[key] for key in keys if key in analysis}
+    return json.dumps(analysis, ensure_ascii=False)
+
+
+def _tokens(text):
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeOpenAI/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        fake = self.server.fake
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+
+        fake._count("requests")
+        if fake.error_rate and fake._random() < fake.error_rate:
+            fake._count("rate_limited")
+            self._send_json(429, {"error": {"message": "Rate limit reached (fake)", "type": "requests", "code": "rate_limit_exceeded"}},
+                            headers={"Retry-After": "0"})
+            return
+
+        messages = request.get("messages") or []
+        content = canned_response(messages)
+        usage = {
+            "prompt_tokens": sum(_tokens(m.get("content") or "") for m in messages),
+            "completion_tokens": _tokens(content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        model = request.get("model", "gpt-4")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        generation_seconds = usage["completion_tokens"] / fake.tokens_per_second if fake.tokens_per_second else 0.0
+        time.sleep(fake.latency)
+
+        if not request.get("stream"):
+            time.sleep(generation_seconds)
+            self._send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        fake._count("streamed")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        pieces = [content[i:i + fake.chunk_chars] for i in range(0, len(content), fake.chunk_chars)] or [""]
+        delay = generation_seconds / len(pieces)
+        for i, piece in enumerate(pieces):
+            delta = {"role": "assistant", "content": piece} if i == 0 else {"content": piece}
+            event = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+            }
+            self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            if delay:
+                time.sleep(delay)
+        final = {
+            "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+        self._write_chunk(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            usage_event = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                           "model": model, "choices": [], "usage": usage}
+            self._write_chunk(f"data: {json.dumps(usage_event)}\n\n".encode("utf-8"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+
+class FakeOpenAIServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, tokens_per_second=0.0, chunk_chars=24,
+                 error_rate=0.0, seed=0):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.chunk_chars = max(1, chunk_chars)
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "streamed": 0, "rate_limited": 0}
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _random(self):
+        with self._lock:
+            return self._rng.random()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+    def reset_stats(self):
+        with self._lock:
+            self.counters = dict.fromkeys(self.counters, 0)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve canned chat completions on a local port.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds before the first byte of every answer")
+    parser.add_argument("--tokens-per-second", type=float, default=60.0, help="Completion speed (0 = instant)")
+    parser.add_argument("--chunk-chars", type=int, default=24, help="Characters per streamed chunk")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 429")
+    args = parser.parse_args(argv)
+
+    server = FakeOpenAIServer(args.host, args.port, args.latency, args.tokens_per_second, args.chunk_chars, args.error_rate)
+    print(f"Fake OpenAI endpoint on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
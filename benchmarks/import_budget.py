@@ -0,0 +1,111 @@
+# import_budget.py – Import-time budget check for the repository modules
+#
+# Usage (from the repository root):
+#   python -m benchmarks.import_budget                 # exit status 1 if any module is over budget
+#   python -m benchmarks.import_budget --only resume_core tracker --repeat 5
+#   ATS_IMPORT_BUDGET_SCALE=2 python -m benchmarks.import_budget   # slower machine / CI runner
+#
+# Every module is imported in a fresh interpreter, `repeat` times; the fastest run is compared with the
+# module's budget, so a cold disk cache or a busy machine does not fail the check. A module also fails
+# when the import pulls in a library it must not load at import time (e.g. extract_text's module
+# loading Streamlit or pandas). Budgets are in milliseconds and only cover the module's own import,
+# not interpreter start-up.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BUDGET_SCALE = float(os.getenv("ATS_IMPORT_BUDGET_SCALE", "1"))
+
+_HEAVY = ("streamlit", "fitz", "pymupdf", "pandas", "openpyxl", "docx", "dotenv", "openai")
+
+# module -> (budget in ms, libraries that must not be imported with it)
+IMPORT_BUDGETS = {
+    "resume_core": (150, _HEAVY),
+    "main_work_version_1_01_updated": (150, _HEAVY),
+    "docx_text": (50, _HEAVY),
+    "tracker": (50, _HEAVY),
+    "tracker_store": (100, _HEAVY),
+    "tracker_analytics": (300, _HEAVY),
+    "tracker_journal": (150, _HEAVY),
+    "jobs": (150, _HEAVY),
+    "prescreen": (300, _HEAVY),
+    "gpt_helper_work_version": (1500, ("streamlit", "fitz", "pymupdf", "pandas", "openpyxl", "docx", "dotenv")),
+    "analysis_job": (2000, ("streamlit", "fitz", "pymupdf", "pandas", "openpyxl", "docx", "dotenv")),
+    "batch_runner": (2000, ("streamlit", "fitz", "pymupdf", "pandas", "openpyxl", "docx", "dotenv")),
+}
+
+_PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = (time.perf_counter() - start) * 1000\n"
+    "print(json.dumps({{'ms': elapsed, 'modules': sorted(m for m in sys.modules if '.' not in m)}}))\n"
+)
+
+
+def _repo_root():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module, repeat=3):
+    runs, loaded = [], set()
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)], cwd=_repo_root(),
+            capture_output=True, text=True, check=True
+        )
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        runs.append(probe["ms"])
+        loaded.update(probe["modules"])
+    return min(runs), loaded
+
+
+def check(modules=None, repeat=3, scale=BUDGET_SCALE):
+    results = {}
+    for module in modules or IMPORT_BUDGETS:
+        budget, forbidden = IMPORT_BUDGETS[module]
+        budget *= scale
+        try:
+            ms, loaded = measure_import(module, repeat)
+        except subprocess.CalledProcessError as e:
+            results[module] = {"ok": False, "error": (e.stderr or "").strip().splitlines()[-1:]}
+            continue
+        unwanted = sorted(name for name in forbidden if name in loaded)
+        results[module] = {
+            "ok": ms <= budget and not unwanted,
+            "ms": round(ms, 1),
+            "budget_ms": round(budget, 1),
+            "unwanted_imports": unwanted,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail when importing a module takes longer than its budget.")
+    parser.add_argument("--only", nargs="+", choices=list(IMPORT_BUDGETS), help="Modules to check (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh-interpreter imports per module (the fastest counts)")
+    parser.add_argument("--scale", type=float, default=BUDGET_SCALE, help="Multiply every budget (default: $ATS_IMPORT_BUDGET_SCALE or 1)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = check(args.only, max(1, args.repeat), args.scale)
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        for module, result in results.items():
+            if "error" in result:
+                print(f"✗ {module}: import failed: {' '.join(result['error'])}")
+                continue
+            mark = "✓" if result["ok"] else "✗"
+            line = f"{mark} {module}: {result['ms']} ms (budget {result['budget_ms']} ms)"
+            if result["unwanted_imports"]:
+                line += f", imports {', '.join(result['unwanted_imports'])} at load"
+            print(line)
+    return 0 if all(result["ok"] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
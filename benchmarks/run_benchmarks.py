@@ -0,0 +1,378 @@
+# run_benchmarks.py – Offline benchmark suite (fake OpenAI endpoint + generated corpus)
+#
+# Usage (from the repository root):
+#   python -m benchmarks.run_benchmarks --out bench_v1.5.json
+#   python -m benchmarks.run_benchmarks --quick --only extract_text docx_replace
+#   python -m benchmarks.run_benchmarks --out bench_new.json --compare bench_v1.5.json
+#
+# Benchmarks:
+#   extract_text    extract_text() on every corpus size, DOCX and PDF
+#   docx_replace    apply_replacements_to_docx() with the canned suggestions, saved to memory
+#   cover_letter    save_customized_cover_letter() into the template
+#   tracker_export  TrackerStore.export_xlsx() for trackers of several sizes
+#   stream          streamed single-prompt analysis: time to the first section and to the end
+#   pipeline        batch_runner.run_batch() against the fake endpoint at several concurrency levels
+#   pdf_bundle      split_bundle() on a multi-posting PDF export, one process vs. every core
+#   incremental     split analysis of a resume, of the same resume again and of it with two bullets edited
+#   tracker_analytics  TrackerAnalytics built from scratch vs. refreshed after one more analysis, and its views
+#
+# Every run is written as one JSON document with sorted keys: timing benchmarks report
+# {runs, mean_ms, median_ms, min_ms, max_ms, stdev_ms}, pipeline entries report pairs per minute and
+# request counts, incremental entries report requests and prompt tokens per run. --compare prints the change of each median (or throughput) against an earlier file.
+# The GPT response cache is disabled and the scheduler limits are lifted, so only the code under test
+# and the configured fake latency are measured.
+
+import os
+
+# Must be set before the repository modules are imported (the cache reads it at import time)
+os.environ["ATS_CACHE_DISABLE"] = "1"
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from io import BytesIO
+
+from benchmarks.corpus import REPLACEMENTS, SIZES, generate_corpus
+from benchmarks.fake_openai import FakeOpenAIServer, canned_analysis
+
+BENCHMARKS = ("extract_text", "docx_replace", "cover_letter", "tracker_export", "stream", "pipeline", "incremental", "pdf_bundle", "tracker_analytics")
+REPORT_SCHEMA_VERSION = 1
+FAKE_API_KEY = "sk-fake-benchmark"
+
+
+# === Timing ===
+def measure(fn, repeat=5, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "runs": repeat,
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "stdev_ms": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    }
+
+
+# === Benchmarks ===
+def bench_extract_text(corpus, repeat):
+    from resume_core import extract_text
+    results = {}
+    for kind in ("resumes", "jds"):
+        for size, paths in corpus[kind].items():
+            for fmt, path in paths.items():
+                results[f"{kind[:-1]}.{size}.{fmt}"] = measure(lambda path=path: extract_text(path), repeat)
+    return results
+
+
+def bench_docx_replace(corpus, repeat):
+    from resume_core import apply_replacements_to_docx
+    replacements = [(was, new) for was, new, _section in REPLACEMENTS]
+    results = {}
+    for size, paths in corpus["resumes"].items():
+        with open(paths["docx"], "rb") as f:
+            data = f.read()
+        _doc, _target, hits = apply_replacements_to_docx(data, replacements, BytesIO())
+        results[size] = measure(lambda data=data: apply_replacements_to_docx(data, replacements, BytesIO()), repeat)
+        results[size]["hits"] = sum(hit["Hits"] for hit in hits)
+    return results
+
+
+def bench_cover_letter(corpus, repeat, work_dir):
+    from resume_core import extract_text, save_customized_cover_letter
+    out_dir = os.path.join(work_dir, "cover_letters")
+    os.makedirs(out_dir, exist_ok=True)
+    cover_text = canned_analysis()["Output"]["ResumeImprovementRationale"]
+    results = {}
+    for size, paths in corpus["resumes"].items():
+        resume_text = extract_text(paths["docx"])
+        results[size] = measure(
+            lambda resume_text=resume_text: save_customized_cover_letter(corpus["template"], out_dir, cover_text, resume_text, "Acme"),
+            repeat
+        )
+    return results
+
+
+def bench_tracker_export(repeat, work_dir, analyses_counts=(10, 100, 1000)):
+    from tracker_store import TrackerStore
+    analysis = canned_analysis()
+    results = {}
+    for count in analyses_counts:
+        store = TrackerStore(os.path.join(work_dir, f"tracker_{count}.sqlite"))
+        try:
+            for i in range(count):
+                store.append_analysis(analysis, f"Company {i % 50}", f"Resume_JS_Company_{i}.docx", "resume.docx", date(2026, 1, 1))
+            results[f"analyses_{count}"] = measure(store.export_xlsx, repeat)
+            results[f"analyses_{count}"]["rows"] = sum(store.count(sheet) for sheet in ("JD_Analysis", "Resume_Tracker", "Resume_Change_Log"))
+        finally:
+            store.close()
+    return results
+
+
+def bench_tracker_analytics(repeat, work_dir, analyses_counts=(1000, 10000)):
+    from tracker_analytics import TrackerAnalytics
+    from tracker_store import TrackerStore
+    analysis = canned_analysis()
+    results = {}
+    for count in analyses_counts:
+        store = TrackerStore(os.path.join(work_dir, f"analytics_{count}.sqlite"))
+        try:
+            for i in range(count):
+                store.append_analysis(analysis, f"Company {i % 50}", f"Resume_JS_Company_{i}.docx", "resume.docx",
+                                      date(2025, 1, 1) + timedelta(days=i % 365))
+            analytics = TrackerAnalytics().refresh(store)
+
+            def append_and_refresh():
+                store.append_analysis(analysis, "Company 0", "Resume_JS_Company_new.docx", "resume.docx", date(2026, 1, 1))
+                analytics.refresh(store)
+
+            def views():
+                analytics.score_distribution("W")
+                analytics.top_rewrites(n=25)
+                analytics.top_missing_keywords(n=25)
+
+            results[f"analyses_{count}_full_refresh"] = measure(lambda: TrackerAnalytics().refresh(store), repeat)
+            # Includes the one-analysis insert itself
+            results[f"analyses_{count}_append_and_refresh"] = measure(append_and_refresh, repeat)
+            results[f"analyses_{count}_noop_refresh"] = measure(lambda: analytics.refresh(store), repeat)
+            results[f"analyses_{count}_views"] = measure(views, repeat)
+        finally:
+            store.close()
+    return results
+
+
+def bench_stream(corpus, repeat):
+    from gpt_helper_work_version import stream_resume_analysis
+    from resume_core import extract_text
+    results = {}
+    for size in corpus["resumes"]:
+        resume_text = extract_text(corpus["resumes"][size]["docx"])
+        jd_text = extract_text(corpus["jds"][size]["docx"])
+        first, total = [], []
+        # The first run also pays for the client and connection setup, so it is not timed
+        for _ in stream_resume_analysis(resume_text, jd_text, FAKE_API_KEY, use_cache=False):
+            pass
+        for _ in range(repeat):
+            start = time.perf_counter()
+            first_section = None
+            for _key, _value in stream_resume_analysis(resume_text, jd_text, FAKE_API_KEY, use_cache=False):
+                if first_section is None:
+                    first_section = time.perf_counter() - start
+            first.append(first_section * 1000)
+            total.append((time.perf_counter() - start) * 1000)
+        results[size] = {
+            "runs": repeat,
+            "first_section_median_ms": round(statistics.median(first), 3),
+            "median_ms": round(statistics.median(total), 3),
+        }
+    return results
+
+
+def bench_pipeline(corpus, server, work_dir, concurrency_levels, pairs, strategy, profile):
+    import batch_runner
+    resumes = [paths["docx"] for paths in corpus["resumes"].values()]
+    jds = [paths["docx"] for paths in corpus["jds"].values()]
+    # Distinct copies, so every pair is a separate result folder (and a separate JD for the JD-parse step)
+    inputs_dir = os.path.join(work_dir, "pipeline_inputs")
+    os.makedirs(inputs_dir, exist_ok=True)
+    jd_paths = []
+    for i in range(max(1, -(-pairs // len(resumes)))):
+        source = jds[i % len(jds)]
+        target = os.path.join(inputs_dir, f"jd_{i:03d}.docx")
+        shutil.copyfile(source, target)
+        jd_paths.append(target)
+
+    results = {}
+    for level in concurrency_levels:
+        out_dir = os.path.join(work_dir, f"pipeline_c{level}")
+        server.reset_stats()
+        summary = batch_runner.run_batch(
+            resumes, jd_paths, out_dir, FAKE_API_KEY, concurrency=level, use_cache=False,
+            strategy=strategy, profile=profile, log=lambda *_args: None
+        )
+        results[f"concurrency_{level}"] = {
+            "pairs": summary["ran"],
+            "failed": summary["failed"],
+            "elapsed_seconds": summary["elapsed_seconds"],
+            "pairs_per_minute": summary["pairs_per_minute"],
+            "requests": server.stats()["requests"],
+            "retries": summary["scheduler"]["retries"],
+        }
+    return results
+
+
+def bench_pdf_bundle(work_dir, repeat, postings):
+    from benchmarks.corpus import write_jd_bundle
+    from pdf_reader import split_bundle
+    bundle_path = write_jd_bundle(os.path.join(work_dir, "jd_bundle.pdf"), postings=postings)
+    results = {}
+    for workers in sorted({1, os.cpu_count() or 1}):
+        entry = measure(lambda: sum(1 for _jd in split_bundle(bundle_path, workers=workers)), repeat)
+        entry["postings"] = postings
+        results[f"workers_{workers}"] = entry
+    return results
+
+
+def bench_incremental(corpus, server, work_dir, profile):
+    from gpt_cache import ResponseCache
+    from gpt_helper_work_version import split_resume_analysis
+    from gpt_scheduler import CHARS_PER_TOKEN
+    from resume_core import extract_text
+    # Its own, enabled history: the response cache stays off, so every request that is sent is counted
+    history = ResponseCache(cache_dir=os.path.join(work_dir, "analysis_history"), enabled=True)
+    results = {}
+    for size in corpus["resumes"]:
+        resume_text = extract_text(corpus["resumes"][size]["docx"])
+        jd_text = extract_text(corpus["jds"][size]["docx"])
+        lines = resume_text.splitlines()
+        bullets = [i for i, line in enumerate(lines) if " using " in line]
+        for i in bullets[len(bullets) // 2:len(bullets) // 2 + 2]:
+            lines[i] = lines[i].rstrip(".") + ", cutting review time in half."
+        edited_text = "\n".join(lines)
+
+        for run_name, text in (("full", resume_text), ("unchanged", resume_text), ("two_bullets_edited", edited_text)):
+            server.reset_stats()
+            start = time.perf_counter()
+            analysis = split_resume_analysis(text, jd_text, FAKE_API_KEY, use_cache=True, profile=profile,
+                                             incremental=True, history=history)
+            analysis.run()
+            prompt_chars = sum(len(message["content"]) for messages in analysis.messages.values() for message in messages)
+            results[f"{size}_{run_name}"] = {
+                "mode": analysis.incremental_summary["mode"],
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+                "requests": server.stats()["requests"],
+                "prompt_tokens": prompt_chars // CHARS_PER_TOKEN,
+            }
+    return results
+
+
+# === Report ===
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    # One line per metric present in both reports; positive % = slower (or lower throughput)
+    lines = []
+    for bench, entries in sorted(current["results"].items()):
+        for name, entry in sorted(entries.items()):
+            before = baseline.get("results", {}).get(bench, {}).get(name)
+            if not before:
+                continue
+            metric = "pairs_per_minute" if "pairs_per_minute" in entry else "median_ms"
+            old, new = before.get(metric), entry.get(metric)
+            if not old or new is None:
+                continue
+            change = 100 * (new - old) / old
+            if metric == "pairs_per_minute":
+                change = -change
+            lines.append(f"{bench}.{name}: {metric} {old} -> {new} ({change:+.1f}%{' slower' if change > 0 else ''})")
+    return lines
+
+
+def run(args):
+    work_dir = tempfile.mkdtemp(prefix="ats_bench_")
+    try:
+        corpus = generate_corpus(os.path.join(work_dir, "corpus"), sizes=args.sizes)
+        report = {
+            "schema_version": REPORT_SCHEMA_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                "repeat": args.repeat, "sizes": list(args.sizes), "latency": args.latency,
+                "tokens_per_second": args.tokens_per_second, "concurrency": args.concurrency,
+                "pairs": args.pairs, "strategy": args.strategy, "profile": args.profile,
+                "bundle_postings": args.bundle_postings,
+            },
+            "results": {},
+        }
+        with FakeOpenAIServer(latency=args.latency, tokens_per_second=args.tokens_per_second) as server:
+            os.environ["OPENAI_BASE_URL"] = server.base_url
+            from gpt_helper_work_version import scheduler
+            # The fake endpoint has no limits; the scheduler must not add waits of its own
+            scheduler.set_limits(tpm=10 ** 9, rpm=10 ** 6)
+
+            for bench in args.only:
+                print(f"▶ {bench}", file=sys.stderr)
+                if bench == "extract_text":
+                    result = bench_extract_text(corpus, args.repeat)
+                elif bench == "docx_replace":
+                    result = bench_docx_replace(corpus, args.repeat)
+                elif bench == "cover_letter":
+                    result = bench_cover_letter(corpus, args.repeat, work_dir)
+                elif bench == "tracker_export":
+                    result = bench_tracker_export(args.repeat, work_dir)
+                elif bench == "stream":
+                    result = bench_stream(corpus, max(1, args.repeat // 2))
+                elif bench == "pdf_bundle":
+                    result = bench_pdf_bundle(work_dir, args.repeat, args.bundle_postings)
+                elif bench == "incremental":
+                    result = bench_incremental(corpus, server, work_dir, args.profile)
+                elif bench == "tracker_analytics":
+                    result = bench_tracker_analytics(args.repeat, work_dir)
+                else:
+                    result = bench_pipeline(corpus, server, work_dir, args.concurrency, args.pairs, args.strategy, args.profile)
+                report["results"][bench] = result
+        return report
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite and write a JSON report.")
+    parser.add_argument("--out", help="Write the report to this JSON file (default: print it)")
+    parser.add_argument("--compare", help="Earlier report to compare against")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES), help="Corpus sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement (after one warm-up)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake endpoint: seconds before the first byte")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Fake endpoint: completion speed (0 = instant)")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4, 8], help="Pipeline concurrency levels")
+    parser.add_argument("--pairs", type=int, default=12, help="Resume × JD pairs per pipeline run")
+    parser.add_argument("--strategy", default="split", choices=("split", "parsed_jd", "single"), help="Pipeline analysis strategy")
+    parser.add_argument("--profile", default="suggestions", choices=("score", "suggestions", "full"), help="Pipeline response profile")
+    parser.add_argument("--bundle-postings", type=int, default=100, help="Postings (3 pages each) in the pdf_bundle export")
+    parser.add_argument("--quick", action="store_true", help="Smoke run: 2 repeats, small corpus, concurrency 1 and 4")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.repeat, args.sizes, args.concurrency, args.pairs, args.bundle_postings = 2, ["small"], [1, 4], 4, 20
+
+    report = run(args)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for line in compare(report, baseline):
+            print(line, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+# cover_letter_template.py – Cover-letter template compiled once, rendered per letter without re-parsing
+#
+# Compiling a template (CoverLetterTemplate / load_template):
+#   * every "[Placeholder]" in body paragraphs, tables, headers and footers is found on the joined
+#     paragraph text, so a placeholder Word split over several runs is still found; it is moved into the
+#     run where it starts (that run's formatting wins, like docx_replace.py) and swapped for a sentinel
+#   * the "[InsertCoverLetterHere]" paragraph becomes the body slot (appended at the end if missing)
+#   * each XML part that holds a sentinel is kept as a list of literal chunks and slots; every other
+#     zip member is kept as raw bytes
+#
+# Rendering is string joining plus one zip write: no XML parsing, no paragraph walking, no regex over
+# the template. The GPT body becomes one paragraph per blank-line-separated block, formatted like the
+# marker paragraph; a salutation or closing in the GPT text is dropped because the template has both.
+# Placeholders without a value keep their original text.
+
+import os
+import re
+import threading
+import zipfile
+from datetime import datetime
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+import docx
+
+from docx_replace import _run_at, iter_document_paragraphs
+
+DEFAULT_TEMPLATE_PATH = os.getenv(
+    "ATS_COVER_LETTER_TEMPLATE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "Cover_Letter_Template.docx")
+)
+
+BODY_MARKER = "InsertCoverLetterHere"
+SALUTATION = "Salutation"
+_BODY_KEY = BODY_MARKER.lower()
+
+# "Dear [Contact’s Last Name] or Dear Hiring Manager:" is one slot; any other "[...]" is a placeholder
+_PLACEHOLDER_RE = re.compile(
+    r"(?P<salutation>Dear \[Contact[’']s Last Name\] or Dear Hiring Manager:)|\[(?P<name>[^\[\]\r\n]{1,60})\]"
+)
+# Private-use characters: valid in XML, never in a template
+_SLOT = "\ue000{}\ue001"
+_SLOT_RE = re.compile("\ue000(\\d+)\ue001")
+_INVALID_XML_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# === Candidate details from the resume text (compiled once) ===
+_NAME_RE = re.compile(r"^\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)", re.MULTILINE)
+_EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+")
+_PHONE_RE = re.compile(r"(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})")
+_LINKEDIN_RE = re.compile(r"(https?://(www\.)?linkedin\.com/in/[\w\d-]+)")
+_CITY_STATE_RE = re.compile(r"\b([A-Z][a-z]+(?:\s[A-Z][a-z]+)*,\s*[A-Z]{2})\b")
+
+_SALUTATION_LINE_RE = re.compile(r"^\s*(dear|hello|hi|to whom it may concern)\b[^\n]*\n+", re.IGNORECASE)
+_CLOSING_RE = re.compile(
+    r"\n\s*(sincerely|best regards|kind regards|warm regards|regards|respectfully|thank you)\s*,?[^\n]*(\n[^\n]*){0,3}\s*$",
+    re.IGNORECASE
+)
+
+
+def _key(name):
+    # "[Candidate Name]", "candidate name" and "Contact’s" / "Contact's" all refer to the same slot
+    return name.strip().strip("[]").strip().replace("’", "'").lower()
+
+
+def candidate_values(resume_text, today=None):
+    values = {}
+    name_match = _NAME_RE.search(resume_text)
+    email_match = _EMAIL_RE.search(resume_text)
+    phone_match = _PHONE_RE.search(resume_text)
+    linkedin_match = _LINKEDIN_RE.search(resume_text)
+    city_state_match = _CITY_STATE_RE.search(resume_text)
+
+    if name_match:
+        values["Candidate Name"] = name_match.group(1).strip()
+    if email_match:
+        values["candidate email"] = email_match.group(0).strip()
+    if phone_match:
+        digits = re.sub(r"\D", "", phone_match.group(0))
+        if len(digits) == 10:
+            values["candidate phone"] = f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+    if linkedin_match:
+        values["LinkedIn"] = linkedin_match.group(1).strip()
+    if city_state_match:
+        values["candidate city, State"] = city_state_match.group(1).strip()
+    values["date"] = (today or datetime.today()).strftime("%B %d, %Y")
+    return values
+
+
+def salutation(recruiter_name=None):
+    recruiter_name = (recruiter_name or "").strip()
+    if recruiter_name and recruiter_name.lower() not in ("n/a", "not specified", "unknown", "none"):
+        return f"Dear {recruiter_name}:"
+    return "Dear Hiring Manager:"
+
+
+def letter_body(cover_text):
+    # The template already has the salutation and the closing
+    text = (cover_text or "").replace("\r\n", "\n").strip()
+    text = _SALUTATION_LINE_RE.sub("", text, count=1)
+    text = _CLOSING_RE.sub("", text)
+    return [block.strip() for block in re.split(r"\n\s*\n", text) if block.strip()]
+
+
+def _xml_text(value):
+    return escape(_INVALID_XML_CHARS_RE.sub("", str(value)))
+
+
+class CoverLetterTemplate:
+    def __init__(self, source):
+        # source: a path, raw bytes or a binary file-like object
+        if isinstance(source, (bytes, bytearray)):
+            source = BytesIO(source)
+        doc = docx.Document(source)
+        self._slots = []          # slot index -> (normalized name, text as written in the template)
+        self.placeholders = {}    # normalized name -> [(part name, paragraph number)]
+        body_slot = self._compile_paragraphs(doc)
+
+        buffer = BytesIO()
+        doc.save(buffer)
+        self._members = []        # (ZipInfo, bytes or compiled chunks)
+        self._body_paragraph = None
+        with zipfile.ZipFile(BytesIO(buffer.getvalue())) as package:
+            for info in package.infolist():
+                data = package.read(info.filename)
+                if info.filename.endswith(".xml") and "\ue000".encode("utf-8") in data:
+                    data = self._compile_part(data.decode("utf-8"), body_slot)
+                self._members.append((info, data))
+
+    # === Compile: placeholders -> sentinels, one run each ===
+    def _slot(self, name, original):
+        self._slots.append((_key(name), original))
+        return _SLOT.format(len(self._slots) - 1)
+
+    def _compile_paragraphs(self, doc):
+        body_slot = None
+        for number, paragraph in enumerate(iter_document_paragraphs(doc)):
+            runs = paragraph.runs
+            texts = [run.text for run in runs]
+            full_text = "".join(texts)
+            matches = list(_PLACEHOLDER_RE.finditer(full_text))
+            if not matches:
+                continue
+            part_name = str(paragraph.part.partname)
+            if full_text.strip() == f"[{BODY_MARKER}]" and body_slot is None:
+                body_slot = self._slot(BODY_MARKER, full_text)
+                runs[0].text = body_slot
+                for run in runs[1:]:
+                    run._r.getparent().remove(run._r)
+                self.placeholders.setdefault(_key(BODY_MARKER), []).append((part_name, number))
+                continue
+
+            starts, offset = [], 0
+            for text in texts:
+                starts.append(offset)
+                offset += len(text)
+            changed = set()
+            for match in reversed(matches):
+                name = SALUTATION if match.group("salutation") else match.group("name")
+                self.placeholders.setdefault(_key(name), []).append((part_name, number))
+                slot = self._slot(name, match.group(0))
+                first, last = _run_at(starts, match.start()), _run_at(starts, match.end() - 1)
+                local_start, local_end = match.start() - starts[first], match.end() - starts[last]
+                if first == last:
+                    texts[first] = texts[first][:local_start] + slot + texts[first][local_end:]
+                else:
+                    texts[first] = texts[first][:local_start] + slot
+                    for middle in range(first + 1, last):
+                        texts[middle] = ""
+                    texts[last] = texts[last][local_end:]
+                changed.update(range(first, last + 1))
+            for i in changed:
+                runs[i].text = texts[i]
+                for t in runs[i]._r.findall(docx.oxml.ns.qn("w:t")):
+                    # Filled values may start or end with spaces
+                    t.set(docx.oxml.ns.qn("xml:space"), "preserve")
+
+        if body_slot is None:
+            body_slot = self._slot(BODY_MARKER, "")
+            doc.add_paragraph(body_slot)
+        return body_slot
+
+    def _compile_part(self, xml, body_slot):
+        position = xml.find(body_slot)
+        if position >= 0:
+            # The body paragraph is cut out as its own little template
+            start = max(xml.rfind("<w:p>", 0, position), xml.rfind("<w:p ", 0, position))
+            end = xml.find("</w:p>", position) + len("</w:p>")
+            paragraph = xml[start:end]
+            self._body_paragraph = tuple(paragraph.split(body_slot, 1))
+            xml = xml[:start] + body_slot + xml[end:]
+        chunks = _SLOT_RE.split(xml)
+        # Odd positions are slot indexes
+        return [chunk if i % 2 == 0 else int(chunk) for i, chunk in enumerate(chunks)]
+
+    # === Render ===
+    def _body_xml(self, body_paragraphs):
+        head, tail = self._body_paragraph
+        run_break = '</w:t><w:br/><w:t xml:space="preserve">'
+        return "".join(
+            head + _xml_text(block).replace("\n", run_break) + tail
+            for block in body_paragraphs
+        )
+
+    def render(self, values=None, body=None):
+        # values: {placeholder name: text} ("Candidate Name" or "[Candidate Name]"); body: GPT letter text
+        values = {_key(name): value for name, value in (values or {}).items() if value is not None}
+        body_xml = self._body_xml(letter_body(body)) if self._body_paragraph else ""
+        output = BytesIO()
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as package:
+            for info, data in self._members:
+                if isinstance(data, list):
+                    parts = []
+                    for chunk in data:
+                        if isinstance(chunk, str):
+                            parts.append(chunk)
+                            continue
+                        key, original = self._slots[chunk]
+                        parts.append(body_xml if key == _BODY_KEY else _xml_text(values.get(key, original)))
+                    data = "".join(parts).encode("utf-8")
+                package.writestr(info, data)
+        return output.getvalue()
+
+    def save(self, save_path, values=None, body=None):
+        # save_path may be a path or a writable buffer
+        data = self.render(values, body)
+        if isinstance(save_path, str):
+            with open(save_path, "wb") as f:
+                f.write(data)
+        else:
+            save_path.write(data)
+        return save_path
+
+
+# === Compiled templates, reused until the file changes ===
+_templates = {}
+_templates_lock = threading.Lock()
+
+def load_template(template_path=DEFAULT_TEMPLATE_PATH):
+    stat = os.stat(template_path)
+    key = (os.path.abspath(template_path), stat.st_mtime_ns, stat.st_size)
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is None:
+            template = CoverLetterTemplate(template_path)
+            _templates[key] = template
+        return template
@@ -0,0 +1,157 @@
+# docx_replace.py – Single-pass multi-pattern replacement for DOCX documents
+#
+# All (Was, New) pairs are compiled once into one case-insensitive alternation, ordered as GPT listed
+# them, and each paragraph is scanned with it in a single pass. The alternation sits in a lookahead, so
+# the pass reports every position where some suggestion starts, even inside another match; matches are
+# then taken left to right, and at the same position the suggestion listed first wins. Suggestions that
+# lose to an overlapping match are counted in the hit report's "Overlapped" instead of being dropped
+# silently. Every match is found in the original text, so a "New" text cannot trigger another replacement.
+#
+# A paragraph's text is the text of all its runs, including those inside hyperlinks. Only the runs a
+# match touches are rewritten: the replacement takes the formatting of the run where the match starts,
+# and text outside the match keeps its original runs. Body paragraphs, tables (including nested
+# tables), headers and footers are all covered.
+
+import re
+from bisect import bisect_right
+
+
+class ReplacementEngine:
+    def __init__(self, replacements):
+        self.replacements = []
+        seen = set()
+        for old, new in replacements:
+            old = (old or "").strip()
+            if not old or old.lower() in seen:
+                continue
+            seen.add(old.lower())
+            self.replacements.append((old, new or ""))
+
+        self.hits = [0] * len(self.replacements)
+        self.overlapped = [0] * len(self.replacements)
+        if self.replacements:
+            alternatives = "|".join(f"({re.escape(old)})" for old, _new in self.replacements)
+            self._pattern = re.compile(f"(?=(?:{alternatives}))", re.IGNORECASE)
+        else:
+            self._pattern = None
+        # First letter -> suggestion indexes, to find the later suggestions a match shadows at its own position
+        self._by_first_letter = {}
+        for index, (old, _new) in enumerate(self.replacements):
+            self._by_first_letter.setdefault(old[0].lower(), []).append(index)
+
+    def _select_matches(self, text):
+        # (start, end, suggestion index) that do not overlap, leftmost first, in one pass over text
+        selected = []
+        covered_until, covering = 0, None
+        for match in self._pattern.finditer(text):
+            index = match.lastindex - 1
+            start, end = match.span(match.lastindex)
+            for other in self._by_first_letter[self.replacements[index][0][0].lower()]:
+                old = self.replacements[other][0]
+                if other > index and text[start:start + len(old)].lower() == old.lower():
+                    self.overlapped[other] += 1
+            if start >= covered_until:
+                selected.append((start, end, index))
+                covered_until, covering = end, index
+            elif index != covering:
+                # A suggestion overlapping its own previous match is not a separate occurrence
+                self.overlapped[index] += 1
+        return selected
+
+    def replace_in_paragraph(self, paragraph):
+        if self._pattern is None:
+            return 0
+        runs = _paragraph_runs(paragraph)
+        if not runs:
+            return 0
+        texts = [run.text for run in runs]
+        matches = self._select_matches("".join(texts))
+        if not matches:
+            return 0
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text)
+
+        changed = set()
+        # Right to left, so offsets of earlier matches stay valid while runs are edited
+        for match_start, match_end, index in reversed(matches):
+            self.hits[index] += 1
+            new_text = self.replacements[index][1]
+            first = _run_at(starts, match_start)
+            last = _run_at(starts, match_end - 1)
+            local_start = match_start - starts[first]
+            local_end = match_end - starts[last]
+
+            if first == last:
+                texts[first] = texts[first][:local_start] + new_text + texts[first][local_end:]
+            else:
+                texts[first] = texts[first][:local_start] + new_text
+                for middle in range(first + 1, last):
+                    texts[middle] = ""
+                texts[last] = texts[last][local_end:]
+            changed.update(range(first, last + 1))
+
+        for i in changed:
+            if runs[i].text != texts[i]:
+                runs[i].text = texts[i]
+        return len(matches)
+
+    def apply(self, doc):
+        for paragraph in iter_document_paragraphs(doc):
+            self.replace_in_paragraph(paragraph)
+        return self.hit_report()
+
+    # One entry per suggestion, in the original order; Hits == 0 means it was never applied,
+    # Overlapped counts matches skipped because an overlapping match was applied instead
+    def hit_report(self):
+        return [
+            {"Was": old, "New": new, "Hits": self.hits[i], "Overlapped": self.overlapped[i]}
+            for i, (old, new) in enumerate(self.replacements)
+        ]
+
+
+def _paragraph_runs(paragraph):
+    # paragraph.runs leaves out runs inside w:hyperlink; take both, in document order
+    from docx.text.run import Run
+
+    return [Run(r, paragraph) for r in paragraph._p.xpath("./w:r | ./w:hyperlink/w:r")]
+
+
+def _run_at(starts, position):
+    # Last run starting at or before position; empty runs share their successor's offset, so this is the run holding it
+    return bisect_right(starts, position) - 1
+
+
+# === Paragraph traversal: body, tables, headers and footers ===
+def _iter_block_paragraphs(container):
+    for paragraph in container.paragraphs:
+        yield paragraph
+    for table in container.tables:
+        for row in table.rows:
+            seen_cells = set()
+            for cell in row.cells:
+                # Merged cells show up once per grid column; visit each underlying cell once
+                if cell._tc in seen_cells:
+                    continue
+                seen_cells.add(cell._tc)
+                yield from _iter_block_paragraphs(cell)
+
+def iter_document_paragraphs(doc):
+    yield from _iter_block_paragraphs(doc)
+    seen_parts = set()
+    for section in doc.sections:
+        for part in (section.header, section.first_page_header, section.even_page_header,
+                     section.footer, section.first_page_footer, section.even_page_footer):
+            if part.is_linked_to_previous:
+                continue
+            if part._element in seen_parts:
+                continue
+            seen_parts.add(part._element)
+            yield from _iter_block_paragraphs(part)
+
+
+def replace_in_document(doc, replacements):
+    return ReplacementEngine(replacements).apply(doc)
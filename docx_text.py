@@ -0,0 +1,85 @@
+# docx_text.py – Streaming DOCX text extraction straight from the zip (no python-docx object model)
+#
+# word/document.xml (plus header/footer parts) is read with ElementTree.iterparse, so memory stays
+# flat regardless of document size. Paragraph text is yielded in document order, including table
+# cells and text boxes. Accepts a path, raw bytes or any binary file-like object.
+
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_P = W_NS + "p"
+_T = W_NS + "t"
+_TAB = W_NS + "tab"
+_BR = W_NS + "br"
+_CR = W_NS + "cr"
+
+_HEADER_RE = re.compile(r"^word/header(\d*)\.xml$")
+_FOOTER_RE = re.compile(r"^word/footer(\d*)\.xml$")
+
+
+def _as_zip_source(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def _iter_part_paragraphs(zf, part_name):
+    # A stack of buffers: text boxes put whole paragraphs inside a run of the outer paragraph
+    stack = []
+    fallback_depth = 0
+    with zf.open(part_name) as xml_stream:
+        for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == MC_FALLBACK:
+                    # Legacy VML copy of a text box that also appears in mc:Choice
+                    fallback_depth += 1
+                elif tag == _P and not fallback_depth:
+                    stack.append([])
+                continue
+
+            if tag == MC_FALLBACK:
+                fallback_depth -= 1
+                elem.clear()
+            elif fallback_depth or not stack:
+                continue
+            elif tag == _T:
+                stack[-1].append(elem.text or "")
+            elif tag == _TAB:
+                stack[-1].append("\t")
+            elif tag in (_BR, _CR):
+                stack[-1].append("\n")
+            elif tag == _P:
+                yield "".join(stack.pop())
+                if not stack:
+                    elem.clear()
+
+
+def _sorted_parts(names, pattern):
+    matches = [(pattern.match(name), name) for name in names]
+    return [name for match, name in sorted(
+        ((m, n) for m, n in matches if m), key=lambda item: int(item[0].group(1) or 0)
+    )]
+
+
+def iter_docx_paragraphs(source, include_headers_footers=True):
+    with zipfile.ZipFile(_as_zip_source(source)) as zf:
+        names = zf.namelist()
+        headers = _sorted_parts(names, _HEADER_RE) if include_headers_footers else []
+        footers = _sorted_parts(names, _FOOTER_RE) if include_headers_footers else []
+        # Headers first (resume templates often keep the name/contact block there), then body, then footers.
+        # Empty header/footer paragraphs are layout filler and are dropped; body paragraphs are kept as-is.
+        for part_name in headers:
+            yield from (text for text in _iter_part_paragraphs(zf, part_name) if text.strip())
+        yield from _iter_part_paragraphs(zf, "word/document.xml")
+        for part_name in footers:
+            yield from (text for text in _iter_part_paragraphs(zf, part_name) if text.strip())
+
+
+def extract_docx_text(source, include_headers_footers=True):
+    return "\n".join(iter_docx_paragraphs(source, include_headers_footers=include_headers_footers))
@@ -0,0 +1,192 @@
+# gpt_cache.py – Content-addressed on-disk cache for GPT responses
+#
+# Entries are stored as one JSON file per key under CACHE_DIR/<2-char prefix>/<sha256>.json.
+# The file mtime doubles as the "last used" timestamp, so eviction is LRU by size and age.
+# The entry count and total size are kept in memory (updated by set/get/prune) so stats() is cheap
+# enough for every Streamlit rerun; only prune() walks the directory, and it resets both totals
+# (which also picks up entries written by other processes sharing the directory).
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+# === Defaults (overridable through environment variables) ===
+CACHE_DIR = os.getenv(
+    "ATS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".ats_resume_optimizer", "gpt_cache")
+)
+CACHE_MAX_BYTES = int(os.getenv("ATS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+CACHE_MAX_AGE_DAYS = float(os.getenv("ATS_CACHE_MAX_AGE_DAYS", "30"))
+CACHE_DISABLED = os.getenv("ATS_CACHE_DISABLE", "").strip().lower() in ("1", "true", "yes")
+
+
+# === Cache Key ===
+def make_cache_key(**parts):
+    # Stable JSON (sorted keys, no whitespace) so the same inputs always hash the same
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# === Response Cache ===
+class ResponseCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES,
+                 max_age_days=CACHE_MAX_AGE_DAYS, enabled=not CACHE_DISABLED):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400 if max_age_days else None
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._written_since_prune = 0
+        # None until the first prune() has counted what is already on disk
+        self._entry_count = None
+        self._total_bytes = None
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _is_expired(self, created):
+        return self.max_age_seconds is not None and time.time() - created > self.max_age_seconds
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if self._is_expired(entry.get("created", 0)):
+            self._discard(path)
+            with self._lock:
+                self.misses += 1
+                self.evictions += 1
+            return None
+
+        # Touch the file so it counts as recently used for LRU eviction
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry.get("value")
+
+    def set(self, key, value, **metadata):
+        if not self.enabled:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {"created": time.time(), "value": value, "meta": metadata}
+
+        # Write to a temp file and rename so readers never see a half-written entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            size = os.path.getsize(tmp_path)
+            try:
+                replaced_size = os.path.getsize(path)
+            except OSError:
+                replaced_size = None
+            os.replace(tmp_path, path)
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._entry_count is not None:
+                self._entry_count += 1 if replaced_size is None else 0
+                self._total_bytes += size - (replaced_size or 0)
+            self._written_since_prune += size
+            should_prune = self._written_since_prune > self.max_bytes // 20
+        if should_prune:
+            self.prune()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _discard(self, path):
+        # Remove one cache entry and take it off the in-memory totals
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._entry_count is not None:
+                self._entry_count = max(0, self._entry_count - 1)
+                self._total_bytes = max(0, self._total_bytes - size)
+
+    def _entries(self):
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    # Drop expired entries, then the least recently used ones until under max_bytes
+    def prune(self):
+        if not os.path.isdir(self.cache_dir):
+            with self._lock:
+                self._entry_count, self._total_bytes = 0, 0
+            return 0
+        now = time.time()
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _path, size, _mtime in entries)
+        removed = 0
+        for path, size, mtime in entries:
+            expired = self.max_age_seconds is not None and now - mtime > self.max_age_seconds
+            if not expired and total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        with self._lock:
+            self.evictions += removed
+            self._written_since_prune = 0
+            self._entry_count = len(entries) - removed
+            self._total_bytes = total
+        return removed
+
+    def clear(self):
+        removed = 0
+        for path, _size, _mtime in list(self._entries()):
+            self._remove(path)
+            removed += 1
+        with self._lock:
+            self._entry_count, self._total_bytes = 0, 0
+        return removed
+
+    def stats(self):
+        if self._entry_count is None:
+            self.prune()  # first call only: count (and trim) what earlier runs left on disk
+        # One snapshot under the lock, so the counters agree with each other
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": self._entry_count,
+                "size_bytes": self._total_bytes,
+            }
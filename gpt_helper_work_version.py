@@ -1,156 +1,955 @@
 # gpt_helper_work_version.py (v1.3.1) – JSON prompt optimized
 
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import openai
 from openai import OpenAI
+from gpt_cache import ResponseCache, make_cache_key
+from gpt_scheduler import (
+    CHARS_PER_TOKEN, GPTRequestError, GPTTransientError, RequestScheduler, estimate_tokens
+)
+from json_stream import TopLevelJSONStreamParser
+import perf
+from resume_sections import diff_sections, normalize, resume_lineage, split_sections
 
-def get_resume_analysis(resume_text, jd_text, api_key, include_replacements=False, prompt_instructions=None): #default value declared (v1.3.1)
-    client = OpenAI(api_key=api_key)
-
-    base_prompt = (
-        "Act as an Applicant Tracking System (ATS) used by a hiring company.\n"
-        "Compare the uploaded resume with the job description (JD) provided and simulate a full ATS screening and optimization process.\n\n"
-
-        "Perform the following steps:\n\n"
-
-        "1️⃣ Parse Resume Content:\n"
-        "- Contact Information\n"
-        "- Professional Summary\n"
-        "- Work Experience\n"
-        "- Education\n"
-        "- Skills and Tools\n"
-        "- Certifications and Languages\n\n"
-
-        "2️⃣ Parse Job Description (JD):\n"
-        "- Company Name\n"
-        "- Job Title\n"
-        "- Name, phone, email of the recruiter\n"
-        "- Job location (If there are multiple locations, choose the nearest to the resume information)\n"
-        "- Required Skills and Keywords\n"
-        "- Responsibilities\n"
-        "- Preferred Qualifications and Experience\n"
-        "- Salary range\n"
-        "- Relocation support (If not mentioned, answer with NM)\n"
-        "- Is it required US Citizen or Permanent Resident? (If not mentioned, answer with NM)\n"
-        "- Is Licensed Professional Engineer, PE or P.E. required? (If not mentioned, answer with Not required)\n\n"
-
-        "3️⃣ Resume Evaluation:\n"
-        "- Match hard and soft skills (consider frequency/context)\n"
-        "- Job title and role alignment\n"
-        "- Years and scope of experience\n"
-        "- Education compatibility\n"
-        "- Licensed Professional Engineer, PE or P.E. if it is required.\n"
-        "- Date formatting and structure\n"
-        "- ATS-friendly formatting compliance\n\n"
-
-        "4️⃣ Red Flag Detection:\n"
-        "- Employment gaps\n"
-        "- Missing section headers\n"
-        "- Keyword stuffing\n"
-        "- Licensed Professional Engineer, PE or P.E. if required and missing\n"
-        "- US Citizenship requirement if missing\n"
-        "- Vague or irrelevant job titles\n\n"
-
-        "5️⃣ Scoring:\n"
-        "- Assign an ATS compatibility score (0–100%) based on:\n"
-        "  - Keyword match\n"
-        "  - Role and title alignment\n"
-        "  - Skill/tool match\n"
-        "  - Licensed Professional Engineer, PE or P.E. if it is required (if missing, consider no fit)\n"
-        "  - Education relevance\n"
-        "  - Formatting compliance\n\n"
-
-        "6️⃣ Resume Improvement Suggestions:\n"
-        "- Suggest replacements or additions to better align with the JD\n"
-        "- Do not invent or assume experience\n"
-        "- Reframe existing experience using similar language\n"
-        "- List the 5 experiences and skills that are irrelevant to the position described in the resume\n"
-        "- For each suggestion, include:\n"
-        "   - 'Was': the original phrase\n"
-        "   - 'New': the improved phrase\n"
-        "   - 'Section': which resume section it came from\n"
-        "- Try to classify into:\n"
-        "   - Head (Candidate personal information)\n"
-        "   - Target Position\n"
-        "   - Professional Profile\n"
-        "   - Expertises\n"
-        "   - Accomplishments\n"
-        "   - Career Experience\n"
-        "   - Skills\n"
-        "   - Certifications\n"
-        "   - Education\n"
-        "   - Others (fallback if unknown)\n\n"
-
-        "7️⃣ Generate a New Optimized Resume:\n"
-        "- ATS-compliant formatting\n"
-        "- Standard section headers, no tables or graphics\n"
-        "- Consistent date formats\n"
-        "- Use a clear, professional tone\n"
-        "- Do not introduce untrue information\n\n"
-
-        "8️⃣ Return the Output As:\n"
-        "- ✅ Compatibility Score (original and optimized)\n"
-        "- ✅ Summary of matched and missing skills\n"
-        "- ✅ Change Log (Was → New) in JSON format with Section\n"
-        "- ✅ Resume improvement rationale\n"
-        "- ✅ Final optimized resume text\n\n"
-
-        "9️⃣ Suggest Improvements Breakdown:\n"
-        "- List missing and underused keywords\n"
-        "- Suggest sentence rewrites per section\n"
-        "- Highlight formatting and structural ATS issues\n"
-        "- Provide summary and rationale\n"
-
-        "🔟 Return Final Output Structure:\n"
-        "- 'ResumeContent': parsed resume information\n"
-        "- 'JobDescription': parsed JD fields\n"
-        "- 'ResumeEvaluation': all ATS alignment factors\n"
-        "- 'RedFlagDetection': detected resume risks\n"
-        "- 'Scoring': detailed scoring breakdown\n"
-        "- 'ResumeImprovementSuggestions': full change log with Was/New/Section\n"
-        "- 'NewOptimizedResume': ATS rewritten resume text (string format)\n"
-        "- 'Output':\n"
-        "  - 'CompatibilityScoreOriginal': original resume score\n"
-        "  - 'CompatibilityScoreOptimized': after improvements\n"
-        "  - 'SummaryOfMatchedAndMissingSkills': list\n"
-        "  - 'ChangeLog': list of {'Was', 'New', 'Section'}\n"
-        "  - 'ResumeImprovementRationale': explanation\n"
-        "  - 'FinalOptimizedResumeText': final text-only resume\n"
-        "- 'ImprovementsBreakdown':\n"
-        "  - 'MissingAndUnderusedKeywords': list\n"
-        "  - 'SentenceRewritesPerSection': list\n"
-        "  - 'FormattingAndStructuralATSIssues': notes\n"
-        "  - 'SummaryAndRationale': overview justification\n\n"
-
-        "✅ Return ONLY a single valid JSON object using the exact key names above. Do not include any explanations or markdown. Use double quotes for all keys and string values."
+# Bump whenever a prompt below changes so previously cached answers are not reused
+PROMPT_VERSION = "v1.3.1"
+
+# === Model and structured output (v1.5) ===
+OPENAI_MODEL = os.getenv("ATS_OPENAI_MODEL", "gpt-4")
+# Models that accept response_format={"type": "json_object"}; the original gpt-4 does not, so it relies on
+# the prompt plus local validation and repair alone
+_JSON_MODE_MODEL_PREFIXES = ("gpt-4o", "gpt-4-turbo", "gpt-4-1106", "gpt-4-0125", "gpt-4.1", "gpt-5", "gpt-3.5-turbo", "o1", "o3", "o4")
+
+def json_mode_params(model=OPENAI_MODEL):
+    return {"response_format": {"type": "json_object"}} if model.startswith(_JSON_MODE_MODEL_PREFIXES) else {}
+
+# === Shared response cache (hit/miss counters available via response_cache.stats()) ===
+response_cache = ResponseCache()
+
+# === Shared request scheduler: TPM/RPM admission, retries, typed errors (stats via scheduler.stats()) ===
+scheduler = RequestScheduler()
+
+# === Pooled OpenAI clients (one per API key, so HTTP connections are reused) ===
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(api_key):
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            # Retries are owned by the scheduler, so the client's own retry loop is switched off
+            client = OpenAI(api_key=api_key, max_retries=0)
+            _clients[api_key] = client
+        return client
+
+# === Chat completion with content-addressed caching ===
+# use_cache=False bypasses the lookup but still stores the fresh answer, so a forced re-run refreshes the entry.
+# Raises GPTRequestError (or a subclass) when the request fails.
+def _cached_chat_completion(api_key, messages, model, use_cache=True, **params):
+    cache_key = make_cache_key(prompt_version=PROMPT_VERSION, model=model, params=params, messages=messages)
+    if use_cache:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            perf.record_call(model, 0.0, cached=True)
+            return cached
+
+    client = get_client(api_key)
+    start = time.perf_counter()
+    response = scheduler.call(
+        lambda: client.chat.completions.create(model=model, messages=messages, **params),
+        messages, params.get("max_tokens")
     )
+    usage = getattr(response, "usage", None)
+    content = response.choices[0].message.content
+    perf.record_call(
+        model, time.perf_counter() - start, completion_chars=len(content or ""),
+        prompt_tokens=getattr(usage, "prompt_tokens", None), completion_tokens=getattr(usage, "completion_tokens", None)
+    )
+    response_cache.set(cache_key, content, model=model)
+    return content
+
+# === Streaming variant: yields text chunks, caches the full answer under the same key ===
+def _cached_chat_completion_stream(api_key, messages, model, use_cache=True, **params):
+    cache_key = make_cache_key(prompt_version=PROMPT_VERSION, model=model, params=params, messages=messages)
+    if use_cache:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            perf.record_call(model, 0.0, cached=True, stream=True)
+            yield cached
+            return
+
+    client = get_client(api_key)
+    start = time.perf_counter()
+    # Opening the stream is retried by the scheduler; once text has been yielded a failure can only be raised
+    events = scheduler.call(
+        lambda: client.chat.completions.create(
+            model=model, messages=messages, stream=True, stream_options={"include_usage": True}, **params
+        ),
+        messages, params.get("max_tokens"), stream=True
+    )
+    parts = []
+    usage = None
+    try:
+        for event in events:
+            # With include_usage the last event carries the token counts and no choices
+            usage = getattr(event, "usage", None) or usage
+            if not event.choices:
+                continue
+            delta = event.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+    except openai.OpenAIError as e:
+        raise GPTTransientError(f"OpenAI stream was interrupted: {e}") from e
+    finally:
+        # Settled however the stream ends (finished, interrupted or abandoned by the reader)
+        content = "".join(parts)
+        actual = usage.total_tokens if usage is not None else estimate_tokens(messages, 0) + len(content) // CHARS_PER_TOKEN
+        scheduler.settle(estimate_tokens(messages, params.get("max_tokens")), actual)
+    perf.record_call(
+        model, time.perf_counter() - start, stream=True, completion_chars=len(content),
+        prompt_tokens=getattr(usage, "prompt_tokens", None), completion_tokens=getattr(usage, "completion_tokens", None)
+    )
+    response_cache.set(cache_key, content, model=model)
+
+# === Extract the JSON object from a raw GPT answer (raises ValueError if there is none) ===
+# Decodes from the first "{" and ignores whatever follows the object (markdown fences, a stray brace).
+def parse_analysis_json(raw_output):
+    text = raw_output or ""
+    start = text.find("{")
+    if start < 0:
+        raise ValueError("No JSON object found in GPT output")
+    try:
+        value, _end = json.JSONDecoder().raw_decode(text, start)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"GPT output is not valid JSON: {e}") from e
+    if not isinstance(value, dict):
+        raise ValueError("GPT output is not a JSON object")
+    return value
+
+# Whole object if it parses, otherwise every top-level member that was completed before the answer broke off
+def salvage_json(raw_output):
+    try:
+        return parse_analysis_json(raw_output)
+    except ValueError:
+        parser = TopLevelJSONStreamParser()
+        parser.feed(raw_output or "")
+        return parser.result
+
+# === ATS analysis prompt, kept in steps so the JD parse can also run on its own (v1.5) ===
+_ANALYSIS_INTRO = (
+    "Act as an Applicant Tracking System (ATS) used by a hiring company.\n"
+    "Compare the uploaded resume with the job description (JD) provided and simulate a full ATS screening and optimization process.\n\n"
+
+    "Perform the following steps:\n\n"
+)
+
+_RESUME_PARSE_FIELDS = (
+    "- Contact Information\n"
+    "- Professional Summary\n"
+    "- Work Experience\n"
+    "- Education\n"
+    "- Skills and Tools\n"
+    "- Certifications and Languages\n\n"
+)
+
+_JD_PARSE_FIELDS = (
+    "- Company Name\n"
+    "- Job Title\n"
+    "- Name, phone, email of the recruiter\n"
+    "- Job location (If there are multiple locations, choose the nearest to the resume information)\n"
+    "- Required Skills and Keywords\n"
+    "- Responsibilities\n"
+    "- Preferred Qualifications and Experience\n"
+    "- Salary range\n"
+    "- Relocation support (If not mentioned, answer with NM)\n"
+    "- Is it required US Citizen or Permanent Resident? (If not mentioned, answer with NM)\n"
+    "- Is Licensed Professional Engineer, PE or P.E. required? (If not mentioned, answer with Not required)\n\n"
+)
+
+_EVALUATION_CRITERIA = (
+    "- Match hard and soft skills (consider frequency/context)\n"
+    "- Job title and role alignment\n"
+    "- Years and scope of experience\n"
+    "- Education compatibility\n"
+    "- Licensed Professional Engineer, PE or P.E. if it is required.\n"
+    "- Date formatting and structure\n"
+    "- ATS-friendly formatting compliance\n\n"
+)
+
+_RED_FLAG_CHECKS = (
+    "- Employment gaps\n"
+    "- Missing section headers\n"
+    "- Keyword stuffing\n"
+    "- Licensed Professional Engineer, PE or P.E. if required and missing\n"
+    "- US Citizenship requirement if missing\n"
+    "- Vague or irrelevant job titles\n\n"
+)
+
+_SCORING_CRITERIA = (
+    "- Assign an ATS compatibility score (0–100%) based on:\n"
+    "  - Keyword match\n"
+    "  - Role and title alignment\n"
+    "  - Skill/tool match\n"
+    "  - Licensed Professional Engineer, PE or P.E. if it is required (if missing, consider no fit)\n"
+    "  - Education relevance\n"
+    "  - Formatting compliance\n\n"
+)
+
+_SUGGESTION_RULES = (
+    "- Suggest replacements or additions to better align with the JD\n"
+    "- Do not invent or assume experience\n"
+    "- Reframe existing experience using similar language\n"
+    "- List the 5 experiences and skills that are irrelevant to the position described in the resume\n"
+    "- For each suggestion, include:\n"
+    "   - 'Was': the original phrase\n"
+    "   - 'New': the improved phrase\n"
+    "   - 'Section': which resume section it came from\n"
+    "- Try to classify into:\n"
+    "   - Head (Candidate personal information)\n"
+    "   - Target Position\n"
+    "   - Professional Profile\n"
+    "   - Expertises\n"
+    "   - Accomplishments\n"
+    "   - Career Experience\n"
+    "   - Skills\n"
+    "   - Certifications\n"
+    "   - Education\n"
+    "   - Others (fallback if unknown)\n\n"
+)
+
+_REWRITE_RULES = (
+    "- ATS-compliant formatting\n"
+    "- Standard section headers, no tables or graphics\n"
+    "- Consistent date formats\n"
+    "- Use a clear, professional tone\n"
+    "- Do not introduce untrue information\n\n"
+)
+
+_OUTPUT_AS_ITEMS = (
+    "- ✅ Compatibility Score (original and optimized)\n"
+    "- ✅ Summary of matched and missing skills\n"
+    "- ✅ Change Log (Was → New) in JSON format with Section\n"
+    "- ✅ Resume improvement rationale\n"
+    "- ✅ Final optimized resume text\n\n"
+)
+
+_BREAKDOWN_ITEMS = (
+    "- List missing and underused keywords\n"
+    "- Suggest sentence rewrites per section\n"
+    "- Highlight formatting and structural ATS issues\n"
+    "- Provide summary and rationale\n"
+)
+
+_EVALUATION_STEPS = (
+    "3️⃣ Resume Evaluation:\n" + _EVALUATION_CRITERIA
+    + "4️⃣ Red Flag Detection:\n" + _RED_FLAG_CHECKS
+    + "5️⃣ Scoring:\n" + _SCORING_CRITERIA
+    + "6️⃣ Resume Improvement Suggestions:\n" + _SUGGESTION_RULES
+    + "7️⃣ Generate a New Optimized Resume:\n" + _REWRITE_RULES
+    + "8️⃣ Return the Output As:\n" + _OUTPUT_AS_ITEMS
+    + "9️⃣ Suggest Improvements Breakdown:\n" + _BREAKDOWN_ITEMS
+)
 
+_JSON_ONLY_RULE = "✅ Return ONLY a single valid JSON object using the exact key names above. Do not include any explanations or markdown. Use double quotes for all keys and string values."
+
+_OUTPUT_STRUCTURE_HEAD = (
+    "🔟 Return Final Output Structure:\n"
+    "- 'ResumeContent': parsed resume information\n"
+)
+
+_OUTPUT_STRUCTURE_TAIL = (
+    "- 'ResumeEvaluation': all ATS alignment factors\n"
+    "- 'RedFlagDetection': detected resume risks\n"
+    "- 'Scoring': detailed scoring breakdown\n"
+    "- 'ResumeImprovementSuggestions': full change log with Was/New/Section\n"
+    "- 'NewOptimizedResume': ATS rewritten resume text (string format)\n"
+    "- 'Output':\n"
+    "  - 'CompatibilityScoreOriginal': original resume score\n"
+    "  - 'CompatibilityScoreOptimized': after improvements\n"
+    "  - 'SummaryOfMatchedAndMissingSkills': list\n"
+    "  - 'ChangeLog': list of {'Was', 'New', 'Section'}\n"
+    "  - 'ResumeImprovementRationale': explanation\n"
+    "  - 'FinalOptimizedResumeText': final text-only resume\n"
+    "- 'ImprovementsBreakdown':\n"
+    "  - 'MissingAndUnderusedKeywords': list\n"
+    "  - 'SentenceRewritesPerSection': list\n"
+    "  - 'FormattingAndStructuralATSIssues': notes\n"
+    "  - 'SummaryAndRationale': overview justification\n\n"
+    + _JSON_ONLY_RULE
+)
+
+# Full prompt (v1.3.1): parses the JD itself and returns it under 'JobDescription'
+ANALYSIS_BASE_PROMPT = (
+    _ANALYSIS_INTRO
+    + "1️⃣ Parse Resume Content:\n" + _RESUME_PARSE_FIELDS
+    + "2️⃣ Parse Job Description (JD):\n" + _JD_PARSE_FIELDS
+    + _EVALUATION_STEPS
+    + _OUTPUT_STRUCTURE_HEAD
+    + "- 'JobDescription': parsed JD fields\n"
+    + _OUTPUT_STRUCTURE_TAIL
+)
+
+# Evaluation-only prompt: the JD arrives already parsed (see parse_job_description) and is not returned again
+EVALUATION_BASE_PROMPT = (
+    _ANALYSIS_INTRO
+    + "1️⃣ Parse Resume Content:\n" + _RESUME_PARSE_FIELDS
+    + "2️⃣ Job Description (JD):\n"
+    "- The JD has already been parsed; it is provided below as JSON. Use it as-is.\n"
+    "- Do NOT return it: leave 'JobDescription' out of the output.\n\n"
+    + _EVALUATION_STEPS
+    + _OUTPUT_STRUCTURE_HEAD
+    + _OUTPUT_STRUCTURE_TAIL
+)
+
+ANALYSIS_SYSTEM_PROMPT = "You are a professional ATS resume assistant."
+ANALYSIS_PARAMS = {"temperature": 0.2, "top_p": 1.0, "max_tokens": 4000}
+
+# === Stand-alone JD parse (v1.5) ===
+# The JobDescription block depends only on the JD, so it is requested once per JD and cached by the
+# JD's content hash; every resume scored against that JD then reuses it.
+JD_PARSE_PROMPT = (
+    "Parse the job description (JD) below and extract:\n"
+    + _JD_PARSE_FIELDS
+    + "No resume is provided here, so if there are multiple job locations, list all of them in 'JobLocation'.\n\n"
+    "Return ONLY a single valid JSON object with exactly these keys:\n"
+    "'CompanyName', 'JobTitle', 'Recruiter' (object with 'Name', 'Phone', 'Email'), 'JobLocation', "
+    "'RequiredSkillsAndKeywords' (list), 'Responsibilities' (list), 'PreferredQualificationsAndExperience' (list), "
+    "'SalaryRange', 'RelocationSupport', 'USCitizenOrPermanentResidentRequired', 'PERequired'.\n"
+    "Do not include any explanations or markdown. Use double quotes for all keys and string values."
+)
+JD_PARSE_PARAMS = {"temperature": 0.0, "top_p": 1.0, "max_tokens": 1200}
+
+# One lock per JD hash, so concurrent pairs sharing a JD wait for a single parse instead of racing.
+# jd_hash -> [lock, callers holding or waiting]; the entry is dropped when the last caller is done
+_jd_parse_locks = {}
+_jd_parse_locks_guard = threading.Lock()
+
+# === Cached completion that must be a JSON object (raises ValueError otherwise) ===
+def _cached_json_completion(api_key, messages, params, use_cache=True):
+    params = {**params, **json_mode_params()}
+    raw_output = _cached_chat_completion(api_key, messages, model=OPENAI_MODEL, use_cache=use_cache, **params)
+    try:
+        return parse_analysis_json(raw_output)
+    except ValueError:
+        if not use_cache:
+            raise
+    # A cached answer that does not parse is replaced by a fresh one
+    raw_output = _cached_chat_completion(api_key, messages, model=OPENAI_MODEL, use_cache=False, **params)
+    return parse_analysis_json(raw_output)
+
+def _build_jd_parse_messages(jd_text):
+    return [
+        {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+        {"role": "user", "content": f"{JD_PARSE_PROMPT}\n\nJob Description:\n{jd_text.strip()}\n"}
+    ]
+
+def parse_job_description(jd_text, api_key, use_cache=True):
+    # Raises on API errors and ValueError if the answer is not JSON
+    jd_hash = make_cache_key(jd=(jd_text or "").strip())
+    with _jd_parse_locks_guard:
+        entry = _jd_parse_locks.setdefault(jd_hash, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            return _cached_json_completion(api_key, _build_jd_parse_messages(jd_text or ""), JD_PARSE_PARAMS, use_cache)
+    finally:
+        with _jd_parse_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _jd_parse_locks[jd_hash]
+
+def _build_analysis_messages(resume_text, jd_text, prompt_instructions=None, parsed_jd=None):
+    base_prompt = ANALYSIS_BASE_PROMPT if parsed_jd is None else EVALUATION_BASE_PROMPT
     if prompt_instructions:
         base_prompt += f"\n\n{prompt_instructions}"
 
     full_prompt = (
         f"{base_prompt}\n\n"
-        f"Job Description:\n{jd_text}\n\n"
+        f"{_jd_block(jd_text, parsed_jd)}"
         f"Resume:\n{resume_text}\n"
     )
+    return [
+        {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+        {"role": "user", "content": full_prompt}
+    ]
+
+def _jd_block(jd_text, parsed_jd=None):
+    if parsed_jd is None:
+        return f"Job Description:\n{jd_text}\n\n"
+    return f"Parsed Job Description (JSON):\n{json.dumps(parsed_jd, ensure_ascii=False, sort_keys=True)}\n\n"
+
+# Put the cached JD parse back where the full prompt returns it, right after ResumeContent
+def merge_job_description(result, parsed_jd):
+    merged = {}
+    for key, value in result.items():
+        if key == "JobDescription":
+            continue
+        merged[key] = value
+        if key == "ResumeContent":
+            merged["JobDescription"] = parsed_jd
+    if "JobDescription" not in merged:
+        merged = {"JobDescription": parsed_jd, **merged}
+    return merged
+
+def _merge_job_description_raw(raw_output, parsed_jd):
+    try:
+        result = parse_analysis_json(raw_output)
+    except ValueError:
+        return raw_output  # leave it to the caller's parse / error handling
+    return json.dumps(merge_job_description(result, parsed_jd), ensure_ascii=False)
+
+# parsed_jd: the dict from parse_job_description; when given, the JD is not re-parsed and the
+# returned JSON still carries it under 'JobDescription'. Raises GPTRequestError if OpenAI cannot be reached.
+def get_resume_analysis(resume_text, jd_text, api_key, include_replacements=False, prompt_instructions=None, use_cache=True, parsed_jd=None): #default value declared (v1.3.1)
+    raw_output = _cached_chat_completion(
+        api_key,
+        messages=_build_analysis_messages(resume_text, jd_text, prompt_instructions, parsed_jd),
+        model=OPENAI_MODEL,
+        use_cache=use_cache,
+        **ANALYSIS_PARAMS,
+        **json_mode_params()
+    )
+    if parsed_jd is None:
+        return raw_output
+    return _merge_job_description_raw(raw_output, parsed_jd)
 
+# === JD parsed once (cached), then the per-resume evaluation; falls back to the full prompt if the parse is not JSON ===
+def get_resume_analysis_with_parsed_jd(resume_text, jd_text, api_key, include_replacements=False, prompt_instructions=None, use_cache=True):
     try:
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a professional ATS resume assistant."},
-                {"role": "user", "content": full_prompt}
-            ],
-            temperature=0.2,
-            top_p=1.0,
-            max_tokens=4000
+        parsed_jd = parse_job_description(jd_text, api_key, use_cache=use_cache)
+    except ValueError:
+        parsed_jd = None
+    return get_resume_analysis(
+        resume_text, jd_text, api_key,
+        include_replacements=include_replacements,
+        prompt_instructions=prompt_instructions,
+        use_cache=use_cache,
+        parsed_jd=parsed_jd
+    )
+
+# === Streaming ATS analysis (v1.5) ===
+# Iterating yields (key, value) for each top-level JSON member as soon as it is complete,
+# so the UI can show JobDescription / Scoring long before the full completion arrives.
+# After iteration, raw_output holds the full text and result the parsed members; a failed request
+# raises GPTRequestError. With parsed_jd, JobDescription is yielded first and merged into raw_output at the end.
+class AnalysisStream:
+    def __init__(self, resume_text, jd_text, api_key, prompt_instructions=None, use_cache=True, parsed_jd=None):
+        self.messages = _build_analysis_messages(resume_text, jd_text, prompt_instructions, parsed_jd)
+        self.api_key = api_key
+        self.use_cache = use_cache
+        self.parsed_jd = parsed_jd
+        self.raw_output = ""
+        self.result = {}
+
+    def __iter__(self):
+        parser = TopLevelJSONStreamParser()
+        if self.parsed_jd is not None:
+            self.result["JobDescription"] = self.parsed_jd
+            yield "JobDescription", self.parsed_jd
+        for chunk in _cached_chat_completion_stream(
+            self.api_key, self.messages, model=OPENAI_MODEL, use_cache=self.use_cache, **ANALYSIS_PARAMS, **json_mode_params()
+        ):
+            self.raw_output += chunk
+            for key, value in parser.feed(chunk):
+                if key == "JobDescription" and self.parsed_jd is not None:
+                    continue
+                self.result[key] = value
+                yield key, value
+        if self.parsed_jd is not None:
+            self.raw_output = _merge_job_description_raw(self.raw_output, self.parsed_jd)
+
+def stream_resume_analysis(resume_text, jd_text, api_key, prompt_instructions=None, use_cache=True, parsed_jd=None):
+    return AnalysisStream(resume_text, jd_text, api_key, prompt_instructions=prompt_instructions, use_cache=use_cache, parsed_jd=parsed_jd)
+
+# === Split ATS analysis: a small DAG of focused, separately cached sub-requests (v1.5) ===
+# parse_resume and parse_jd run first; score, suggestions and rewrite only need the parsed JD, so they
+# start as soon as it is ready and run side by side. Each node is its own cache entry, so a failed or
+# malformed node is re-requested alone on the next run while the others come straight from the cache.
+_SPLIT_INTRO = (
+    "Act as an Applicant Tracking System (ATS) used by a hiring company.\n"
+    "Compare the uploaded resume with the job description (JD) provided.\n\n"
+)
+
+_NODE_STEPS = {
+    "parse_resume": "Parse the resume below into:\n" + _RESUME_PARSE_FIELDS,
+    "score": (
+        _SPLIT_INTRO
+        + "1️⃣ Resume Evaluation:\n" + _EVALUATION_CRITERIA
+        + "2️⃣ Red Flag Detection:\n" + _RED_FLAG_CHECKS
+        + "3️⃣ Scoring:\n" + _SCORING_CRITERIA
+    ),
+    "suggestions": _SPLIT_INTRO + "1️⃣ Resume Improvement Suggestions:\n" + _SUGGESTION_RULES,
+    "rewrite": _SPLIT_INTRO + "1️⃣ Generate a New Optimized Resume:\n" + _REWRITE_RULES,
+}
+
+NODE_PARAMS = {
+    "parse_resume": {"temperature": 0.0, "top_p": 1.0, "max_tokens": 1500},
+    "score": {"temperature": 0.2, "top_p": 1.0, "max_tokens": 1500},
+    "suggestions": {"temperature": 0.2, "top_p": 1.0, "max_tokens": 2500},
+    "rewrite": {"temperature": 0.2, "top_p": 1.0, "max_tokens": 2500},
+}
+
+# === Lean response schema (v2) ===
+# Every field is generated exactly once. Compared with the single prompt (v1), these are gone:
+# Output.CompatibilityScoreOriginal (= scoring.atsCompatibilityScore), Output.ChangeLog (= ResumeImprovementSuggestions),
+# Output.FinalOptimizedResumeText (= NewOptimizedResume), ImprovementsBreakdown.SentenceRewritesPerSection
+# (= ResumeImprovementSuggestions) and ImprovementsBreakdown.SummaryAndRationale (= Output.ResumeImprovementRationale).
+RESPONSE_SCHEMA_VERSION = 2
+
+# === Field checks used to validate each answer ===
+def _is_object(value):
+    return isinstance(value, dict)
+
+def _is_list(value):
+    return isinstance(value, list)
+
+def _is_text(value):
+    return isinstance(value, str) and bool(value.strip())
+
+def _is_present(value):
+    return value not in (None, "", [], {})
+
+def _is_score(value):
+    if isinstance(value, bool):
+        return False
+    try:
+        return 0 <= float(str(value).strip().rstrip("%")) <= 100
+    except ValueError:
+        return False
+
+# "72%" / "72" -> 72, so every consumer sees a number
+def _to_score(value):
+    number = float(str(value).strip().rstrip("%"))
+    return int(number) if number.is_integer() else number
+
+def _normalize_scoring(value):
+    return {**value, "atsCompatibilityScore": _to_score(value["atsCompatibilityScore"])}
+
+def _is_scoring(value):
+    return isinstance(value, dict) and _is_score(value.get("atsCompatibilityScore"))
+
+def _is_change_log(value):
+    return isinstance(value, list) and all(isinstance(change, dict) and "Was" in change and "New" in change for change in value)
+
+def _is_skill_summary(value):
+    return isinstance(value, dict) and all(isinstance(value.get(key), list) for key in ("Matched", "Missing"))
+
+# JSON path -> (node that generates it, description used in the prompt, check the returned value must pass)
+SCHEMA_FIELDS = {
+    "ResumeContent": ("parse_resume", "parsed resume information", _is_object),
+    "JobDescription": ("parse_jd", "parsed JD fields", _is_object),
+    "ResumeEvaluation": ("score", "all ATS alignment factors", _is_present),
+    "RedFlagDetection": ("score", "detected resume risks", _is_present),
+    "scoring": ("score", "{'atsCompatibilityScore': overall score (number, 0–100), 'breakdown': score per criterion}", _is_scoring),
+    "ResumeImprovementSuggestions": ("suggestions", "full change log, list of {'Was', 'New', 'Section'}", _is_change_log),
+    "NewOptimizedResume": ("rewrite", "ATS rewritten resume text (string format)", _is_text),
+    "Output.CompatibilityScoreOptimized": ("rewrite", "ATS compatibility score (0–100) of the rewritten resume", _is_score),
+    "Output.SummaryOfMatchedAndMissingSkills": ("score", "{'Matched': list, 'Missing': list}", _is_skill_summary),
+    "Output.ResumeImprovementRationale": ("suggestions", "explanation", _is_text),
+    "ImprovementsBreakdown.MissingAndUnderusedKeywords": ("suggestions", "list", _is_list),
+    "ImprovementsBreakdown.FormattingAndStructuralATSIssues": ("suggestions", "notes", _is_present),
+}
+
+# Applied after a field passes its check
+_FIELD_NORMALIZERS = {
+    "scoring": _normalize_scoring,
+    "Output.CompatibilityScoreOptimized": _to_score,
+}
+
+# Profiles: only the fields a caller actually reads are requested (and only their nodes are run)
+ANALYSIS_PROFILES = {
+    "score": (
+        "JobDescription", "scoring", "Output.SummaryOfMatchedAndMissingSkills",
+    ),
+    "suggestions": (
+        "JobDescription", "scoring", "Output.SummaryOfMatchedAndMissingSkills",
+        "ResumeImprovementSuggestions", "ImprovementsBreakdown.MissingAndUnderusedKeywords",
+    ),
+    "full": tuple(SCHEMA_FIELDS),
+}
+DEFAULT_PROFILE = "suggestions"
+
+def _fields_prompt(fields):
+    lines, children = [], {}
+    for path in fields:
+        description = SCHEMA_FIELDS[path][1]
+        parent, _, child = path.partition(".")
+        if not child:
+            lines.append(f"- '{path}': {description}\n")
+            continue
+        if parent not in children:
+            children[parent] = []
+            lines.append(parent)
+        children[parent].append(f"  - '{child}': {description}\n")
+    text = "".join(f"- '{line}':\n" + "".join(children[line]) if line in children else line for line in lines)
+    return "Output keys:\n" + text + "\n" + _JSON_ONLY_RULE
+
+def _get_path(output, path):
+    parent, _, child = path.partition(".")
+    value = output.get(parent)
+    if child:
+        value = value.get(child) if isinstance(value, dict) else None
+    return value
+
+def _set_path(output, path, value):
+    parent, _, child = path.partition(".")
+    if child:
+        output.setdefault(parent, {})[child] = value
+    else:
+        output[parent] = value
+
+# Paths that are missing from output or fail their check
+def validate_fields(output, fields):
+    invalid = []
+    for path in fields:
+        value = _get_path(output, path)
+        if value is None or not SCHEMA_FIELDS[path][2](value):
+            invalid.append(path)
+    return invalid
+
+def _select_fields(output, fields):
+    # Keep only the requested fields that pass their check; anything the model volunteered is dropped
+    selected = {}
+    for path in fields:
+        if not validate_fields(output, [path]):
+            value = _get_path(output, path)
+            _set_path(selected, path, _FIELD_NORMALIZERS.get(path, lambda v: v)(value))
+    return selected
+
+# === Structured completion with targeted repair (v1.5) ===
+# The first request asks for every field. Fields that come back missing, invalid or cut off (a truncated
+# answer keeps every top-level member completed before the cut) are re-requested on their own and merged
+# in, so one bad section never throws away the rest of the answer.
+MAX_REPAIR_ROUNDS = 2
+
+def _complete_fields(api_key, build_messages, fields, params, use_cache=True):
+    params = {**params, **json_mode_params()}
+    result, missing, previous = {}, list(fields), None
+    for _round in range(1 + MAX_REPAIR_ROUNDS):
+        # The exact same request coming back incomplete twice means a bad answer is cached; ask for a fresh one
+        fresh = missing == previous
+        raw_output = _cached_chat_completion(
+            api_key, build_messages(missing), model=OPENAI_MODEL, use_cache=use_cache and not fresh, **params
         )
-        return response.choices[0].message.content
-    
-    except Exception as e:
-        return f"Error contacting OpenAI: {str(e)}"
+        result.update(_select_fields(salvage_json(raw_output), missing))
+        previous, missing = missing, validate_fields(result, fields)
+        if not missing:
+            break
+    return _select_fields(result, fields), missing
+
+def _build_node_messages(prompt, resume_text, jd_text=None, parsed_jd=None, prompt_instructions=None):
+    if prompt_instructions:
+        prompt += f"\n\n{prompt_instructions}"
+    jd_part = "" if jd_text is None and parsed_jd is None else _jd_block(jd_text, parsed_jd)
+    return [
+        {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+        {"role": "user", "content": f"{prompt}\n\n{jd_part}Resume:\n{resume_text}\n"}
+    ]
+
+def _node_parse_resume(dag, name, deps):
+    def build_messages(fields):
+        prompt = _NODE_STEPS[name] + _fields_prompt(fields)
+        return dag.record_messages(name, _build_node_messages(prompt, dag.resume_text))
+    return _complete_node(dag, name, build_messages)
+
+def _node_parse_jd(dag, name, deps):
+    dag.record_messages(name, _build_jd_parse_messages(dag.jd_text or ""))
+    return {"JobDescription": parse_job_description(dag.jd_text, dag.api_key, use_cache=dag.use_cache)}
+
+def _node_evaluate(dag, name, deps):
+    # If the JD parse failed, the node still runs against the raw JD text
+    parsed_jd = (deps.get("parse_jd") or {}).get("JobDescription")
+    delta = dag.delta if name in _DELTA_STEPS else None
+    def build_messages(fields):
+        if delta is None:
+            prompt = _NODE_STEPS[name] + _fields_prompt(fields)
+            messages = _build_node_messages(prompt, dag.resume_text, dag.jd_text, parsed_jd, dag.prompt_instructions)
+        else:
+            previous = _select_fields(dag.previous, fields)
+            previous.pop("ResumeImprovementSuggestions", None)
+            prompt = (
+                _DELTA_STEPS[name] + _fields_prompt(fields)
+                + f"\n\nPrevious analysis (JSON):\n{json.dumps(previous, ensure_ascii=False, sort_keys=True)}"
+            )
+            messages = _build_node_messages(prompt, _changed_sections_text(delta), dag.jd_text, parsed_jd, dag.prompt_instructions)
+        return dag.record_messages(name, messages)
+    output = _complete_node(dag, name, build_messages)
+    if delta is not None and "ResumeImprovementSuggestions" in output:
+        output["ResumeImprovementSuggestions"] = _merge_suggestions(
+            dag.previous.get("ResumeImprovementSuggestions") or [], output["ResumeImprovementSuggestions"], delta
+        )
+    return output
+
+def _complete_node(dag, name, build_messages):
+    output, missing = _complete_fields(dag.api_key, build_messages, dag.node_fields[name], NODE_PARAMS[name], dag.use_cache)
+    if not output:
+        raise ValueError(f"No usable JSON in the '{name}' answer")
+    if missing:
+        # Keep what did arrive; the rest is reported like a failed node
+        dag.errors[name] = f"incomplete answer, missing {', '.join(missing)}"
+    return output
+
+# name -> (dependencies, node function)
+ANALYSIS_DAG = {
+    "parse_resume": ((), _node_parse_resume),
+    "parse_jd": ((), _node_parse_jd),
+    "score": (("parse_jd",), _node_evaluate),
+    "suggestions": (("parse_jd",), _node_evaluate),
+    "rewrite": (("parse_jd",), _node_evaluate),
+}
+
+# === Incremental re-analysis (v1.6) ===
+# With incremental=True the DAG keeps its merged result per (resume lineage, JD, profile, instructions) in
+# analysis_history, together with the resume split into sections (resume_sections.py). The next run of an
+# edited version of the same resume diffs the sections against the stored ones:
+#   * nothing changed: every stored node output is reused and no request is sent
+#   * up to INCREMENTAL_MAX_CHANGE of the text changed: score and suggestions get only the edited paragraphs
+#     (before and after, by section) and their previous answer to update; stored suggestions whose 'Was'
+#     still reads the same in an untouched paragraph are kept
+#   * otherwise, or when nothing is stored, the full analysis runs
+# parse_resume and rewrite describe the whole document, so they always get the full resume.
+# use_cache=False skips the lookup but still stores the result, like the response cache.
+ANALYSIS_HISTORY_DIR = os.getenv(
+    "ATS_HISTORY_DIR",
+    os.path.join(os.path.expanduser("~"), ".ats_resume_optimizer", "analysis_history")
+)
+INCREMENTAL_MAX_CHANGE = float(os.getenv("ATS_INCREMENTAL_MAX_CHANGE", "0.5"))
+analysis_history = ResponseCache(cache_dir=ANALYSIS_HISTORY_DIR)
+
+_DELTA_INTRO = (
+    "The previous analysis of an earlier version of this resume against the same JD is given below. "
+    "The resume text further down holds only the paragraphs edited since, by section (before and after); "
+    "everything else is unchanged.\n\n"
+)
+
+_DELTA_STEPS = {
+    "score": (
+        _NODE_STEPS["score"] + _DELTA_INTRO
+        + "Update the previous evaluation, red flags, scoring and skill summary so they describe the edited resume as a whole.\n\n"
+    ),
+    "suggestions": (
+        _NODE_STEPS["suggestions"] + _DELTA_INTRO
+        + "Only suggest changes for the edited paragraphs; suggestions for the rest of the resume are kept. "
+        "Update the remaining keys so they describe the edited resume as a whole.\n\n"
+    ),
+}
+
+def _changed_sections_text(delta):
+    blocks = []
+    for name, (before, after) in delta.edits.items():
+        if not after:
+            blocks.append(f"[{name}] removed:\n" + "\n".join(before))
+        elif not before:
+            blocks.append(f"[{name}] added:\n" + "\n".join(after))
+        else:
+            blocks.append(f"[{name}] before:\n" + "\n".join(before) + f"\n\n[{name}] after:\n" + "\n".join(after))
+    return "\n\n".join(blocks)
+
+def _merge_suggestions(previous, new, delta):
+    seen = {normalize(change.get("Was")).casefold() for change in new}
+    kept = [
+        change for change in previous
+        if isinstance(change, dict) and delta.contains_unchanged(change.get("Was"))
+        and normalize(change.get("Was")).casefold() not in seen
+    ]
+    return kept + new
+
+# Node calls get their own pool: callers of the DAG may themselves be running on _executor (grown by set_gpt_workers)
+_node_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="gpt-node")
+
+def merge_node_outputs(outputs, fields):
+    merged = {}
+    for output in outputs:
+        for key, value in output.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key].update(value)
+            else:
+                merged[key] = value
+    # Schema order: top-level keys in the order their first field appears
+    ordered = {"SchemaVersion": RESPONSE_SCHEMA_VERSION}
+    for path in fields:
+        parent = path.partition(".")[0]
+        if parent in merged and parent not in ordered:
+            ordered[parent] = merged[parent]
+    return ordered
+
+# Iterating yields (key, value) as each node finishes (keys shared by several nodes, such as 'Output',
+# once merged at the end), like AnalysisStream. Afterwards result holds the merged analysis, raw_output
+# its JSON and errors the message of each failed node. If every node fails, the first node's error is raised.
+class AnalysisDAG:
+    def __init__(self, resume_text, jd_text, api_key, prompt_instructions=None, use_cache=True, profile=DEFAULT_PROFILE,
+                 incremental=False, lineage=None, history=None):
+        self.resume_text = resume_text
+        self.jd_text = jd_text
+        self.api_key = api_key
+        self.prompt_instructions = prompt_instructions
+        self.use_cache = use_cache
+        self.profile = profile
+        self.fields = ANALYSIS_PROFILES[profile]
+        self.node_fields = {}
+        for path in self.fields:
+            self.node_fields.setdefault(SCHEMA_FIELDS[path][0], []).append(path)
+        self.nodes = _with_dependencies(self.node_fields)
+        self.messages = {}
+        self.outputs = {}
+        self.errors = {}
+        self.result = {}
+        self.raw_output = ""
+        self._exceptions = {}
+        self._events = queue.Queue()
+        self._lock = threading.Lock()
+        self._finished = set()
+        self._started = False
+        self._context = None
+
+        # Incremental state: reused node outputs, or the section delta plus the stored result it applies to
+        self.history = history if history is not None else analysis_history
+        self.history_key = None
+        self.sections = None
+        self.previous = None
+        self.delta = None
+        self.reused = {}
+        self.incremental_summary = {"mode": "full"}
+        if incremental:
+            self._load_previous(lineage)
+
+    def _load_previous(self, lineage):
+        self.sections = split_sections(self.resume_text)
+        self.history_key = make_cache_key(
+            kind="analysis_history", prompt_version=PROMPT_VERSION, model=OPENAI_MODEL, profile=self.profile,
+            lineage=lineage or resume_lineage(self.resume_text), jd=normalize(self.jd_text),
+            prompt_instructions=self.prompt_instructions,
+        )
+        stored = self.history.get(self.history_key) if self.use_cache else None
+        if not stored:
+            return
+        delta = diff_sections(stored.get("sections"), self.sections)
+        previous = stored.get("result") or {}
+        if delta.is_empty:
+            for name, fields in self.node_fields.items():
+                if not validate_fields(previous, fields):
+                    self.reused[name] = _select_fields(previous, fields)
+            if all(name in self.reused for name in self.node_fields):
+                # Dependency-only nodes (e.g. parse_jd) are not needed either
+                self.reused.update({name: {} for name in self.nodes if name not in self.reused})
+            self.incremental_summary = {"mode": "reused", **delta.summary()}
+        elif delta.changed_share <= INCREMENTAL_MAX_CHANGE:
+            self.delta, self.previous = delta, previous
+            self.incremental_summary = {"mode": "delta", **delta.summary()}
+        else:
+            self.incremental_summary = {"mode": "full", **delta.summary()}
+
+    # Every request a node sends is kept (repairs under "<node> (repair n)") for measurement and debugging
+    def record_messages(self, name, messages):
+        with self._lock:
+            key, n = name, 0
+            while key in self.messages:
+                n += 1
+                key = f"{name} (repair {n})"
+            self.messages[key] = messages
+        return messages
+
+    def start(self):
+        if not self._started:
+            self._started = True
+            # Nodes run on pool threads; they record their calls into the run/span that started the DAG
+            self._context = perf.copy_context()
+            for name in self.nodes:
+                if not ANALYSIS_DAG[name][0]:
+                    self._submit(name)
+        return self
+
+    def _submit(self, name):
+        future = _node_executor.submit(perf.bind(self._run_node, self._context), name)
+        future.add_done_callback(lambda f, name=name: self._node_done(name, f))
+
+    def _run_node(self, name):
+        if name in self.reused:
+            return self.reused[name]
+        dependencies, run = ANALYSIS_DAG[name]
+        with perf.span(f"gpt.{name}"):
+            return run(self, name, {dep: self.outputs.get(dep) for dep in dependencies})
+
+    # A node that only runs as a dependency (e.g. parse_jd when JobDescription is not in the profile) shows nothing
+    def _visible_output(self, name):
+        return _select_fields(self.outputs.get(name, {}), self.node_fields.get(name, ()))
+
+    def _node_done(self, name, future):
+        # Dependents are submitted from here, so no pool thread ever blocks waiting on another node
+        try:
+            self.outputs[name] = future.result()
+        except Exception as e:
+            self.errors[name] = str(e)
+            self._exceptions.setdefault(name, e)
+        with self._lock:
+            self._finished.add(name)
+            ready = [
+                other for other in self.nodes
+                if other not in self._finished and name in ANALYSIS_DAG[other][0]
+                and all(dep in self._finished for dep in ANALYSIS_DAG[other][0])
+            ]
+        for other in ready:
+            try:
+                self._submit(other)
+            except RuntimeError as e:
+                # The pool is shutting down: fail the node (and, through it, its dependents) instead of waiting forever
+                failed = Future()
+                failed.set_exception(e)
+                self._node_done(other, failed)
+        self._events.put(name)
+
+    def __iter__(self):
+        self.start()
+        shared_parents = {path.partition(".")[0] for path in self.fields if "." in path}
+        for _ in range(len(self.nodes)):
+            name = self._events.get()
+            for key, value in self._visible_output(name).items():
+                if key not in shared_parents:
+                    yield key, value
+
+        self.result = merge_node_outputs((self._visible_output(name) for name in self.nodes), self.fields)
+        for key in shared_parents:
+            if key in self.result:
+                yield key, self.result[key]
+        if len(self.result) <= 1:
+            raise next(iter(self._exceptions.values()), GPTRequestError("The analysis returned no output"))
+        self.raw_output = json.dumps(self.result, ensure_ascii=False)
+        if self.history_key and not self.errors:
+            self.history.set(self.history_key, {"sections": self.sections, "result": self.result}, profile=self.profile)
+
+    def run(self):
+        for _ in self:
+            pass
+        return self.raw_output
+
+def _with_dependencies(nodes):
+    selected, stack = set(), list(nodes)
+    while stack:
+        name = stack.pop()
+        if name not in selected:
+            selected.add(name)
+            stack.extend(ANALYSIS_DAG[name][0])
+    return [name for name in ANALYSIS_DAG if name in selected]
+
+# incremental=True: see "Incremental re-analysis" above; lineage overrides the key derived from the resume's Head
+def split_resume_analysis(resume_text, jd_text, api_key, prompt_instructions=None, use_cache=True, profile=DEFAULT_PROFILE,
+                          incremental=False, lineage=None, history=None):
+    return AnalysisDAG(resume_text, jd_text, api_key, prompt_instructions=prompt_instructions, use_cache=use_cache, profile=profile,
+                       incremental=incremental, lineage=lineage, history=history)
+
+def get_resume_analysis_split(resume_text, jd_text, api_key, include_replacements=False, prompt_instructions=None, use_cache=True, profile=DEFAULT_PROFILE,
+                              incremental=False, lineage=None):
+    return split_resume_analysis(resume_text, jd_text, api_key, prompt_instructions=prompt_instructions, use_cache=use_cache, profile=profile,
+                                 incremental=incremental, lineage=lineage).run()
 
 # === Function to generate cover letter avoiding direct company mention ===
-def generate_cover_letter(resume_text, jd_text, api_key):
-    client = OpenAI(api_key=api_key)
+def generate_cover_letter(resume_text, jd_text, api_key, use_cache=True):
 
     prompt = (
         "Generate a professional Cover Letter based on the provided Resume and Job Description.\n"
@@ -164,16 +963,69 @@ def generate_cover_letter(resume_text, jd_text, api_key):
         f"Job Description:\n{jd_text}\n\nResume:\n{resume_text}"
     )
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4",
+    # Raises GPTRequestError if OpenAI cannot be reached
+    with perf.span("gpt.cover_letter"):
+        return _cached_chat_completion(
+            api_key,
             messages=[
                 {"role": "system", "content": "You are a professional career assistant generating compelling cover letters."},
                 {"role": "user", "content": prompt}
             ],
+            model=OPENAI_MODEL,
+            use_cache=use_cache,
             temperature=0.7,
             max_tokens=1000
         )
-        return response.choices[0].message.content
-    except Exception as e:
-        return f"Error generating cover letter: {str(e)}"
+
+# === Shared worker pool for concurrent GPT requests ===
+_executor_workers = 8
+_executor = ThreadPoolExecutor(max_workers=_executor_workers, thread_name_prefix="gpt")
+_node_workers = 16
+_pools_lock = threading.Lock()
+
+# Callers analysing more pairs at once than the default pools serve (batch --concurrency) grow them first, so the
+# cover letters and DAG nodes of the extra pairs do not queue behind the others. Pools only grow; work already
+# submitted finishes on the previous pool.
+def set_gpt_workers(pairs):
+    global _executor, _executor_workers, _node_executor, _node_workers
+    with _pools_lock:
+        if pairs > _executor_workers:
+            previous, _executor = _executor, ThreadPoolExecutor(max_workers=pairs, thread_name_prefix="gpt")
+            _executor_workers = pairs
+            previous.shutdown(wait=False)
+        node_workers = pairs * len(ANALYSIS_DAG)
+        if node_workers > _node_workers:
+            previous, _node_executor = _node_executor, ThreadPoolExecutor(max_workers=node_workers, thread_name_prefix="gpt-node")
+            _node_workers = node_workers
+            previous.shutdown(wait=False)
+
+def submit_cover_letter(resume_text, jd_text, api_key, use_cache=True):
+    return _executor.submit(perf.bind(generate_cover_letter), resume_text, jd_text, api_key, use_cache=use_cache)
+
+# === Run ATS analysis and cover letter concurrently ===
+# The two requests are independent, so wall-clock time is roughly the slower of the two calls. The analysis runs
+# in the calling thread and only the cover letter takes a pool slot, so each concurrent pair holds one slot.
+# strategy: "split" (DAG of sub-requests), "parsed_jd" (cached JD parse + one evaluation call) or "single" (one prompt)
+ANALYSIS_STRATEGIES = {
+    "split": get_resume_analysis_split,
+    "parsed_jd": get_resume_analysis_with_parsed_jd,
+    "single": get_resume_analysis,
+}
+
+# profile only applies to "split"; the other strategies always return the full v1 schema.
+def run_analysis_and_cover_letter(resume_text, jd_text, api_key, include_replacements=True, prompt_instructions=None, use_cache=True,
+                                  strategy="split", profile=DEFAULT_PROFILE):
+    profile_kwargs = {"profile": profile} if strategy == "split" else {}
+    cover_letter_future = submit_cover_letter(resume_text, jd_text, api_key, use_cache=use_cache)
+    try:
+        raw_output = ANALYSIS_STRATEGIES[strategy](
+            resume_text, jd_text, api_key,
+            include_replacements=include_replacements,
+            prompt_instructions=prompt_instructions,
+            use_cache=use_cache,
+            **profile_kwargs
+        )
+    except BaseException:
+        cover_letter_future.cancel()
+        raise
+    return raw_output, cover_letter_future.result()
@@ -0,0 +1,192 @@
+# gpt_scheduler.py – Rate-limit-aware admission and retries for OpenAI calls
+#
+# Every request is admitted through two token buckets sized to the account limits: one for tokens per
+# minute (cost = estimated prompt tokens + max_tokens) and one for requests per minute. After the call
+# the token bucket is credited with the difference between the estimate and the reported usage (or, when
+# the response carries none, an estimate from its text); a failed attempt gets its whole cost back.
+# Streamed calls are settled by the caller once the stream has been read (call(..., stream=True)).
+# Retryable failures (429, timeouts, connection errors, 5xx) are retried with jittered exponential
+# backoff, honouring Retry-After; a 429 also empties the token bucket so every worker backs off together.
+# Failures surface as typed GPTRequestError subclasses instead of error strings.
+
+import os
+import random
+import threading
+import time
+
+import openai
+
+# === Defaults (overridable through environment variables) ===
+OPENAI_TPM = int(os.getenv("ATS_OPENAI_TPM", "40000"))
+OPENAI_RPM = int(os.getenv("ATS_OPENAI_RPM", "500"))
+OPENAI_MAX_ATTEMPTS = int(os.getenv("ATS_OPENAI_MAX_ATTEMPTS", "6"))
+
+CHARS_PER_TOKEN = 4
+TOKENS_PER_MESSAGE = 4
+
+
+# === Typed errors ===
+# GPTRequestError: the request failed and was not (or no longer) retried
+class GPTRequestError(Exception):
+    def __init__(self, message, attempts=1):
+        super().__init__(message)
+        self.attempts = attempts
+
+
+# Still rate limited (429) after all retries
+class GPTRateLimitError(GPTRequestError):
+    pass
+
+
+# Timeouts, connection errors or 5xx responses persisted after all retries
+class GPTTransientError(GPTRequestError):
+    pass
+
+
+# === Token bucket ===
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount):
+        # A request larger than the whole bucket waits for a full bucket instead of forever
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.level >= amount:
+                    self.level -= amount
+                    return waited
+                wait = (amount - self.level) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def credit(self, amount):
+        with self._lock:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+    def drain(self):
+        with self._lock:
+            self._refill()
+            self.level = min(self.level, 0.0)
+
+
+def estimate_tokens(messages, max_tokens):
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+    return prompt_chars // CHARS_PER_TOKEN + TOKENS_PER_MESSAGE * len(messages) + (max_tokens or 0)
+
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _classify(error):
+    # Returns the typed error class to raise once retries are exhausted, or None if the error is not retryable
+    if isinstance(error, openai.RateLimitError):
+        # Exhausted quota is also a 429, but waiting will not fix it
+        return None if getattr(error, "code", None) == "insufficient_quota" else GPTRateLimitError
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)):
+        return GPTTransientError
+    if isinstance(error, openai.APIStatusError) and (error.status_code in (408, 409) or error.status_code >= 500):
+        return GPTTransientError
+    return None
+
+
+def _used_tokens(response, messages):
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        return usage.total_tokens
+    choices = getattr(response, "choices", None) or []
+    content = getattr(getattr(choices[0], "message", None), "content", None) if choices else None
+    return estimate_tokens(messages, 0) + len(content or "") // CHARS_PER_TOKEN
+
+
+# === Scheduler ===
+class RequestScheduler:
+    def __init__(self, tpm=OPENAI_TPM, rpm=OPENAI_RPM, max_attempts=OPENAI_MAX_ATTEMPTS,
+                 base_delay=1.0, max_delay=60.0):
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        self.tokens = TokenBucket(tpm)
+        self.requests = TokenBucket(rpm)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.admitted = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def set_limits(self, tpm=None, rpm=None):
+        if tpm:
+            self.tokens = TokenBucket(tpm)
+        if rpm:
+            self.requests = TokenBucket(rpm)
+
+    def admit(self, cost):
+        waited = self.requests.acquire(1) + self.tokens.acquire(cost)
+        with self._lock:
+            self.admitted += 1
+            self.throttled_seconds += waited
+
+    def settle(self, estimated, actual):
+        # Give back what the estimate over-reserved (max_tokens is rarely used in full)
+        if actual is not None and actual < estimated:
+            self.tokens.credit(estimated - actual)
+
+    def _backoff(self, attempt, error):
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay *= random.uniform(0.5, 1.0)
+        retry_after = _retry_after(error)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def call(self, request, messages, max_tokens, stream=False):
+        # request() performs one API call; retryable errors are retried up to max_attempts times in total
+        cost = estimate_tokens(messages, max_tokens)
+        for attempt in range(1, self.max_attempts + 1):
+            self.admit(cost)
+            try:
+                response = request()
+            except openai.OpenAIError as e:
+                # The failed attempt consumed nothing; a 429 still drains the bucket below
+                self.settle(cost, 0)
+                error_type = _classify(e)
+                if error_type is None:
+                    raise GPTRequestError(f"OpenAI request failed: {e}", attempts=attempt) from e
+                if attempt == self.max_attempts:
+                    raise error_type(f"OpenAI request failed after {attempt} attempts: {e}", attempts=attempt) from e
+                if error_type is GPTRateLimitError:
+                    self.tokens.drain()
+                with self._lock:
+                    self.retries += 1
+                time.sleep(self._backoff(attempt - 1, e))
+                continue
+            if not stream:
+                self.settle(cost, _used_tokens(response, messages))
+            return response
+
+    def stats(self):
+        with self._lock:
+            return {
+                "admitted": self.admitted,
+                "retries": self.retries,
+                "throttled_seconds": round(self.throttled_seconds, 2),
+                "tpm": int(self.tokens.capacity),
+                "rpm": int(self.requests.capacity),
+            }
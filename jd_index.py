@@ -0,0 +1,266 @@
+# jd_index.py – Persistent inverted index over a JD archive, ranked against a resume with BM25
+#
+# Storage is a single SQLite file:
+#   docs(doc_id, path, content_hash, title, length)   – one row per live JD; length feeds the BM25 length norm
+#   postings(term, doc_ids, tfs)                       – one packed posting list (int64/int32 blobs) per term
+#   meta(key, value)                                   – bookkeeping (number of stale postings)
+#
+# JDs are added incrementally: a batch of new JDs is merged into the posting lists with one
+# read/append/write per touched term. Removed or changed JDs leave stale doc_ids in the posting
+# lists that are ignored at query time and dropped by compact() once they pile up.
+# Terms come from prescreen.extract_terms, so the index and the local pre-screen agree on keywords.
+#
+# Usage:
+#   python jd_index.py add --index jd_index.sqlite "jds/*.docx" archive/
+#   python jd_index.py add --index jd_index.sqlite --bundles agency_export.pdf   # one entry per posting
+#   python jd_index.py search --index jd_index.sqlite resume.docx --top 20
+
+import argparse
+import array
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+from prescreen import extract_terms
+
+_SQL_CHUNK = 500
+_COMPACT_RATIO = 0.25
+_BUNDLE_BATCH = 200  # postings of a JD bundle indexed per transaction
+
+
+class JDIndex:
+    def __init__(self, db_path, k1=1.2, b=0.75):
+        self.db_path = db_path
+        self.k1 = k1
+        self.b = b
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT UNIQUE NOT NULL,
+                content_hash TEXT NOT NULL,
+                title TEXT,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT PRIMARY KEY,
+                doc_ids BLOB NOT NULL,
+                tfs BLOB NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def _stale_docs(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'stale_docs'").fetchone()
+        return row[0] if row else 0
+
+    def _mark_stale(self, count):
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('stale_docs', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value", (count,)
+        )
+
+    # === Indexing ===
+    # Returns the new doc_id and its term counts, or None if the same content is already indexed
+    def _register_doc(self, path, text):
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        row = self.conn.execute("SELECT doc_id, content_hash FROM docs WHERE path = ?", (path,)).fetchone()
+        if row and row[1] == content_hash:
+            return None
+        if row:
+            self.conn.execute("DELETE FROM docs WHERE doc_id = ?", (row[0],))
+            self._mark_stale(1)
+
+        counts = extract_terms(text)
+        title = next((line.strip() for line in text.splitlines() if line.strip()), os.path.basename(path))[:200]
+        cur = self.conn.execute(
+            "INSERT INTO docs (path, content_hash, title, length) VALUES (?, ?, ?, ?)",
+            (path, content_hash, title, sum(counts.values()))
+        )
+        return cur.lastrowid, counts
+
+    def _merge_postings(self, new_postings):
+        # Sorted terms keep the B-tree reads/writes sequential
+        terms = sorted(new_postings)
+        for start in range(0, len(terms), _SQL_CHUNK):
+            chunk = terms[start:start + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            existing = {
+                term: (ids, tfs) for term, ids, tfs in self.conn.execute(
+                    f"SELECT term, doc_ids, tfs FROM postings WHERE term IN ({placeholders})", chunk
+                )
+            }
+            rows = []
+            for term in chunk:
+                ids = array.array("q", [doc_id for doc_id, _tf in new_postings[term]]).tobytes()
+                tfs = array.array("i", [tf for _doc_id, tf in new_postings[term]]).tobytes()
+                if term in existing:
+                    ids = existing[term][0] + ids
+                    tfs = existing[term][1] + tfs
+                rows.append((term, ids, tfs))
+            self.conn.executemany("INSERT OR REPLACE INTO postings (term, doc_ids, tfs) VALUES (?, ?, ?)", rows)
+
+    # Adds or updates many JDs in one transaction; returns how many were new or changed
+    def add_many(self, paths, extract=None):
+        if extract is None:
+            from resume_core import extract_text as extract
+        new_postings = defaultdict(list)
+        added = 0
+        with self.conn:
+            for path in paths:
+                registered = self._register_doc(os.path.abspath(path), extract(path))
+                if registered is None:
+                    continue
+                doc_id, counts = registered
+                for term, tf in counts.items():
+                    new_postings[term].append((doc_id, tf))
+                added += 1
+            self._merge_postings(new_postings)
+        self._maybe_compact()
+        return added
+
+    def add(self, path, text=None):
+        if text is None:
+            return self.add_many([path]) == 1
+        return self.add_many([path], extract=lambda _path: text) == 1
+
+    def remove(self, path):
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM docs WHERE path = ?", (os.path.abspath(path),))
+            if cur.rowcount:
+                self._mark_stale(cur.rowcount)
+        self._maybe_compact()
+        return bool(cur.rowcount)
+
+    def _maybe_compact(self):
+        live = len(self)
+        if self._stale_docs() > max(10, live * _COMPACT_RATIO):
+            self.compact()
+
+    # Rewrites every posting list without the doc_ids of removed or replaced JDs
+    def compact(self):
+        live_ids = np.array([row[0] for row in self.conn.execute("SELECT doc_id FROM docs ORDER BY doc_id")], dtype=np.int64)
+        n_live = len(live_ids)
+        with self.conn:
+            rows = []
+            for term, ids_blob, tfs_blob in self.conn.execute("SELECT term, doc_ids, tfs FROM postings"):
+                ids = np.frombuffer(ids_blob, dtype=np.int64)
+                positions = np.searchsorted(live_ids, ids).clip(max=max(n_live - 1, 0))
+                keep = live_ids[positions] == ids if n_live else np.zeros(len(ids), dtype=bool)
+                if keep.all():
+                    continue
+                rows.append((term, ids[keep].tobytes(), np.frombuffer(tfs_blob, dtype=np.int32)[keep].tobytes()))
+            self.conn.executemany("UPDATE postings SET doc_ids = ?, tfs = ? WHERE term = ?",
+                                  ((ids, tfs, term) for term, ids, tfs in rows))
+            self.conn.execute("DELETE FROM postings WHERE length(doc_ids) = 0")
+            self.conn.execute("DELETE FROM meta WHERE key = 'stale_docs'")
+
+    # === Ranking ===
+    def search(self, resume_text, top_k=20):
+        docs = self.conn.execute("SELECT doc_id, path, title, length FROM docs ORDER BY doc_id").fetchall()
+        if not docs:
+            return []
+        doc_ids = np.array([d[0] for d in docs], dtype=np.int64)
+        lengths = np.array([d[3] for d in docs], dtype=np.float32)
+        n_docs = len(docs)
+        avg_length = float(lengths.mean()) or 1.0
+        length_norm = self.k1 * (1 - self.b + self.b * lengths / avg_length)
+
+        query = extract_terms(resume_text)
+        terms = list(query)
+        all_positions, all_contrib = [], []
+        for start in range(0, len(terms), _SQL_CHUNK):
+            chunk = terms[start:start + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for term, ids_blob, tfs_blob in self.conn.execute(
+                f"SELECT term, doc_ids, tfs FROM postings WHERE term IN ({placeholders})", chunk
+            ):
+                ids = np.frombuffer(ids_blob, dtype=np.int64)
+                positions = np.searchsorted(doc_ids, ids).clip(max=n_docs - 1)
+                live = doc_ids[positions] == ids
+                positions = positions[live]
+                df = len(positions)
+                if not df:
+                    continue
+                tf = np.frombuffer(tfs_blob, dtype=np.int32)[live].astype(np.float32)
+                idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+                query_weight = idf * (1 + np.log(query[term]))
+                all_positions.append(positions)
+                all_contrib.append(query_weight * tf * (self.k1 + 1) / (tf + length_norm[positions]))
+        if not all_positions:
+            return []
+
+        scores = np.bincount(np.concatenate(all_positions), weights=np.concatenate(all_contrib), minlength=n_docs)
+        k = min(top_k, n_docs)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [
+            {"path": docs[i][1], "title": docs[i][2], "score": round(float(scores[i]), 4)}
+            for i in best if scores[i] > 0
+        ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query an inverted index of job descriptions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add_cmd = sub.add_parser("add", help="Add or update JDs in the index")
+    add_cmd.add_argument("--index", required=True, help="SQLite index file (created if missing)")
+    add_cmd.add_argument("paths", nargs="*", help="JD files, directories or glob patterns")
+    add_cmd.add_argument("--bundles", nargs="+", default=[], help="PDF exports with many postings (split by pdf_reader.py)")
+
+    search_cmd = sub.add_parser("search", help="Rank indexed JDs for a resume")
+    search_cmd.add_argument("--index", required=True)
+    search_cmd.add_argument("resume", help="Resume file (DOCX or PDF)")
+    search_cmd.add_argument("--top", type=int, default=20)
+
+    args = parser.parse_args(argv)
+    from batch_runner import expand_inputs
+    from pdf_reader import bundle_jd_path, split_bundle
+    from resume_core import extract_text
+
+    with JDIndex(args.index) as index:
+        if args.command == "add":
+            paths = expand_inputs(args.paths)
+            added = index.add_many(paths)
+            for bundle_path in expand_inputs(args.bundles):
+                # Postings are indexed in groups, so a huge bundle never sits in memory as a whole
+                postings = {}
+                for jd in split_bundle(bundle_path):
+                    postings[bundle_jd_path(bundle_path, jd["index"])] = jd["text"]
+                    if len(postings) >= _BUNDLE_BATCH:
+                        added += index.add_many(postings, extract=postings.get)
+                        paths.extend(postings)
+                        postings = {}
+                added += index.add_many(postings, extract=postings.get)
+                paths.extend(postings)
+            print(f"Indexed {added} new or changed JDs ({len(paths) - added} unchanged); {len(index)} total.")
+        else:
+            print(json.dumps(index.search(extract_text(args.resume), top_k=args.top), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+# jobs.py – In-process background job queue with job IDs and per-stage progress
+#
+# The Streamlit script thread only submits work and polls it:
+#
+#     job_id = job_queue.submit(run_analysis_job, resume_bytes, jd_bytes, ..., stages=ANALYSIS_STAGES)
+#     snapshot = job_queue.snapshot(job_id)     # on every rerun: status, stages, partial sections, result
+#
+# A job function receives its Job as the first argument and reports through it:
+#
+#     with job.stage("extract"):                # marks the stage running / done / failed
+#         ...
+#     job.publish("scoring", {...})             # partial output the UI can show while the job runs
+#
+# Jobs live in the process, outside any script run, so a widget change or a closed tab does not abandon
+# them. Workers are threads: the heavy stages wait on OpenAI, and threads share the response cache,
+# the scheduler and the compiled templates. Finished jobs are dropped after $ATS_JOB_TTL seconds.
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import perf
+
+JOB_WORKERS = int(os.getenv("ATS_JOB_WORKERS", "4"))
+JOB_TTL_SECONDS = float(os.getenv("ATS_JOB_TTL", "3600"))
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED, SKIPPED = "queued", "running", "done", "failed", "cancelled", "skipped"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, name, stages=()):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.status = QUEUED
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.stages = {stage: {"status": QUEUED, "seconds": None} for stage in stages}
+        self.sections = {}
+        self.notes = {}
+        self.result = None
+        self.error = None
+        self.error_type = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    # === Called from the job function ===
+    @contextmanager
+    def stage(self, name):
+        if self._cancel.is_set():
+            raise JobCancelled(f"Job {self.id} was cancelled")
+        start = time.perf_counter()
+        with self._lock:
+            self.stages.setdefault(name, {"status": QUEUED, "seconds": None})["status"] = RUNNING
+        status = FAILED
+        try:
+            with perf.span(name):
+                yield
+            status = DONE
+        finally:
+            with self._lock:
+                self.stages[name] = {"status": status, "seconds": round(time.perf_counter() - start, 3)}
+
+    def skip_remaining(self):
+        # Stages that will not run (e.g. the pre-screen stopped the job) are shown as skipped
+        with self._lock:
+            for stage in self.stages.values():
+                if stage["status"] == QUEUED:
+                    stage["status"] = SKIPPED
+
+    def publish(self, key, value):
+        with self._lock:
+            self.sections[key] = value
+
+    # Small facts for the UI that are not output sections (e.g. the local score, raw output on failure)
+    def note(self, key, value):
+        with self._lock:
+            self.notes[key] = value
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    # === Read from any thread ===
+    def snapshot(self):
+        with self._lock:
+            done = sum(1 for stage in self.stages.values() if stage["status"] in (DONE, SKIPPED))
+            return {
+                "id": self.id,
+                "name": self.name,
+                "status": self.status,
+                "stages": {name: dict(stage) for name, stage in self.stages.items()},
+                "progress": done / len(self.stages) if self.stages else (1.0 if self.status in FINISHED_STATES else 0.0),
+                "sections": dict(self.sections),
+                "notes": dict(self.notes),
+                "result": self.result,
+                "error": self.error,
+                "error_type": self.error_type,
+                "queued_seconds": round((self.started or time.time()) - self.created, 3),
+                "elapsed_seconds": round((self.finished or time.time()) - self.started, 3) if self.started else 0.0,
+            }
+
+
+class JobQueue:
+    def __init__(self, workers=JOB_WORKERS, ttl_seconds=JOB_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, stages=(), name=None, **kwargs):
+        job = Job(name or getattr(fn, "__name__", "job"), stages)
+        with self._lock:
+            self._evict_finished()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job, fn, args, kwargs):
+        with job._lock:
+            if job.cancelled:
+                job.status, job.finished = CANCELLED, time.time()
+                return
+            job.status, job.started = RUNNING, time.time()
+        perf_run = perf.start_run(job.name)
+        result, error, error_type = None, None, None
+        try:
+            result = fn(job, *args, **kwargs)
+            status = DONE
+        except JobCancelled:
+            status = CANCELLED
+        except Exception as e:
+            status, error, error_type = FAILED, str(e), type(e).__name__
+        job.skip_remaining()
+        summary = perf.finish_run(perf_run)
+        if isinstance(result, dict):
+            result.setdefault("perf_summary", summary)
+        # Status last, so a poller that sees "done" also sees the result
+        with job._lock:
+            job.result, job.error, job.error_type, job.finished = result, error, error_type, time.time()
+            job.status = status
+
+    def _evict_finished(self):
+        cutoff = time.time() - self.ttl_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def snapshot(self, job_id):
+        job = self.get(job_id)
+        return job.snapshot() if job is not None else None
+
+    def cancel(self, job_id):
+        # Queued jobs never start; running jobs stop at their next stage boundary
+        job = self.get(job_id)
+        if job is None:
+            return False
+        with job._lock:
+            if job.status in FINISHED_STATES:
+                return False
+            job._cancel.set()
+        return True
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {state: 0 for state in (QUEUED, RUNNING) + FINISHED_STATES}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+
+# === Shared queue for the app (one per server process, survives script reruns) ===
+job_queue = JobQueue()
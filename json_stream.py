@@ -0,0 +1,97 @@
+# json_stream.py – Incremental parser for a streamed top-level JSON object
+#
+# Feed it text chunks as they arrive from the model; every time a top-level member
+# ("JobDescription": {...}, "Scoring": {...}, ...) is complete it is returned as (key, value).
+# Leading noise such as ```json fences is skipped until the first "{".
+
+import json
+
+
+class TopLevelJSONStreamParser:
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.started = False
+        self.done = False
+        self.state = "expect_key"
+        self.key_start = None
+        self.current_key = None
+        self.value_start = None
+        self.result = {}
+
+    def feed(self, chunk):
+        completed = []
+        if self.done or not chunk:
+            return completed
+        self.buffer += chunk
+
+        while self.pos < len(self.buffer) and not self.done:
+            i = self.pos
+            ch = self.buffer[i]
+            self.pos += 1
+
+            if not self.started:
+                if ch == "{":
+                    self.started = True
+                    self.depth = 1
+                continue
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth == 1 and self.state == "in_key":
+                        self.current_key = json.loads(self.buffer[self.key_start:i + 1])
+                        self.state = "expect_colon"
+                continue
+
+            if ch == '"':
+                self.in_string = True
+                if self.depth == 1 and self.state == "expect_key":
+                    self.key_start = i
+                    self.state = "in_key"
+                elif self.depth == 1 and self.state == "expect_value":
+                    self.value_start = i
+                    self.state = "in_value"
+            elif ch == ":" and self.depth == 1 and self.state == "expect_colon":
+                self.state = "expect_value"
+            elif ch in "{[":
+                if self.depth == 1 and self.state == "expect_value":
+                    self.value_start = i
+                    self.state = "in_value"
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    self._finish_value(i, completed)
+                    self.done = True
+            elif ch == "," and self.depth == 1:
+                self._finish_value(i, completed)
+                self.state = "expect_key"
+            elif not ch.isspace() and self.depth == 1 and self.state == "expect_value":
+                # Bare number / true / false / null
+                self.value_start = i
+                self.state = "in_value"
+
+        return completed
+
+    def _finish_value(self, end, completed):
+        if self.state != "in_value" or self.current_key is None:
+            return
+        key = self.current_key
+        raw_value = self.buffer[self.value_start:end].strip()
+        self.current_key = None
+        self.value_start = None
+        try:
+            value = json.loads(raw_value)
+        except ValueError:
+            # Leave malformed members to the caller's full-document parse
+            return
+        self.result[key] = value
+        completed.append((key, value))
@@ -0,0 +1,146 @@
+# measure_profiles.py – Tokens and latency per response profile vs. the single full prompt
+#
+# Usage:
+#   python measure_profiles.py --resume resume.docx --jd jd.docx --repeat 3 --out profile_measurements.json
+#
+# Every run bypasses the response cache, so each number is a real GPT round trip. Latency is the
+# wall-clock time of the whole analysis (the split profiles run their sub-requests in parallel).
+# Tokens are the prompt/completion usage the API reported for every request the analysis sent (perf
+# records each call, including the repair requests for missing fields), so the single prompt and the
+# profiles are counted the same way. A request without usage falls back to counting its messages (tiktoken
+# when installed, otherwise ~4 characters/token) and the raw completion's length; "token_source" says which.
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from gpt_helper_work_version import (
+    ANALYSIS_PROFILES, _build_analysis_messages, get_resume_analysis, split_resume_analysis
+)
+from resume_core import extract_text, load_env
+import perf
+
+try:
+    import tiktoken
+    _encoding = tiktoken.encoding_for_model("gpt-4")
+    TOKEN_COUNTER = "tiktoken"
+except ImportError:
+    _encoding = None
+    TOKEN_COUNTER = "estimate (4 chars/token)"
+
+
+def count_tokens(text):
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return max(1, len(text) // 4) if text else 0
+
+
+def _messages_tokens(messages):
+    return sum(count_tokens(message["content"]) for message in messages)
+
+
+# Every request sent during one measurement, with the usage the API reported for it
+def _usage(run, requests):
+    calls = [call for call in run.calls if not call["cached"]]
+    reported = all(call["prompt_tokens"] is not None and call["completion_tokens"] is not None for call in calls)
+    if reported:
+        input_tokens = sum(call["prompt_tokens"] for call in calls)
+        output_tokens = sum(call["completion_tokens"] for call in calls)
+    else:
+        input_tokens = sum(_messages_tokens(messages) for messages in requests)
+        output_tokens = sum(
+            call["completion_tokens"] if call["completion_tokens"] is not None else max(1, call.get("completion_chars", 0) // 4)
+            for call in calls
+        )
+    return {
+        "calls": len(calls),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "token_source": "usage" if reported else TOKEN_COUNTER,
+    }
+
+
+def measure_single(resume_text, jd_text, api_key):
+    messages = _build_analysis_messages(resume_text, jd_text)
+    run = perf.start_run("measure.single")
+    start = time.perf_counter()
+    try:
+        get_resume_analysis(resume_text, jd_text, api_key, use_cache=False)
+        elapsed = time.perf_counter() - start
+    finally:
+        perf.finish_run(run)
+    return {"latency_seconds": elapsed, **_usage(run, [messages])}
+
+
+def measure_profile(resume_text, jd_text, api_key, profile):
+    run = perf.start_run(f"measure.{profile}")
+    try:
+        analysis = split_resume_analysis(resume_text, jd_text, api_key, use_cache=False, profile=profile)
+        start = time.perf_counter()
+        analysis.run()
+        elapsed = time.perf_counter() - start
+    finally:
+        perf.finish_run(run)
+    return {"latency_seconds": elapsed, **_usage(run, analysis.messages.values()), "failed_nodes": analysis.errors}
+
+
+def _summarize(runs):
+    keys = ("latency_seconds", "calls", "input_tokens", "output_tokens")
+    summary = {key: round(statistics.median(run[key] for run in runs), 2) for key in keys}
+    summary["runs"] = len(runs)
+    summary["token_source"] = ", ".join(sorted({run["token_source"] for run in runs}))
+    return summary
+
+
+def measure(resume_text, jd_text, api_key, profiles, repeat=1, log=print):
+    results = {}
+    for name in ["single"] + list(profiles):
+        runs = []
+        for i in range(repeat):
+            if name == "single":
+                runs.append(measure_single(resume_text, jd_text, api_key))
+            else:
+                runs.append(measure_profile(resume_text, jd_text, api_key, name))
+            log(f"{name} run {i + 1}/{repeat}: {runs[-1]['latency_seconds']:.1f}s, {runs[-1]['output_tokens']} output tokens")
+        results[name] = _summarize(runs)
+
+    baseline = results["single"]
+    for name in profiles:
+        result = results[name]
+        result["output_tokens_saved"] = round(baseline["output_tokens"] - result["output_tokens"], 2)
+        result["latency_saved_seconds"] = round(baseline["latency_seconds"] - result["latency_seconds"], 2)
+        result["latency_saved_percent"] = (
+            round(100 * result["latency_saved_seconds"] / baseline["latency_seconds"], 1) if baseline["latency_seconds"] else 0.0
+        )
+    return {"token_counter": TOKEN_COUNTER, "profiles": results}
+
+
+def main(argv=None):
+    load_env()  # $OPENAI_API_KEY may come from a .env file
+    parser = argparse.ArgumentParser(description="Measure tokens and latency per analysis profile.")
+    parser.add_argument("--resume", required=True, help="Resume file (.docx or .pdf)")
+    parser.add_argument("--jd", required=True, help="Job description file (.docx or .pdf)")
+    parser.add_argument("--profiles", nargs="+", choices=sorted(ANALYSIS_PROFILES), default=list(ANALYSIS_PROFILES),
+                        help="Profiles to compare against the single full prompt")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per profile (the median is reported)")
+    parser.add_argument("--out", help="Also write the results to this JSON file")
+    parser.add_argument("--api-key", default=os.getenv("OPENAI_API_KEY"), help="OpenAI API key (default: $OPENAI_API_KEY)")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("An OpenAI API key is required (--api-key or OPENAI_API_KEY).")
+
+    results = measure(extract_text(args.resume), extract_text(args.jd), args.api_key, args.profiles, repeat=max(1, args.repeat))
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
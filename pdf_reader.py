@@ -0,0 +1,240 @@
+# pdf_reader.py – Streaming PDF text: pages yielded lazily, page ranges extracted in a process pool,
+# and multi-posting PDF bundles split into individual JDs
+#
+#     for text in iter_pages("jd.pdf"):                      # one page at a time, in one process
+#     for text in iter_pages_parallel("bundle.pdf"):         # same order, ranges extracted on every core
+#     for jd in split_bundle("bundle.pdf"):                  # {"index", "first_page", "last_page", "title", "text", "forced"}
+#
+# Memory: iter_pages holds one page. iter_pages_parallel keeps at most max_buffer_mb of page text in
+# flight or waiting to be consumed (ranges are only submitted while the estimate fits; the estimate
+# follows the ranges already returned), so a slow consumer throttles the pool instead of piling up text.
+# split_bundle holds one posting, and cuts a posting that grows past max_chars ("forced": True).
+#
+# Workers are spawned, not forked: the app and the batch runner have live threads (job queue, GPT pool)
+# that a forked child would inherit in an unknown state. Sources that are bytes or file-like objects
+# are spilled to a temporary file so every worker opens the document by path.
+#
+# Bundle boundaries (BundleSplitter): a page whose first lines match a start pattern ("Job Title:",
+# "Job ID:", "Requisition ID:", ...) opens a new posting, a page whose last lines match an end pattern
+# ("End of posting") closes one; pages_per_jd instead cuts every N pages, and max_pages caps a posting.
+#
+# Usage:
+#   python pdf_reader.py bundle.pdf --out jds/ --workers 8
+#   python pdf_reader.py bundle.pdf --pages-per-jd 3
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+from collections import deque
+from contextlib import contextmanager
+
+PDF_WORKERS = int(os.getenv("ATS_PDF_WORKERS", str(os.cpu_count() or 1)))
+PAGES_PER_TASK = int(os.getenv("ATS_PDF_PAGES_PER_TASK", "16"))
+PDF_MAX_BUFFER_MB = float(os.getenv("ATS_PDF_MAX_BUFFER_MB", "64"))
+BUNDLE_MAX_JD_CHARS = int(os.getenv("ATS_BUNDLE_MAX_JD_CHARS", "200000"))
+
+# Until the first range comes back, a page is assumed to hold this much text
+_ASSUMED_PAGE_BYTES = 8 * 1024
+
+
+# === Opening a source (path, bytes or binary file-like object) ===
+def _open(source):
+    import fitz  # PyMuPDF
+
+    if isinstance(source, str):
+        return fitz.open(source)
+    data = source if isinstance(source, (bytes, bytearray, memoryview)) else source.read()
+    return fitz.open(stream=bytes(data), filetype="pdf")
+
+
+@contextmanager
+def _as_path(source):
+    if isinstance(source, str):
+        yield source
+        return
+    data = source if isinstance(source, (bytes, bytearray, memoryview)) else source.read()
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        yield path
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def page_count(source):
+    doc = _open(source)
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+# === Sequential: one page in memory at a time ===
+def iter_pages(source, start=0, stop=None):
+    doc = _open(source)
+    try:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for number in range(start, stop):
+            yield doc.load_page(number).get_text()
+    finally:
+        doc.close()
+
+
+def _extract_range(path, start, stop):
+    # Runs in a worker process
+    return list(iter_pages(path, start, stop))
+
+
+# === Parallel: page ranges in a process pool, yielded in page order ===
+def iter_pages_parallel(source, workers=PDF_WORKERS, pages_per_task=PAGES_PER_TASK, max_buffer_mb=PDF_MAX_BUFFER_MB):
+    with _as_path(source) as path:
+        total = page_count(path)
+        pages_per_task = max(1, pages_per_task)
+        if workers <= 1 or total <= pages_per_task:
+            yield from iter_pages(path)
+            return
+
+        # Imported here: resume_core.extract_text only needs iter_pages
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        ranges = deque((start, min(start + pages_per_task, total)) for start in range(0, total, pages_per_task))
+        ceiling = max_buffer_mb * 1024 * 1024
+        task_bytes = _ASSUMED_PAGE_BYTES * pages_per_task
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        pending = deque()
+        try:
+            while ranges or pending:
+                # At least one range is always in flight; more only while the text estimate fits the ceiling
+                while ranges and (not pending or (len(pending) < 2 * workers and (len(pending) + 1) * task_bytes <= ceiling)):
+                    pending.append(pool.submit(_extract_range, path, *ranges.popleft()))
+                texts = pending.popleft().result()
+                # Text is mostly ASCII, so characters stand in for bytes
+                task_bytes = max(1, (task_bytes + sum(len(text) for text in texts)) // 2)
+                yield from texts
+        finally:
+            # A consumer that stops early (or fails) does not wait for ranges nobody will read
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+# === JD bundles: one PDF, many postings ===
+DEFAULT_START_PATTERNS = (
+    r"^(job|position|role)\s*title\s*[:\-–]",
+    r"^(job|posting|position|vacancy)\s*(id|number|no\.?|#)\s*[:\-–#]",
+    r"^req(uisition)?\.?\s*(id|number|no\.?|#)\s*[:\-–#]",
+    r"^job\s+posting\s*[:\-–]",
+)
+DEFAULT_END_PATTERNS = (
+    r"^[-=_*\s]*end\s+of\s+(job\s+)?(posting|description|listing)\b",
+)
+
+
+class BundleSplitter:
+    def __init__(self, start_patterns=DEFAULT_START_PATTERNS, end_patterns=DEFAULT_END_PATTERNS, head_lines=6,
+                 pages_per_jd=None, max_pages=20, max_chars=BUNDLE_MAX_JD_CHARS):
+        self.start_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in start_patterns]
+        self.end_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in end_patterns]
+        self.head_lines = head_lines
+        self.pages_per_jd = pages_per_jd
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+
+    def _lines(self, text):
+        return [line.strip() for line in text.splitlines() if line.strip()]
+
+    def starts_posting(self, text):
+        head = self._lines(text)[:self.head_lines]
+        return any(pattern.search(line) for pattern in self.start_patterns for line in head)
+
+    def ends_posting(self, text):
+        tail = self._lines(text)[-self.head_lines:]
+        return any(pattern.search(line) for pattern in self.end_patterns for line in tail)
+
+    def split(self, pages):
+        # pages: iterable of page texts in order; yields one dict per posting, holding only the current one
+        index, first_page, buffer, size = 0, 0, [], 0
+
+        def posting(last_page, forced=False):
+            text = "\n".join(buffer).strip()
+            title = next((line.strip() for line in text.splitlines() if line.strip()), "")[:200]
+            return {"index": index, "first_page": first_page, "last_page": last_page, "title": title, "text": text, "forced": forced}
+
+        for number, text in enumerate(pages):
+            if buffer:
+                if self.pages_per_jd:
+                    boundary, forced = number - first_page >= self.pages_per_jd, False
+                else:
+                    boundary, forced = self.starts_posting(text), False
+                    if not boundary and self.max_pages and number - first_page >= self.max_pages:
+                        boundary = forced = True
+                if boundary:
+                    if "\n".join(buffer).strip():
+                        yield posting(number - 1, forced)
+                        index += 1
+                    first_page, buffer, size = number, [], 0
+            buffer.append(text)
+            size += len(text)
+            if size > self.max_chars:
+                yield posting(number, forced=True)
+                index += 1
+                first_page, buffer, size = number + 1, [], 0
+            elif not self.pages_per_jd and self.ends_posting(text):
+                yield posting(number)
+                index += 1
+                first_page, buffer, size = number + 1, [], 0
+        if "\n".join(buffer).strip():
+            yield posting(first_page + len(buffer) - 1)
+
+
+def split_bundle(source, splitter=None, workers=PDF_WORKERS, max_buffer_mb=PDF_MAX_BUFFER_MB):
+    splitter = splitter or BundleSplitter()
+    yield from splitter.split(iter_pages_parallel(source, workers=workers, max_buffer_mb=max_buffer_mb))
+
+
+# Stable name for one posting of a bundle, used where the pipelines expect a file path (batch pair IDs,
+# JD index rows): "jobs/bundle.pdf", 7 -> "jobs/bundle#007.pdf"
+def bundle_jd_path(bundle_path, index):
+    stem, extension = os.path.splitext(os.path.abspath(bundle_path))
+    return f"{stem}#{index:03d}{extension}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split a PDF bundle of job postings into individual JDs.")
+    parser.add_argument("bundle", help="PDF with many postings")
+    parser.add_argument("--out", help="Write each posting as jd_NNN.txt into this folder")
+    parser.add_argument("--workers", type=int, default=PDF_WORKERS, help="Extraction processes (default: $ATS_PDF_WORKERS or CPU count)")
+    parser.add_argument("--max-buffer-mb", type=float, default=PDF_MAX_BUFFER_MB, help="Ceiling for page text held at once")
+    parser.add_argument("--pages-per-jd", type=int, help="Cut every N pages instead of detecting postings")
+    parser.add_argument("--max-pages", type=int, default=20, help="Longest posting before a forced cut")
+    parser.add_argument("--start-pattern", action="append", help="Regex for a posting's first lines (repeatable, replaces the defaults)")
+    parser.add_argument("--end-pattern", action="append", help="Regex for a posting's last lines (repeatable, replaces the defaults)")
+    args = parser.parse_args(argv)
+
+    splitter = BundleSplitter(
+        start_patterns=args.start_pattern or DEFAULT_START_PATTERNS,
+        end_patterns=args.end_pattern or DEFAULT_END_PATTERNS,
+        pages_per_jd=args.pages_per_jd,
+        max_pages=args.max_pages,
+    )
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    count = 0
+    for jd in split_bundle(args.bundle, splitter, workers=args.workers, max_buffer_mb=args.max_buffer_mb):
+        count += 1
+        if args.out:
+            with open(os.path.join(args.out, f"jd_{jd['index']:03d}.txt"), "w", encoding="utf-8") as f:
+                f.write(jd["text"])
+        print(json.dumps({key: value for key, value in jd.items() if key != "text"}, ensure_ascii=False))
+    print(f"{count} postings", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+# perf.py – Lightweight instrumentation: named spans, per-call token usage and cost, JSON log lines
+#
+# A run (one analysis in the app, one batch in batch_runner) collects spans and OpenAI calls:
+#
+#     perf_run = perf.start_run("analysis")
+#     with perf.span("extract.resume"):
+#         ...
+#     perf.finish_run(perf_run)          # logs the summary; perf_run.summary() for the UI
+#
+# The current run and span live in context variables. Work handed to a thread pool keeps them when it
+# is submitted through perf.bind(fn). Every finished span and every call is emitted as one JSON line on
+# the "ats.perf" logger, and appended to $ATS_PERF_LOG when that is set. Outside a run, spans still log
+# but are not aggregated.
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+PERF_LOG_PATH = os.getenv("ATS_PERF_LOG")
+
+# USD per 1K tokens (prompt, completion); longest matching prefix wins, unknown models have no cost
+MODEL_PRICES_PER_1K = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-32k": (0.06, 0.12),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4-1106": (0.01, 0.03),
+    "gpt-4-0125": (0.01, 0.03),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4.1": (0.002, 0.008),
+    "gpt-4.1-mini": (0.0004, 0.0016),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+
+logger = logging.getLogger("ats.perf")
+
+_current_run = contextvars.ContextVar("perf_run", default=None)
+_current_span = contextvars.ContextVar("perf_span", default=None)
+_file_lock = threading.Lock()
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    matches = [prefix for prefix in MODEL_PRICES_PER_1K if model.startswith(prefix)]
+    if not matches:
+        return None
+    prompt_price, completion_price = MODEL_PRICES_PER_1K[max(matches, key=len)]
+    return round((prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000, 6)
+
+
+def _emit(record):
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    logger.info(line)
+    if PERF_LOG_PATH:
+        with _file_lock, open(PERF_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class PerfRun:
+    def __init__(self, name):
+        self.name = name
+        self.id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.finished = None
+        self.spans = []
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def add_span(self, record):
+        with self._lock:
+            self.spans.append(record)
+
+    def add_call(self, record):
+        with self._lock:
+            self.calls.append(record)
+
+    def summary(self):
+        with self._lock:
+            spans, calls = list(self.spans), list(self.calls)
+
+        stages = {}
+        for span in spans:
+            stage = stages.setdefault(span["span"], {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stage["count"] += 1
+            stage["total_seconds"] += span["seconds"]
+            stage["max_seconds"] = max(stage["max_seconds"], span["seconds"])
+        for stage in stages.values():
+            stage["total_seconds"] = round(stage["total_seconds"], 3)
+            stage["max_seconds"] = round(stage["max_seconds"], 3)
+
+        by_span = {}
+        for call in calls:
+            entry = by_span.setdefault(call["span"] or "(none)", {
+                "calls": 0, "cached": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0, "seconds": 0.0
+            })
+            entry["calls"] += 1
+            entry["cached"] += int(call["cached"])
+            entry["prompt_tokens"] += call["prompt_tokens"] or 0
+            entry["completion_tokens"] += call["completion_tokens"] or 0
+            entry["cost_usd"] += call["cost_usd"] or 0.0
+            entry["seconds"] += call["seconds"]
+        for entry in by_span.values():
+            entry["cost_usd"] = round(entry["cost_usd"], 6)
+            entry["seconds"] = round(entry["seconds"], 3)
+
+        end = self.finished or time.time()
+        return {
+            "run": self.name,
+            "run_id": self.id,
+            "wall_seconds": round(end - self.started, 3),
+            "stages": stages,
+            "gpt_calls": by_span,
+            "totals": {
+                "calls": len(calls),
+                "cached_calls": sum(int(call["cached"]) for call in calls),
+                "prompt_tokens": sum(call["prompt_tokens"] or 0 for call in calls),
+                "completion_tokens": sum(call["completion_tokens"] or 0 for call in calls),
+                "cost_usd": round(sum(call["cost_usd"] or 0.0 for call in calls), 6),
+            },
+        }
+
+
+# === Runs ===
+def start_run(name):
+    run = PerfRun(name)
+    _current_run.set(run)
+    return run
+
+
+def finish_run(run):
+    run.finished = time.time()
+    if _current_run.get() is run:
+        _current_run.set(None)
+    summary = run.summary()
+    _emit({"event": "summary", **summary})
+    return summary
+
+
+def current_run():
+    return _current_run.get()
+
+
+# === Spans ===
+@contextmanager
+def span(name, **attrs):
+    run = _current_run.get()
+    parent = _current_span.get()
+    token = _current_span.set(name)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        record = {
+            "event": "span", "run_id": run.id if run else None, "span": name, "parent": parent,
+            "seconds": round(time.perf_counter() - start, 4), "error": error, **attrs,
+        }
+        if run is not None:
+            run.add_span(record)
+        _emit(record)
+
+
+def timed(name, fn, *args, **kwargs):
+    # span() for a single call, e.g. a callable handed to a widget
+    with span(name):
+        return fn(*args, **kwargs)
+
+
+# === OpenAI calls ===
+def record_call(model, seconds, prompt_tokens=None, completion_tokens=None, cached=False, **attrs):
+    run = _current_run.get()
+    record = {
+        "event": "gpt_call", "run_id": run.id if run else None, "span": _current_span.get(), "model": model,
+        "cached": cached, "seconds": round(seconds, 4),
+        "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+        "cost_usd": None if cached or prompt_tokens is None else estimate_cost(model, prompt_tokens, completion_tokens or 0),
+        **attrs,
+    }
+    if run is not None:
+        run.add_call(record)
+    _emit(record)
+
+
+# === Thread pools: carry the current run/span into submitted work ===
+def copy_context():
+    # Snapshot to pass to bind() later, for work submitted from callbacks on other threads
+    return contextvars.copy_context()
+
+
+def bind(fn, context=None):
+    # Each submission gets its own copy: one Context cannot be entered by two threads at once
+    ctx = (context or contextvars.copy_context()).copy()
+    return functools.partial(ctx.run, fn)
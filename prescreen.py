@@ -0,0 +1,160 @@
+# prescreen.py – Local, deterministic resume/JD pre-screening (no network, no GPT tokens)
+#
+# Extracts unigram and bigram keywords from each JD, weights them BM25-style (saturated term
+# frequency × IDF across the JDs being scored), keeps the top-K per JD and measures how much of
+# that weight the resume covers. All JDs are scored at once with NumPy operations over sparse
+# (JD, term, weight) arrays, so memory follows the terms each JD actually has rather than JDs × vocabulary,
+# and a folder of hundreds of postings is triaged in milliseconds before anything is sent to GPT.
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either else etc ever every few for
+from further had has have having he her here hers him his how i if in into is it its itself just least
+less made make many may me might more most much must my no nor not now of off on once one only or other
+our ours out over own per please same shall she should so some such than that the their theirs them then
+there these they this those through to too under until up upon us very via was we well were what when
+where whether which while who whom whose why will with within without would yet you your yours
+ability able apply applicant applicants candidate candidates company including include includes job jobs
+join looking opportunity position preferred required requirement requirements responsibilities role
+seeking strong team work working years year plus related relevant new good excellent equal employer
+""".split())
+
+DEFAULT_TOP_K = 40
+
+
+# === Tokenization and keyword candidates ===
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+@lru_cache(maxsize=65536)
+def _is_keyword_token(token):
+    return len(token) > 1 and token not in STOPWORDS and not token.replace(".", "").replace("/", "").isdigit()
+
+def extract_terms(text):
+    # Unigrams plus adjacent bigrams ("project management", "power bi") made of keyword tokens
+    tokens = tokenize(text)
+    flags = [_is_keyword_token(token) for token in tokens]
+    counts = Counter(token for token, keep in zip(tokens, flags) if keep)
+    counts.update(
+        f"{first} {second}"
+        for first, second, keep_first, keep_second in zip(tokens, tokens[1:], flags, flags[1:])
+        if keep_first and keep_second
+    )
+    return counts
+
+
+# === Scorer ===
+class PrescreenScorer:
+    def __init__(self, top_k=DEFAULT_TOP_K, k1=1.2, b=0.75):
+        self.top_k = top_k
+        self.k1 = k1
+        self.b = b
+
+    def _jd_weights(self, jd_counts):
+        # Sparse weights: one (JD row, term column, weight) entry per term a JD contains, never a dense
+        # JDs × vocabulary matrix. Entries come out grouped by row (CSR order).
+        vocab = {}
+        rows, cols, values = [], [], []
+        for row, counts in enumerate(jd_counts):
+            rows.extend([row] * len(counts))
+            cols.extend(vocab.setdefault(term, len(vocab)) for term in counts)
+            values.extend(counts.values())
+        n_docs = len(jd_counts)
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        tf = np.array(values, dtype=np.float32)
+
+        # BM25 term-frequency saturation with JD length normalization
+        lengths = np.bincount(rows, weights=tf, minlength=n_docs).astype(np.float32)
+        avg_length = float(lengths.mean()) if n_docs else 0.0
+        norm = self.k1 * (1 - self.b + self.b * lengths[rows] / avg_length) if avg_length else self.k1
+        saturated = tf * (self.k1 + 1) / (tf + norm)
+
+        # IDF only makes sense across several JDs; a lone JD relies on the stopword list instead
+        if n_docs > 1:
+            df = np.bincount(cols, minlength=len(vocab))
+            idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        else:
+            idf = np.ones(len(vocab), dtype=np.float32)
+        weights = (saturated * idf[cols]).astype(np.float32)
+
+        # Keep only each JD's top-K keywords (ties with the K-th weight are kept too); order every row by weight
+        order = np.lexsort((cols, -weights, rows))
+        rows, cols, weights = rows[order], cols[order], weights[order]
+        row_starts = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n_docs))))
+        cutoff = np.zeros(n_docs, dtype=np.float32)
+        full_rows = np.flatnonzero(np.diff(row_starts) >= self.top_k)
+        if self.top_k > 0 and len(full_rows):
+            cutoff[full_rows] = weights[row_starts[full_rows] + self.top_k - 1]
+        keep = (weights > 0) & (weights >= cutoff[rows])
+        return vocab, rows[keep], cols[keep], weights[keep]
+
+    def score_many(self, resume_text, jd_texts):
+        jd_counts = [extract_terms(text) for text in jd_texts]
+        if not jd_counts:
+            return []
+        vocab, rows, cols, weights = self._jd_weights(jd_counts)
+        terms = np.array(list(vocab), dtype=object)
+
+        # Only the resume's own terms are looked up in the JD vocabulary
+        present = np.zeros(len(vocab), dtype=bool)
+        present[[vocab[term] for term in extract_terms(resume_text) if term in vocab]] = True
+        hit = present[cols]
+
+        n_docs = len(jd_counts)
+        totals = np.bincount(rows, weights=weights, minlength=n_docs).astype(np.float64)
+        covered = np.bincount(rows, weights=np.where(hit, weights, 0.0), minlength=n_docs).astype(np.float64)
+        scores = np.divide(covered, totals, out=np.zeros_like(covered), where=totals > 0) * 100
+
+        row_starts = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n_docs))))
+        results = []
+        for row in range(n_docs):
+            entries = slice(row_starts[row], row_starts[row + 1])
+            row_terms, row_hit = terms[cols[entries]], hit[entries]
+            results.append(_as_gpt_shape(int(round(float(scores[row]))), row_terms[row_hit].tolist(), row_terms[~row_hit].tolist()))
+        return results
+
+    def score(self, resume_text, jd_text):
+        return self.score_many(resume_text, [jd_text])[0]
+
+
+# === Same key layout as the GPT JSON (scoring.atsCompatibilityScore, matched/missing skills) ===
+def _as_gpt_shape(score, matched, missing):
+    return {
+        "scoring": {
+            "atsCompatibilityScore": score,
+            "method": "local-bm25",
+        },
+        "Output": {
+            "SummaryOfMatchedAndMissingSkills": {
+                "Matched": matched,
+                "Missing": missing,
+            }
+        },
+        "ImprovementsBreakdown": {
+            "MissingAndUnderusedKeywords": missing,
+        },
+    }
+
+
+def prescreen_score(resume_text, jd_text, top_k=DEFAULT_TOP_K):
+    return PrescreenScorer(top_k=top_k).score(resume_text, jd_text)
+
+# Splits JDs into (kept, rejected) lists of (index, score, result), both sorted best-first
+def triage(resume_text, jd_texts, threshold=0, top_k=DEFAULT_TOP_K):
+    results = PrescreenScorer(top_k=top_k).score_many(resume_text, jd_texts)
+    ranked = sorted(
+        ((i, r["scoring"]["atsCompatibilityScore"], r) for i, r in enumerate(results)),
+        key=lambda item: -item[1]
+    )
+    keep = [item for item in ranked if item[1] >= threshold]
+    rejected = [item for item in ranked if item[1] < threshold]
+    return keep, rejected
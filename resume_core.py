@@ -0,0 +1,264 @@
+# resume_core.py – Document and tracker functions without any UI (no Streamlit, no .env loading)
+#
+# Used by the Streamlit app (through main_work_version_1_01_updated.py), the batch runner, the JD index,
+# the job queue and the benchmarks. Importing this module only costs the standard library plus the small
+# DOCX/PDF helpers: PyMuPDF, python-docx, openpyxl and the cover-letter template are imported by the code
+# paths that need them, so a worker or CLI that only extracts DOCX text never loads them.
+#
+# Nothing here talks to the user. Where the old code showed st.warning and retried (a file still open in
+# Word or Excel), the caller passes on_warning=callable(message) (like tracker_journal.py); without one it is logged.
+# .env files are read only when an entry point asks for it (load_env()).
+
+import json
+import logging
+import os
+import re
+import time
+import zipfile
+from datetime import datetime
+from xml.etree.ElementTree import ParseError
+from io import BytesIO
+
+from docx_replace import replace_in_document
+from docx_text import extract_docx_text
+from pdf_reader import iter_pages
+
+logger = logging.getLogger("ats.core")
+
+# Seconds (one attempt each) to wait for a resume that is open in Word before giving up
+DOCX_OPEN_ATTEMPTS = int(os.getenv("ATS_DOCX_OPEN_ATTEMPTS", "30"))
+
+
+# === .env loading, for entry points (the app, the CLIs) ===
+def load_env():
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return False
+    return load_dotenv()
+
+def _log_warning(message):
+    logger.warning(message)
+
+# === Save Customized Cover Letter ===
+# The template is compiled once per file (cover_letter_template.py) and the GPT body is inserted at [InsertCoverLetterHere]
+def save_customized_cover_letter(template_path, output_folder, cover_text, resume_text, company_name):
+    from cover_letter_template import SALUTATION, candidate_values, load_template, salutation
+
+    values = candidate_values(resume_text)
+    values[SALUTATION] = salutation()
+    candidate_name = values.get("Candidate Name", "Candidate")
+    filename = f"CV_{candidate_name}-{company_name}-{datetime.today().strftime('%Y-%m-%d')}.docx"
+    filepath = os.path.join(output_folder, filename)
+    load_template(template_path).save(filepath, values, body=cover_text)
+    return filepath, candidate_name
+
+# === Save Plain Cover Letter (Arial 11, no template) ===
+def save_plain_cover_letter(cover_letter_text, save_path):
+    import docx
+    from docx.shared import Pt
+
+    cover_doc = docx.Document()
+    cover_doc.add_paragraph(cover_letter_text)
+    font = cover_doc.styles['Normal'].font
+    font.name = 'Arial'
+    font.size = Pt(11)
+    cover_doc.save(save_path)
+    return save_path
+
+# === Save Cover Letter into the template (v1.5) ===
+# save_path may be a path or a writable buffer; without a template file the plain letter is saved instead.
+def recruiter_name_from_result(gpt_result):
+    recruiter = (gpt_result or {}).get("JobDescription", {}).get("Recruiter")
+    return recruiter.get("Name") if isinstance(recruiter, dict) else None
+
+def save_template_cover_letter(cover_letter_text, resume_text, save_path, recruiter_name=None, template_path=None):
+    # template_path defaults to cover_letter_template.DEFAULT_TEMPLATE_PATH ($ATS_COVER_LETTER_TEMPLATE)
+    from cover_letter_template import DEFAULT_TEMPLATE_PATH, SALUTATION, candidate_values, load_template, salutation
+
+    template_path = template_path or DEFAULT_TEMPLATE_PATH
+    if not os.path.exists(template_path):
+        return save_plain_cover_letter(cover_letter_text, save_path)
+    values = candidate_values(resume_text)
+    values[SALUTATION] = salutation(recruiter_name)
+    return load_template(template_path).save(save_path, values, body=cover_letter_text)
+
+# === Extract Resume Text ===
+# file_path may be a path, raw bytes or a binary file-like object (e.g. a Streamlit upload).
+# DOCX text is streamed from the zip (body, tables, text boxes, headers and footers) – see docx_text.py.
+# A locked file raises "Please make sure the file is not open"; a corrupt DOCX raises ValueError.
+def _detect_document_kind(source):
+    name = source if isinstance(source, str) else getattr(source, "name", "")
+    if isinstance(name, str) and name.lower().endswith((".pdf", ".docx")):
+        return ".pdf" if name.lower().endswith(".pdf") else ".docx"
+    if isinstance(source, str):
+        return None
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        head = bytes(source[:4])
+    else:
+        position = source.tell()
+        head = source.read(4)
+        source.seek(position)
+    if head.startswith(b"%PDF"):
+        return ".pdf"
+    if head.startswith(b"PK"):
+        return ".docx"
+    return None
+
+def extract_text(file_path):
+    kind = _detect_document_kind(file_path)
+    if kind == ".pdf":
+        # Pages are read one at a time (pdf_reader.py); multi-posting bundles go through pdf_reader.split_bundle
+        return "\n".join(iter_pages(file_path))
+    elif kind == ".docx":
+        label = file_path if isinstance(file_path, str) else getattr(file_path, "name", "<uploaded document>")
+        try:
+            return extract_docx_text(file_path)
+        except PermissionError as e:
+            # Word holds a lock on the file while it is open (only happens for paths on disk)
+            raise Exception(f"Please make sure the file is not open: {label}") from e
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, KeyError, ParseError) as e:
+            # Not a zip, no word/document.xml or malformed XML
+            raise ValueError(f"The document is invalid or corrupt and could not be read: {label}") from e
+    return ""
+
+# === Parse Replacements from GPT Output ===
+def parse_replacements(gpt_output):
+    json_block = re.search(r"```json\s*(\[.*?\])\s*```", gpt_output, re.DOTALL)
+    if json_block:
+        try:
+            replacements = json.loads(json_block.group(1))
+            return [(item["was"], item["new"], item.get("section", "Unknown")) for item in replacements]
+        except Exception as e:
+            print("⚠️ Failed to parse JSON change log:", e)
+            return []
+    return re.findall(r"(?i)replace [“\"](.+?)[”\"] with [“\"](.+?)[”\"]", gpt_output)
+
+# === Apply Replacements to DOCX ===
+# Single pass over body, tables, headers and footers (see docx_replace.py); run formatting is preserved.
+# original_path may be a path, raw bytes or a file-like object; save_path may be a path or a writable buffer.
+# Returns the document, the save target and a per-suggestion hit report ({"Was", "New", "Hits", "Overlapped"}).
+# While a resume on disk is locked (PermissionError, e.g. open in Word), on_warning(message) is called once a
+# second for up to DOCX_OPEN_ATTEMPTS tries, then the error is raised; any other error (a corrupt or non-DOCX
+# file) is raised at once, so a batch records the pair as failed instead of waiting on it.
+def apply_replacements_to_docx(original_path, replacements, save_path=None, on_warning=None):
+    import docx
+
+    if isinstance(original_path, (bytes, bytearray)):
+        original_path = BytesIO(original_path)
+    for attempt in range(max(1, DOCX_OPEN_ATTEMPTS)):
+        try:
+            doc = docx.Document(original_path)
+            break
+        except PermissionError:
+            if attempt == max(1, DOCX_OPEN_ATTEMPTS) - 1:
+                raise
+            (on_warning or _log_warning)(f"⚠️ Please close the resume file:\n{original_path}")
+            time.sleep(1)
+
+    hits = replace_in_document(doc, replacements)
+
+    # Save if save_path provided
+    if save_path:
+        doc.save(save_path)
+    return doc, save_path or original_path, hits
+
+# === Extract Final Optimized Resume Text ===
+def extract_final_resume_text(gpt_output):
+    block = re.search(r"(?:## Final optimized resume|```text)(.*?)(?:```|\Z)", gpt_output, re.DOTALL | re.IGNORECASE)
+    if block:
+        return block.group(1).strip()
+    return None
+
+# === Extract Company Name from GPT Output ===
+def extract_company_name_from_gpt(gpt_output):
+    match = re.search(r"(?i)Company(?: Name)?:\s*(.+)", gpt_output)
+    if match:
+        return match.group(1).strip()
+    return "UnknownCompany"
+
+# === Append logged results to an open tracker workbook ===
+# Each entry is a dict with resume_name, jd_name, score, changes [(old, new, section)], resume_filename,
+# company_name and an optional logged_date. Rows for all entries are appended first and every table's
+# ref is updated once at the end, so a batch costs a single load/save of the workbook.
+def append_gpt_results_to_workbook(wb, entries):
+    from openpyxl.utils import get_column_letter
+
+    def format_score(score_text):
+        try:
+            return float(str(score_text).replace('%', '').strip()) / 100
+        except:
+            return None
+
+    ats = wb["ATS_Report_Log"]
+    chg = wb["Change_Log"]
+    inv = wb["Resume_Inventory"]
+    tracker = wb["Job_Application_Tracker"] if "Job_Application_Tracker" in wb.sheetnames else None
+
+    for entry in entries:
+        today = entry.get("logged_date") or datetime.today().date()
+        job_title = entry["jd_name"].replace(".docx", "")
+        resume_filename = entry["resume_filename"]
+        resume_version = resume_filename.replace(".docx", "")
+        changes = entry["changes"]
+
+        # ATS_Report_Log
+        ats.append([
+            ats.max_row,
+            resume_version,
+            job_title,
+            entry["company_name"],
+            format_score(entry["score"]),
+            f"{len(changes)} changes",
+            today
+        ])
+
+        # Change_Log
+        for old, new, section in changes:
+            chg.append([
+                chg.max_row,
+                resume_version,
+                old,
+                new,
+                section,
+                job_title,
+                today
+            ])
+
+        # Resume_Inventory
+        inv.append([
+            resume_version,
+            entry["resume_name"],
+            job_title,
+            f"/03-Customized_Resumes/{resume_filename}",
+            today
+        ])
+
+        # Job_Application_Tracker (if exists)
+        if tracker is not None:
+            tracker.append([
+                tracker.max_row,
+                resume_version,
+                job_title,
+                entry["company_name"],
+                today,
+                "Pending",
+                "Auto-logged"
+            ])
+
+    ats.tables["ATS_Report"].ref = f"A1:{get_column_letter(ats.max_column)}{ats.max_row}"
+    chg.tables["Change_Log"].ref = f"A1:{get_column_letter(chg.max_column)}{chg.max_row}"
+    inv.tables["Resume_Inventory"].ref = f"A1:{get_column_letter(inv.max_column)}{inv.max_row}"
+    if tracker is not None:
+        tracker.tables["tblJobApplications"].ref = f"A1:{get_column_letter(tracker.max_column)}{tracker.max_row}"
+
+# === Log Results into Excel Tracker ===
+# The result is appended to the workbook's journal and written by the shared background writer
+# (tracker_journal.py) in one load/save per batch; a locked workbook is retried there with bounded
+# backoff, so the caller never waits on Excel. on_warning(message) is only used when this call creates
+# the writer for tracker_path. Returns the journal entry ID.
+def log_gpt_results(tracker_path, resume_name, jd_name, score, changes, resume_filename, company_name, on_warning=None):
+    from tracker_journal import journal_writer  # imports this module
+
+    writer = journal_writer(tracker_path, on_warning=on_warning or _log_warning)
+    return writer.log(resume_name, jd_name, score, changes, resume_filename, company_name)
@@ -0,0 +1,146 @@
+# resume_sections.py – Split resume text into the sections the analysis prompt classifies, and diff two versions
+#
+#     sections = split_sections(resume_text)        # {"Head": "...", "Professional Profile": "...", ...}
+#     delta = diff_sections(old_sections, sections)
+#     delta.edits                                  # {"Career Experience": (paragraphs before, paragraphs after)}
+#     delta.changed, delta.unchanged, delta.removed, delta.changed_share
+#
+# Sections are the suggestion prompt's classes (Head, Target Position, Professional Profile, Expertises,
+# Accomplishments, Career Experience, Skills, Certifications, Education, Others). A line is a heading when
+# it is short and, without a trailing colon, is one of the common names for a class (case-insensitive);
+# a short ALL-CAPS line that is not a known name starts an "Others" section. Everything before the first
+# heading is the Head. A class that appears twice is joined into one section.
+# Sections are diffed paragraph by paragraph (one line of extract_text output each), so tweaking two bullets
+# in a long experience section is two edited paragraphs, not a changed section. Comparison ignores
+# whitespace and blank lines, so re-extracting the same DOCX never counts as an edit.
+
+import difflib
+import hashlib
+import re
+
+SECTION_NAMES = (
+    "Head", "Target Position", "Professional Profile", "Expertises", "Accomplishments",
+    "Career Experience", "Skills", "Certifications", "Education", "Others",
+)
+
+_HEADINGS = {
+    "Target Position": (
+        "target position", "target role", "objective", "career objective", "professional objective", "position sought",
+    ),
+    "Professional Profile": (
+        "professional profile", "profile", "summary", "professional summary", "career summary", "executive summary",
+        "summary of qualifications", "about me",
+    ),
+    "Expertises": (
+        "expertises", "expertise", "areas of expertise", "core competencies", "competencies", "core strengths",
+        "key qualifications",
+    ),
+    "Accomplishments": ("accomplishments", "achievements", "key achievements", "selected achievements", "awards", "honors"),
+    "Career Experience": (
+        "career experience", "experience", "work experience", "professional experience", "employment history",
+        "work history", "relevant experience", "employment", "projects",
+    ),
+    "Skills": ("skills", "technical skills", "key skills", "tools", "technologies", "software", "languages"),
+    "Certifications": ("certifications", "certificates", "licenses", "licenses and certifications", "licenses & certifications"),
+    "Education": ("education", "education and training", "academic background", "training"),
+}
+_HEADING_SECTIONS = {alias: section for section, aliases in _HEADINGS.items() for alias in aliases}
+_MAX_HEADING_CHARS = 45
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _heading_section(line):
+    text = line.strip().rstrip(":").strip()
+    if not text or len(text) > _MAX_HEADING_CHARS:
+        return None
+    section = _HEADING_SECTIONS.get(_WHITESPACE_RE.sub(" ", text).lower())
+    if section:
+        return section
+    if text.isupper() and len(text.split()) <= 4 and any(c.isalpha() for c in text):
+        return "Others"
+    return None
+
+
+def split_sections(resume_text):
+    sections, current = {}, "Head"
+    for line in (resume_text or "").splitlines():
+        section = _heading_section(line)
+        if section:
+            current = section
+        sections.setdefault(current, []).append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "\n".join(lines).strip()}
+
+
+def normalize(text):
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def _paragraphs(text):
+    return [line for line in (normalize(line) for line in (text or "").splitlines()) if line]
+
+
+def resume_lineage(resume_text):
+    # Versions of one resume share the candidate: the first line of the Head (the name) and the first e-mail
+    head = split_sections(resume_text).get("Head", "")
+    first_line = next((line.strip() for line in head.splitlines() if line.strip()), "")
+    email = re.search(r"[\w\.-]+@[\w\.-]+", resume_text or "")
+    identity = f"{normalize(first_line).lower()}|{email.group(0).lower() if email else ''}"
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+
+
+class SectionDelta:
+    def __init__(self, old_sections, new_sections):
+        self.old = old_sections
+        self.new = new_sections
+        # section -> (paragraphs before, paragraphs after) of every edited stretch, in resume order
+        self.edits = {}
+        self._unchanged_paragraphs = []
+        # Characters touched by the edits: per stretch the larger of its before and after text, so deletions count
+        self._changed_chars = 0
+        for name in list(new_sections) + [name for name in old_sections if name not in new_sections]:
+            old_lines = _paragraphs(old_sections.get(name))
+            new_lines = _paragraphs(new_sections.get(name))
+            matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag == "equal":
+                    self._unchanged_paragraphs.extend(line.casefold() for line in new_lines[j1:j2])
+                else:
+                    before, after = self.edits.setdefault(name, ([], []))
+                    before.extend(old_lines[i1:i2])
+                    after.extend(new_lines[j1:j2])
+                    self._changed_chars += max(sum(map(len, old_lines[i1:i2])), sum(map(len, new_lines[j1:j2])))
+        self.changed = [name for name in new_sections if name in self.edits]
+        self.unchanged = [name for name in new_sections if name not in self.edits]
+        self.removed = [name for name in old_sections if name not in new_sections]
+
+    @property
+    def is_empty(self):
+        return not self.edits
+
+    @property
+    def changed_share(self):
+        # Share of the resume's characters (the longer of the two versions) that sit in edited or deleted paragraphs
+        total = max(
+            sum(len(line) for text in self.old.values() for line in _paragraphs(text)),
+            sum(len(line) for text in self.new.values() for line in _paragraphs(text)),
+        )
+        return min(self._changed_chars / total, 1.0) if total else 1.0
+
+    def contains_unchanged(self, text):
+        # True when text (e.g. a suggestion's 'Was') still reads the same in a paragraph that was not edited;
+        # case-insensitive, like the replacement engine that will look for it
+        needle = normalize(text).casefold()
+        return bool(needle) and any(needle in paragraph for paragraph in self._unchanged_paragraphs)
+
+    def summary(self):
+        return {
+            "changed": list(self.changed),
+            "removed": list(self.removed),
+            "unchanged": list(self.unchanged),
+            "changed_paragraphs": sum(max(len(before), len(after)) for before, after in self.edits.values()),
+            "changed_share": round(self.changed_share, 3),
+        }
+
+
+def diff_sections(old_sections, new_sections):
+    return SectionDelta(old_sections or {}, new_sections)
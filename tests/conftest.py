@@ -0,0 +1,7 @@
+# conftest.py – Tests import the repository modules from the root and never touch the on-disk GPT cache
+
+import os
+import sys
+
+os.environ.setdefault("ATS_CACHE_DISABLE", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,89 @@
+# test_batch_runner.py – run_batch() against stubbed GPT calls (no network) and crash-safe tracker appends
+
+import json
+import os
+import threading
+
+import pytest
+
+import batch_runner
+import gpt_helper_work_version
+from benchmarks.corpus import jd_paragraphs, resume_paragraphs, write_docx
+from benchmarks.fake_openai import CANNED_COVER_LETTER, canned_analysis
+from tracker import load_tracker
+
+
+def test_pairs_beyond_the_default_pool_run_at_once(tmp_path, monkeypatch):
+    # Every analysis and every cover letter waits until all pairs have reached it, so the batch only
+    # succeeds if --concurrency pairs really are in flight together
+    pairs = 10
+    analyses = threading.Barrier(pairs, timeout=10)
+    cover_letters = threading.Barrier(pairs, timeout=10)
+
+    def analysis(resume_text, jd_text, api_key, **_kwargs):
+        analyses.wait()
+        return json.dumps(canned_analysis(resume_text))
+
+    def cover_letter(resume_text, jd_text, api_key, use_cache=True):
+        cover_letters.wait()
+        return CANNED_COVER_LETTER
+
+    monkeypatch.setitem(gpt_helper_work_version.ANALYSIS_STRATEGIES, "single", analysis)
+    monkeypatch.setattr(gpt_helper_work_version, "generate_cover_letter", cover_letter)
+    resume = write_docx(resume_paragraphs("small"), str(tmp_path / "resume.docx"))
+    jds = [write_docx(jd_paragraphs("small", seed=i), str(tmp_path / f"jd_{i}.docx")) for i in range(pairs)]
+
+    summary = batch_runner.run_batch(
+        [resume], jds, str(tmp_path / "out"), "sk-test", concurrency=pairs, use_cache=False, strategy="single",
+        log=lambda *_args: None
+    )
+
+    assert summary["succeeded"] == pairs, summary["failures"]
+
+
+def _results(count):
+    analysis = canned_analysis("Jordan Avery Smith")
+    return {
+        f"pair_{i}": {
+            "analysis": analysis, "company_name": "Acme", "resume_file": f"Resume_{i}.docx", "resume": "/in/resume.docx",
+            "analysis_date": "2026-10-01",
+        }
+        for i in range(count)
+    }
+
+
+def _tracked_rows(tracker_path):
+    return len(load_tracker(tracker_path)["Resume_Tracker"])
+
+
+def test_crash_after_the_tracker_is_replaced_does_not_log_pairs_twice(tmp_path, monkeypatch):
+    tracker_path = str(tmp_path / "tracker.xlsx")
+
+    def crash(_path, _pids):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(batch_runner, "_write_manifest", crash)
+    with pytest.raises(KeyboardInterrupt):
+        batch_runner.append_results_to_tracker(tracker_path, str(tmp_path), _results(3))
+    monkeypatch.undo()
+
+    assert batch_runner.append_results_to_tracker(tracker_path, str(tmp_path), _results(4)) == 1
+    assert _tracked_rows(tracker_path) == 4
+
+
+def test_crash_before_the_tracker_is_replaced_logs_the_pairs_again(tmp_path, monkeypatch):
+    tracker_path = str(tmp_path / "tracker.xlsx")
+    real_replace = os.replace
+
+    def crash_on_tracker(source, target):
+        if target == tracker_path:
+            raise KeyboardInterrupt
+        real_replace(source, target)
+
+    monkeypatch.setattr(batch_runner.os, "replace", crash_on_tracker)
+    with pytest.raises(KeyboardInterrupt):
+        batch_runner.append_results_to_tracker(tracker_path, str(tmp_path), _results(3))
+    monkeypatch.undo()
+
+    assert batch_runner.append_results_to_tracker(tracker_path, str(tmp_path), _results(3)) == 3
+    assert _tracked_rows(tracker_path) == 3
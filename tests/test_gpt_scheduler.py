@@ -0,0 +1,40 @@
+# test_gpt_scheduler.py – RequestScheduler: token budget across retries, attempt limits
+
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from gpt_scheduler import GPTTransientError, RequestScheduler, estimate_tokens
+
+MESSAGES = [{"role": "user", "content": "Score this resume against the job description."}]
+
+
+def _timeout():
+    raise openai.APITimeoutError(request=None)
+
+
+def test_failed_attempts_are_credited_back():
+    scheduler = RequestScheduler(tpm=6000, rpm=600, max_attempts=3, base_delay=0.0)
+
+    with pytest.raises(GPTTransientError) as error:
+        scheduler.call(_timeout, MESSAGES, max_tokens=1500)
+
+    assert error.value.attempts == 3
+    assert scheduler.stats()["retries"] == 2
+    assert scheduler.tokens.level == pytest.approx(scheduler.tokens.capacity)
+
+
+def test_response_without_usage_is_settled_from_its_text():
+    scheduler = RequestScheduler(tpm=6000, rpm=600, max_attempts=1)
+    response = SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content="x" * 400))])
+
+    assert scheduler.call(lambda: response, MESSAGES, max_tokens=1500) is response
+    used = estimate_tokens(MESSAGES, 0) + 100
+    assert scheduler.tokens.level == pytest.approx(scheduler.tokens.capacity - used, abs=1)
+
+
+@pytest.mark.parametrize("max_attempts", [0, -1])
+def test_max_attempts_must_allow_one_call(max_attempts):
+    with pytest.raises(ValueError):
+        RequestScheduler(max_attempts=max_attempts)
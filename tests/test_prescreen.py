@@ -0,0 +1,21 @@
+# test_prescreen.py – Local BM25 pre-screen: coverage scores and keyword lists per JD
+
+from prescreen import PrescreenScorer, triage
+
+
+def test_score_is_the_covered_share_of_each_jds_keywords():
+    jds = ["Python SQL Tableau", "Kubernetes Terraform Golang", ""]
+    results = PrescreenScorer().score_many("Senior analyst: Python SQL Tableau dashboards", jds)
+
+    assert [r["scoring"]["atsCompatibilityScore"] for r in results] == [100, 0, 0]
+    assert set(results[0]["Output"]["SummaryOfMatchedAndMissingSkills"]["Matched"]) >= {"python", "sql", "tableau"}
+    assert "terraform" in results[1]["Output"]["SummaryOfMatchedAndMissingSkills"]["Missing"]
+
+
+def test_many_jds_with_disjoint_vocabularies():
+    # Thousands of JDs that share no terms: weights stay per JD, not JDs × vocabulary
+    jds = [" ".join(f"skill{i}x{j}" for j in range(60)) for i in range(3000)]
+    keep, rejected = triage("skill7x1 skill7x2", jds, threshold=1, top_k=10)
+
+    assert [index for index, _score, _result in keep] == [7]
+    assert len(rejected) == len(jds) - 1
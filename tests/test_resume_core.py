@@ -0,0 +1,21 @@
+# test_resume_core.py – extract_text(): errors say what is wrong with the document
+
+import pytest
+
+import resume_core
+from resume_core import extract_text
+
+
+@pytest.mark.parametrize("source", [b"PK\x03\x04 not a zip", b"PK\x05\x06" + b"\x00" * 18])
+def test_corrupt_docx_is_reported_as_corrupt(source):
+    with pytest.raises(ValueError, match="invalid or corrupt"):
+        extract_text(source)
+
+
+def test_locked_docx_asks_to_close_the_file(monkeypatch):
+    def locked(_source):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr(resume_core, "extract_docx_text", locked)
+    with pytest.raises(Exception, match="not open: resume.docx"):
+        extract_text("resume.docx")
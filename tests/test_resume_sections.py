@@ -0,0 +1,28 @@
+# test_resume_sections.py – diff_sections(): how much of a resume changed and what still reads the same
+
+from resume_sections import diff_sections
+
+BULLETS = [f"Delivered project {i} with measurable impact for the analytics team" for i in range(20)]
+OLD = {"Head": "Jordan Avery Smith", "Career Experience": "EXPERIENCE\n" + "\n".join(BULLETS)}
+
+
+def test_deleted_paragraphs_count_as_changed():
+    delta = diff_sections(OLD, {"Head": "Jordan Avery Smith", "Career Experience": "EXPERIENCE\n" + BULLETS[0]})
+
+    assert delta.changed_share > 0.9
+    assert delta.summary()["changed_paragraphs"] == 19
+
+
+def test_one_edited_bullet_is_a_small_change():
+    edited = BULLETS[:19] + ["Rebuilt the pricing model in Python and SQL"]
+    delta = diff_sections(OLD, {"Head": "Jordan Avery Smith", "Career Experience": "EXPERIENCE\n" + "\n".join(edited)})
+
+    assert 0 < delta.changed_share < 0.1
+    assert diff_sections(OLD, OLD).changed_share == 0.0
+
+
+def test_unchanged_text_is_found_case_insensitively():
+    delta = diff_sections(OLD, {**OLD, "Head": "Jordan A. Smith"})
+
+    assert delta.contains_unchanged("DELIVERED PROJECT 3 with measurable impact")
+    assert not delta.contains_unchanged("Jordan Avery Smith")
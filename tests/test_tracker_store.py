@@ -0,0 +1,36 @@
+# test_tracker_store.py – TrackerStore: durable per-tracker files, scratch stores in memory
+
+from datetime import date
+
+from tracker_store import TrackerStore, tracker_db_path
+
+ANALYSIS = {
+    "JobDescription": {"CompanyName": "Acme", "JobTitle": "Data Analyst"},
+    "scoring": {"atsCompatibilityScore": 81},
+    "ResumeImprovementSuggestions": [{"Was": "Led", "New": "Directed", "Section": "Career Experience"}],
+}
+
+
+def test_rows_survive_reopening_the_tracker(tmp_path, monkeypatch):
+    monkeypatch.setattr("tracker_store.TRACKER_DIR", str(tmp_path))
+    path = tracker_db_path("new:JS")
+    store = TrackerStore(path)
+    store.append_analysis(ANALYSIS, "Acme", "Resume_JS.docx", "resume.docx", date(2026, 10, 1))
+    store.close()
+
+    reopened = TrackerStore(tracker_db_path("new:JS"))
+    assert not reopened.is_empty()
+    assert reopened.to_frames()["Resume_Tracker"]["Match in %"].tolist() == [81]
+    assert reopened.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    reopened.close()
+    assert tracker_db_path("new:JS") != tracker_db_path("new:AB")
+
+
+def test_scratch_store_lives_in_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr("tracker_store.TRACKER_DIR", str(tmp_path))
+    store = TrackerStore(":memory:")
+
+    assert store.is_empty()
+    assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+    store.close()
+    assert not list(tmp_path.iterdir())
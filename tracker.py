@@ -0,0 +1,66 @@
+# tracker.py – Resume/JD tracker sheets shared by the Streamlit app and the batch runner
+#
+# A tracker is a dict of three DataFrames keyed by sheet name:
+#   JD_Analysis, Resume_Tracker, Resume_Change_Log
+# Rows are appended through tracker_store.TrackerStore, which issues the IDs; this module holds the
+# sheet layout, the row values derived from an analysis and the workbook import / export.
+# pandas is imported by the functions that build frames, so importing this module stays cheap.
+
+from io import BytesIO
+
+JD_COLUMNS = ["ID#", "JD Title", "Company", "Analysis Date", "Missing Keywords"]
+RESUME_COLUMNS = ["ID#", "Resume File Name", "JD Title", "Match in %", "Summary of Changes", "Created Date"]
+CHANGE_LOG_COLUMNS = ["ID#", "Original Resume File Name", "Resume File Name", "Was", "New", "Section", "JD Title"]
+
+TRACKER_SHEETS = {
+    "JD_Analysis": JD_COLUMNS,
+    "Resume_Tracker": RESUME_COLUMNS,
+    "Resume_Change_Log": CHANGE_LOG_COLUMNS,
+}
+
+
+# === Create / Load ===
+def new_tracker():
+    import pandas as pd
+    return {sheet: pd.DataFrame(columns=columns) for sheet, columns in TRACKER_SHEETS.items()}
+
+def load_tracker(source):
+    import pandas as pd
+    xls = pd.ExcelFile(source)
+    tracker = {sheet: pd.read_excel(xls, sheet_name=sheet) for sheet in TRACKER_SHEETS}
+    # Trackers saved by older versions lack newer columns (e.g. "Missing Keywords")
+    for sheet, columns in TRACKER_SHEETS.items():
+        for column in columns:
+            if column not in tracker[sheet].columns:
+                tracker[sheet][column] = None
+        tracker[sheet] = tracker[sheet][columns + [c for c in tracker[sheet].columns if c not in columns]]
+    return tracker
+
+
+# === Format JD Title (max 50 chars): First 2 words of Company + Job Title ===
+def build_jd_title(company_name, gpt_result):
+    job_title = gpt_result.get("JobDescription", {}).get("JobTitle", "UnknownTitle")[:40]
+    return f"{'_'.join(company_name.split()[:2])}_{job_title}"[:50]
+
+
+# === Skills the analysis found missing for the JD, as one comma-separated cell ===
+def missing_keywords(gpt_result):
+    summary = gpt_result.get("Output", {}).get("SummaryOfMatchedAndMissingSkills", {})
+    missing = summary.get("Missing") if isinstance(summary, dict) else None
+    if not missing:
+        missing = gpt_result.get("ImprovementsBreakdown", {}).get("MissingAndUnderusedKeywords") or []
+    if isinstance(missing, str):
+        missing = missing.split(",")
+    # A comma inside one keyword would split it in two when the cell is read back
+    keywords = (" ".join(str(keyword).replace(",", " ").split()) for keyword in missing)
+    return ", ".join(keyword for keyword in keywords if keyword)
+
+
+# === Excel export ===
+def generate_excel_download(tracker):
+    import pandas as pd
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        for sheet in TRACKER_SHEETS:
+            tracker[sheet].to_excel(writer, sheet_name=sheet, index=False)
+    return output.getvalue()
@@ -0,0 +1,194 @@
+# tracker_analytics.py – Running summaries of a tracker for the analytics view
+#
+#     analytics = TrackerAnalytics()
+#     analytics.refresh(tracker_store)         # folds in only the rows added since the last refresh
+#     analytics.update_from_frames(tracker)    # same for in-memory frames that only grow
+#     analytics.score_distribution("M")        # analyses per score band and period, with the average
+#     analytics.top_rewrites(section="Skills") # most common Was -> New rewrites
+#     analytics.top_missing_keywords()         # keywords most JDs said the resume lacks
+#
+# Every summary is an accumulator that only ever grows: each batch of new rows is aggregated with
+# vectorized pandas (groupby / crosstab on the batch) and added to the running totals, so a refresh
+# costs the new rows plus the size of the summaries, never a pass over the whole tracker.
+# Scores are kept per day and score band and rolled up to weeks / months when asked for; rewrites are
+# counted per (Section, Was, New) compared case- and whitespace-insensitively, showing the first
+# spelling seen; a keyword counts once per JD.
+
+import numpy as np
+
+SCORE_BANDS = tuple(f"{low}–{low + 9}" if low < 90 else "90–100" for low in range(0, 100, 10))
+PERIODS = {"D": "Day", "W": "Week", "M": "Month", "Q": "Quarter"}
+
+
+def _normalized(series):
+    return series.fillna("").astype(str).str.strip().str.replace(r"\s+", " ", regex=True).str.casefold()
+
+
+def _scores(series):
+    # "82", "82%", 82.0 and 0.82 are all 82; "N/A" and blanks are dropped
+    import pandas as pd
+
+    values = pd.to_numeric(series.astype(str).str.strip().str.rstrip("%"), errors="coerce")
+    return values.where((values >= 1) | (values <= 0), values * 100).clip(0, 100)
+
+
+class TrackerAnalytics:
+    def __init__(self):
+        import pandas as pd
+
+        # day -> analyses per score band, plus the score sum for averages
+        self._score_days = pd.DataFrame(columns=list(SCORE_BANDS) + ["Total"], dtype="float64")
+        # "section|was key|new key" -> count and first display text (one flat key aligns faster than a MultiIndex)
+        self._rewrites = pd.DataFrame(
+            {column: pd.Series(dtype="int64" if column == "Count" else "object") for column in ("Count", "Section", "Was", "New")},
+            index=pd.Index([], name="key"),
+        )
+        # keyword key -> JDs listing it, and its first spelling
+        self._keywords = pd.DataFrame(
+            {"JDs": pd.Series(dtype="int64"), "Keyword": pd.Series(dtype="object")},
+            index=pd.Index([], name="key"),
+        )
+        self.analyses = 0
+        self.undated_analyses = 0
+        self.changes = 0
+        self.jds = 0
+        # Progress per sheet: last store row ID folded in, and rows already read from in-memory frames
+        self._last_ids = {}
+        self._offsets = {}
+
+    # === Incremental updates ===
+    def refresh(self, store):
+        for sheet in ("Resume_Tracker", "Resume_Change_Log", "JD_Analysis"):
+            rows = store.rows_after(sheet, self._last_ids.get(sheet, 0))
+            if rows.empty:
+                continue
+            self.append(sheet, rows)
+            self._last_ids[sheet] = int(rows["ID#"].astype(int).max())
+        return self
+
+    def update_from_frames(self, tracker):
+        # Frames are treated as append-only (e.g. TrackerStore.to_frames() of a growing store): rows past the last offset are new
+        for sheet in ("Resume_Tracker", "Resume_Change_Log", "JD_Analysis"):
+            df = tracker.get(sheet)
+            offset = self._offsets.get(sheet, 0)
+            if df is None or len(df) <= offset:
+                continue
+            self.append(sheet, df.iloc[offset:])
+            self._offsets[sheet] = len(df)
+        return self
+
+    def append(self, sheet, rows):
+        if sheet == "Resume_Tracker":
+            self._append_scores(rows)
+        elif sheet == "Resume_Change_Log":
+            self._append_rewrites(rows)
+        elif sheet == "JD_Analysis":
+            self._append_keywords(rows)
+
+    def _append_scores(self, rows):
+        import pandas as pd
+
+        scores = _scores(rows["Match in %"])
+        days = pd.to_datetime(rows["Created Date"], errors="coerce").dt.normalize()
+        valid = scores.notna() & days.notna()
+        self.analyses += int(scores.notna().sum())
+        self.undated_analyses += int((scores.notna() & days.isna()).sum())
+        if not valid.any():
+            return
+        scores, days = scores[valid].to_numpy(), days[valid].to_numpy()
+        bands = np.minimum(scores // 10, 9).astype(int)
+        counts = pd.crosstab(days, bands).reindex(columns=range(len(SCORE_BANDS)), fill_value=0)
+        counts.columns = list(SCORE_BANDS)
+        counts["Total"] = pd.Series(scores, index=days).groupby(level=0).sum()
+        self._score_days = counts.astype("float64").add(self._score_days, fill_value=0)
+
+    def _append_rewrites(self, rows):
+        import pandas as pd
+
+        was, new = rows["Was"].fillna("").astype(str), rows["New"].fillna("").astype(str)
+        section = rows["Section"].fillna("Others").astype(str).str.strip().replace("", "Others")
+        was_key, new_key = _normalized(was), _normalized(new)
+        batch = pd.DataFrame({
+            "key": (section + "\x1f" + was_key + "\x1f" + new_key).to_numpy(),
+            "Section": section.to_numpy(),
+            "Was": was.str.strip().to_numpy(),
+            "New": new.str.strip().to_numpy(),
+        })[((was_key != "") | (new_key != "")).to_numpy()]
+        self.changes += len(batch)
+        if batch.empty:
+            return
+        grouped = batch.groupby("key", sort=False).agg(
+            Count=("Was", "size"), Section=("Section", "first"), Was=("Was", "first"), New=("New", "first")
+        )
+        self._rewrites = self._merge(self._rewrites, grouped, "Count")
+
+    def _append_keywords(self, rows):
+        import pandas as pd
+
+        self.jds += len(rows)
+        if "Missing Keywords" not in rows.columns:
+            return
+        keywords = rows["Missing Keywords"].fillna("").astype(str).str.split(",").explode().str.strip()
+        keywords = keywords[keywords != ""]
+        if keywords.empty:
+            return
+        batch = pd.DataFrame({"key": _normalized(keywords), "Keyword": keywords})
+        # A keyword listed twice for one JD counts once
+        batch = batch.reset_index().drop_duplicates(subset=["index", "key"])
+        grouped = batch.groupby("key", sort=False).agg(JDs=("Keyword", "size"), Keyword=("Keyword", "first"))
+        self._keywords = self._merge(self._keywords, grouped, "JDs")
+
+    @staticmethod
+    def _merge(totals, batch, count_column):
+        # Known keys add their counts in place (display text stays the first seen); unseen keys are appended
+        import pandas as pd
+
+        positions = totals.index.get_indexer(batch.index)
+        known = positions >= 0
+        if known.any():
+            counts = totals[count_column].to_numpy(copy=True)
+            counts[positions[known]] += batch[count_column].to_numpy()[known]
+            totals[count_column] = counts
+        if known.all():
+            return totals
+        return pd.concat([totals, batch.loc[~known, totals.columns]])
+
+    # === Views (computed from the summaries only) ===
+    def score_distribution(self, period="M"):
+        import pandas as pd
+
+        if self._score_days.empty:
+            return pd.DataFrame(columns=list(SCORE_BANDS) + ["Analyses", "Average"])
+        days = self._score_days.sort_index()
+        rolled = days.groupby(pd.DatetimeIndex(days.index).to_period(period)).sum()
+        bands = rolled[list(SCORE_BANDS)].astype("int64")
+        analyses = bands.sum(axis=1)
+        table = bands.assign(Analyses=analyses, Average=(rolled["Total"] / analyses).round(1))
+        table.index = table.index.astype(str)
+        table.index.name = PERIODS.get(period, period)
+        return table
+
+    def sections(self):
+        return sorted(self._rewrites["Section"].unique())
+
+    def top_rewrites(self, section=None, n=20):
+        rewrites = self._rewrites
+        if section:
+            rewrites = rewrites[rewrites["Section"] == section]
+        return rewrites.nlargest(n, "Count", keep="first").reset_index(drop=True)[["Section", "Was", "New", "Count"]]
+
+    def top_missing_keywords(self, n=20):
+        top = self._keywords.nlargest(n, "JDs", keep="first").reset_index(drop=True)[["Keyword", "JDs"]]
+        return top.assign(**{"Share of JDs": (top["JDs"] / self.jds).round(3) if self.jds else 0.0})
+
+    def summary(self):
+        totals = self._score_days.sum()
+        dated = int(totals[list(SCORE_BANDS)].sum()) if not self._score_days.empty else 0
+        return {
+            "analyses": self.analyses,
+            "average_score": round(float(totals["Total"]) / dated, 1) if dated else None,
+            "jds": self.jds,
+            "changes": self.changes,
+            "distinct_rewrites": len(self._rewrites),
+            "distinct_keywords": len(self._keywords),
+        }
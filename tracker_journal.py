@@ -0,0 +1,246 @@
+# tracker_journal.py – Batched, journaled writer for the Excel tracker (log_gpt_results at batch scale)
+#
+# log() appends the result as one JSON line to a local journal and fsyncs it, so it survives a crash
+# and never waits on the workbook. A background thread flushes the journal every flush_interval
+# seconds (or as soon as max_batch entries are pending): one load_workbook, all rows appended,
+# table refs updated once, one save. A locked workbook is retried with bounded, jittered backoff;
+# if it stays locked the entries simply remain in the journal for the next flush. A batch that fails
+# for any other reason (missing sheet or table, corrupt workbook) is moved to a quarantine file
+# beside the journal with the error, so it does not fail again on every interval;
+# requeue_quarantined() puts it back once the workbook is fixed.
+#
+# Delivery is at-least-once: the journal is trimmed right after a successful save, so only a
+# crash between those two steps can re-append a batch.
+#
+# journal_writer(path) returns the process-wide writer for a workbook (log_gpt_results and the
+# batch runner share it, so one journal has one writer); it is closed, and flushed, at exit.
+
+import atexit
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import date, datetime
+
+from resume_core import append_gpt_results_to_workbook
+
+
+class TrackerJournalWriter:
+    def __init__(self, tracker_path, journal_path=None, flush_interval=5.0, max_batch=200,
+                 max_attempts=6, base_delay=0.5, max_delay=30.0, on_warning=None):
+        self.tracker_path = tracker_path
+        self.journal_path = journal_path or f"{tracker_path}.journal.jsonl"
+        self.quarantine_path = f"{self.journal_path}.failed"
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_warning = on_warning or (lambda message: None)
+
+        self._journal_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pending = self._count_pending()
+        self._thread = threading.Thread(target=self._run, name="tracker-journal", daemon=True)
+        self._thread.start()
+
+    # === Producer side ===
+    def log(self, resume_name, jd_name, score, changes, resume_filename, company_name):
+        entry = {
+            "id": uuid.uuid4().hex,
+            "logged_date": date.today().isoformat(),
+            "resume_name": resume_name,
+            "jd_name": jd_name,
+            "score": score,
+            "changes": [list(change) for change in changes],
+            "resume_filename": resume_filename,
+            "company_name": company_name,
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        with self._journal_lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending += 1
+            wake = self._pending >= self.max_batch
+        if wake:
+            self._wake.set()
+        return entry["id"]
+
+    @property
+    def pending(self):
+        return self._pending
+
+    # === Journal reading / trimming ===
+    def _read_journal(self):
+        if not os.path.exists(self.journal_path):
+            return [], 0
+        with open(self.journal_path, "rb") as f:
+            data = f.read()
+        entries, consumed = [], 0
+        for raw_line in data.splitlines(keepends=True):
+            if not raw_line.endswith(b"\n"):
+                break  # partially written last line (crash mid-write) – leave it for now
+            consumed += len(raw_line)
+            try:
+                entries.append(json.loads(raw_line))
+            except ValueError:
+                self.on_warning(f"⚠️ Skipping corrupt tracker journal line: {raw_line[:80]!r}")
+        return entries, consumed
+
+    def _count_pending(self):
+        entries, _consumed = self._read_journal()
+        return len(entries)
+
+    def _trim_journal(self, consumed, flushed):
+        # Drop the flushed prefix; keep anything logged while the flush was running
+        with self._journal_lock:
+            with open(self.journal_path, "rb") as f:
+                remainder = f.read()[consumed:]
+            tmp_path = f"{self.journal_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(remainder)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_path)
+            self._pending = max(0, self._pending - flushed)
+
+    # === Workbook write: one load, one save per batch ===
+    def _write_batch(self, entries):
+        import openpyxl
+
+        rows = [
+            dict(entry,
+                 logged_date=datetime.fromisoformat(entry["logged_date"]).date() if entry.get("logged_date") else None,
+                 changes=[tuple(change) for change in entry["changes"]])
+            for entry in entries
+        ]
+        wb = openpyxl.load_workbook(self.tracker_path)
+        # Save beside the tracker and swap it in, so a crash mid-save never corrupts the workbook
+        tmp_path = f"{self.tracker_path}.saving.xlsx"
+        try:
+            append_gpt_results_to_workbook(wb, rows)
+            wb.save(tmp_path)
+            os.replace(tmp_path, self.tracker_path)
+        finally:
+            wb.close()
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _quarantine(self, entries, error):
+        with self._journal_lock:
+            with open(self.quarantine_path, "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(dict(entry, error=error), ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def flush(self):
+        with self._flush_lock:
+            with self._journal_lock:
+                entries, consumed = self._read_journal()
+            if not entries:
+                return 0
+
+            for attempt in range(self.max_attempts):
+                try:
+                    self._write_batch(entries)
+                    break
+                except PermissionError:
+                    if attempt == self.max_attempts - 1:
+                        self.on_warning(
+                            f"⚠️ Tracker {self.tracker_path} is still locked; {len(entries)} results stay queued in {self.journal_path}."
+                        )
+                        return 0
+                    delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                    self.on_warning("⚠️ Please close the Excel file before continuing.")
+                    time.sleep(delay * random.uniform(0.5, 1.0))
+                except Exception as e:
+                    # Retrying will not help: set the batch aside and keep the journal moving
+                    self._quarantine(entries, f"{type(e).__name__}: {e}")
+                    self._trim_journal(consumed, len(entries))
+                    self.on_warning(
+                        f"⚠️ {len(entries)} results could not be written to {self.tracker_path} ({type(e).__name__}: {e}); "
+                        f"they were moved to {self.quarantine_path}."
+                    )
+                    return 0
+
+            self._trim_journal(consumed, len(entries))
+            return len(entries)
+
+    def requeue_quarantined(self):
+        # Move quarantined entries back into the journal, e.g. after the workbook was repaired
+        with self._journal_lock:
+            if not os.path.exists(self.quarantine_path):
+                return 0
+            with open(self.quarantine_path, "r", encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                for entry in entries:
+                    entry.pop("error", None)
+                    f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.remove(self.quarantine_path)
+            self._pending += len(entries)
+        self._wake.set()
+        return len(entries)
+
+    # === Background loop ===
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                self.on_warning(f"⚠️ Tracker flush failed, results remain queued: {e}")
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        return self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# === One writer per workbook in this process ===
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def journal_writer(tracker_path, **kwargs):
+    # kwargs (flush_interval, on_warning, ...) only apply when the writer is created
+    key = os.path.abspath(tracker_path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = TrackerJournalWriter(tracker_path, **kwargs)
+        return writer
+
+
+@atexit.register
+def _close_writers():
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        try:
+            writer.close()
+        except Exception:
+            pass
@@ -0,0 +1,212 @@
+# tracker_store.py – Append-only tracker backend (SQLite) with on-demand XLSX export
+#
+# Rows are only ever inserted, in one transaction per analysis, and IDs come from the database
+# (INTEGER PRIMARY KEY) instead of len(df) + 1. The three-sheet workbook is built only when
+# export_xlsx() is called, e.g. lazily from the Streamlit download button. pandas is only imported
+# when frames are imported or built. rows_after() hands the rows added since a known ID to
+# incremental consumers (tracker_analytics.py).
+# Each tracker has one database file under TRACKER_DIR (tracker_db_path(): keyed by the upload's content
+# hash or the Tracker ID), so rows survive a restart and opening the same tracker again reuses its file.
+# db_path=":memory:" gives a scratch store that goes away on close(), e.g. to rebuild a workbook.
+
+import hashlib
+import os
+import sqlite3
+import threading
+
+from tracker import TRACKER_SHEETS, build_jd_title, generate_excel_download, missing_keywords
+
+# === Defaults (overridable through environment variables) ===
+TRACKER_DIR = os.getenv(
+    "ATS_TRACKER_DIR",
+    os.path.join(os.path.expanduser("~"), ".ats_resume_optimizer", "trackers")
+)
+
+# (sheet, table, [(column in sheet, column in table)]) – ID# is always the table's "id"
+_SCHEMA = {
+    "JD_Analysis": ("jd_analysis", [
+        ("JD Title", "jd_title"), ("Company", "company"), ("Analysis Date", "analysis_date"),
+        ("Missing Keywords", "missing_keywords"),
+    ]),
+    "Resume_Tracker": ("resume_tracker", [
+        ("Resume File Name", "resume_file_name"), ("JD Title", "jd_title"), ("Match in %", "match_percent"),
+        ("Summary of Changes", "summary_of_changes"), ("Created Date", "created_date"),
+    ]),
+    "Resume_Change_Log": ("change_log", [
+        ("Original Resume File Name", "original_resume_file_name"), ("Resume File Name", "resume_file_name"),
+        ("Was", "was"), ("New", "new"), ("Section", "section"), ("JD Title", "jd_title"),
+    ]),
+}
+
+# WAL only applies to file-backed databases
+_FILE_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+"""
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS jd_analysis (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    jd_title TEXT, company TEXT, analysis_date TEXT, missing_keywords TEXT
+);
+CREATE TABLE IF NOT EXISTS resume_tracker (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_file_name TEXT, jd_title TEXT, match_percent, summary_of_changes INTEGER, created_date TEXT
+);
+CREATE TABLE IF NOT EXISTS change_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    original_resume_file_name TEXT, resume_file_name TEXT, was TEXT, new TEXT, section TEXT, jd_title TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jd_analysis_title ON jd_analysis(jd_title);
+CREATE INDEX IF NOT EXISTS idx_resume_tracker_file ON resume_tracker(resume_file_name);
+CREATE INDEX IF NOT EXISTS idx_change_log_file ON change_log(resume_file_name);
+CREATE INDEX IF NOT EXISTS idx_change_log_title ON change_log(jd_title);
+"""
+
+# Columns added after a table was first released: (table, column, type) – added to older databases on open
+_ADDED_COLUMNS = [
+    ("jd_analysis", "missing_keywords", "TEXT"),
+]
+
+
+def _to_db_value(value):
+    import pandas as pd
+
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, "isoformat"):
+        return value.isoformat()[:10]
+    if isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def tracker_db_path(tracker_key):
+    digest = hashlib.sha256(tracker_key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(TRACKER_DIR, f"tracker_{digest}.sqlite")
+
+
+def _parse_id(value):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+class TrackerStore:
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(TRACKER_DIR, "tracker.sqlite")
+        in_memory = self.db_path == ":memory:"
+        if not in_memory:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        # The download callable runs on another thread, so share one connection behind a lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if not in_memory:
+            self.conn.executescript(_FILE_PRAGMAS)
+        self.conn.executescript(_DDL)
+        self._migrate()
+
+    def _migrate(self):
+        with self.conn:
+            for table, column, column_type in _ADDED_COLUMNS:
+                existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+                if column not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _insert_many(self, sheet, rows, with_ids=False):
+        table, columns = _SCHEMA[sheet]
+        names = (["id"] if with_ids else []) + [db_col for _sheet_col, db_col in columns]
+        sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+        cursor = self.conn.executemany(sql, rows)
+        return cursor.rowcount
+
+    # === Import an existing workbook's frames (one transaction, IDs kept where they are numeric) ===
+    def import_frames(self, tracker):
+        with self._lock, self.conn:
+            for sheet, (_table, columns) in _SCHEMA.items():
+                df = tracker.get(sheet)
+                if df is None or df.empty:
+                    continue
+                ids = [_parse_id(v) for v in df["ID#"]] if "ID#" in df.columns else [None] * len(df)
+                values = [
+                    [_to_db_value(v) for v in df[sheet_col]] if sheet_col in df.columns else [None] * len(df)
+                    for sheet_col, _db_col in columns
+                ]
+                rows = list(zip(*values))
+                # Old trackers restart change-log IDs per analysis, so IDs are only kept when they are unique
+                if all(i is not None for i in ids) and len(set(ids)) == len(ids):
+                    self._insert_many(sheet, [(i,) + row for i, row in zip(ids, rows)], with_ids=True)
+                else:
+                    self._insert_many(sheet, rows)
+
+    # === Append one analysis: JD row, resume row and the whole change log in a single transaction ===
+    def append_analysis(self, gpt_result, company_name, resume_file_name, original_resume_name, analysis_date):
+        jd_title = build_jd_title(company_name, gpt_result)
+        suggestions = gpt_result.get("ResumeImprovementSuggestions", [])
+        match_percent = gpt_result.get("scoring", {}).get("atsCompatibilityScore", "N/A")
+        date_value = _to_db_value(analysis_date)
+
+        with self._lock, self.conn:
+            self._insert_many("JD_Analysis", [(jd_title, company_name, date_value, missing_keywords(gpt_result))])
+            self._insert_many("Resume_Tracker", [(
+                resume_file_name, jd_title, _to_db_value(match_percent), len(suggestions), date_value
+            )])
+            self._insert_many("Resume_Change_Log", [
+                (original_resume_name, resume_file_name, change.get("Was", ""), change.get("New", ""),
+                 change.get("Section", "Others"), jd_title)
+                for change in suggestions
+            ])
+        return jd_title
+
+    # === Indexed lookups ===
+    def count(self, sheet):
+        table, _columns = _SCHEMA[sheet]
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def is_empty(self):
+        return all(self.count(sheet) == 0 for sheet in _SCHEMA)
+
+    def changes_for_resume(self, resume_file_name):
+        return self._query("Resume_Change_Log", "resume_file_name = ?", (resume_file_name,))
+
+    def changes_for_jd(self, jd_title):
+        return self._query("Resume_Change_Log", "jd_title = ?", (jd_title,))
+
+    def analyses_for_jd(self, jd_title):
+        return self._query("Resume_Tracker", "jd_title = ?", (jd_title,))
+
+    # Rows inserted after last_id (0: all rows), for consumers that fold new rows into running summaries
+    def rows_after(self, sheet, last_id=0):
+        return self._query(sheet, "id > ?", (int(last_id),))
+
+    def _query(self, sheet, where="1 = 1", params=()):
+        import pandas as pd
+
+        table, columns = _SCHEMA[sheet]
+        select = ", ".join(["id"] + [db_col for _sheet_col, db_col in columns])
+        with self._lock:
+            df = pd.read_sql_query(f"SELECT {select} FROM {table} WHERE {where} ORDER BY id", self.conn, params=params)
+        df.columns = ["ID#"] + [sheet_col for sheet_col, _db_col in columns]
+        df["ID#"] = df["ID#"].map(lambda i: f"{i:03d}")
+        for date_col in ("Analysis Date", "Created Date"):
+            if date_col in df.columns:
+                df[date_col] = pd.to_datetime(df[date_col], errors="coerce").dt.date
+        return df[TRACKER_SHEETS[sheet]]
+
+    # === Frames / workbook on demand ===
+    def to_frames(self):
+        return {sheet: self._query(sheet) for sheet in TRACKER_SHEETS}
+
+    def export_xlsx(self):
+        return generate_excel_download(self.to_frames())